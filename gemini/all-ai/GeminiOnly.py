@@ -2,6 +2,9 @@ import eel
 import psutil
 import platform
 import subprocess
+import glob
+import hashlib
+import threading
 import google.generativeai as genai
 import os
 import sys
@@ -214,8 +217,16 @@ def get_cpu_info_windows():
     
     return platform.processor()
 
-def get_system_specs():
-    """Get relevant system specifications for gaming."""
+def get_storage_free_gb():
+    """Get free space on the system drive in GB."""
+    try:
+        disk = psutil.disk_usage('/')
+        return round(disk.free / (1024**3), 2)
+    except:
+        return "Unknown"
+
+def detect_system_specs():
+    """Run every hardware probe and return the relevant specs for gaming."""
     specs = {}
     
     specs['os'] = f"{platform.system()} {platform.release()}"
@@ -248,11 +259,126 @@ def get_system_specs():
     svmem = psutil.virtual_memory()
     specs['ram_total_gb'] = round(svmem.total / (1024**3), 2)
     
+    specs['storage_free_gb'] = get_storage_free_gb()
+    
+    return specs
+
+# ============================================
+# HARDWARE SNAPSHOT CACHE
+# ============================================
+
+# Detected specs are saved here and reused until the hardware fingerprint changes
+SPECS_CACHE_PATH = "./cache/system_specs.json"
+
+# Bump this when detect_system_specs() starts returning different fields
+SPECS_SNAPSHOT_VERSION = 1
+
+_specs_snapshot = None
+_specs_lock = threading.Lock()
+
+def get_pci_device_list():
+    """List PCI vendor/device IDs without spawning lspci or PowerShell."""
     try:
-        disk = psutil.disk_usage('/')
-        specs['storage_free_gb'] = round(disk.free / (1024**3), 2)
-    except:
-        specs['storage_free_gb'] = "Unknown"
+        if platform.system() == "Windows":
+            import winreg
+            devices = []
+            with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"SYSTEM\CurrentControlSet\Enum\PCI") as key:
+                index = 0
+                while True:
+                    try:
+                        devices.append(winreg.EnumKey(key, index))
+                    except OSError:
+                        break
+                    index += 1
+            return sorted(devices)
+        
+        elif platform.system() == "Linux":
+            # One line per device: bus/devfn, vendor+device ID, ...
+            with open('/proc/bus/pci/devices', 'r') as f:
+                return sorted(line.split('\t')[1] for line in f if '\t' in line)
+    except Exception:
+        pass
+    
+    return []
+
+def count_connected_monitors():
+    """Count connected monitors without creating a GUI window."""
+    try:
+        if platform.system() == "Windows":
+            import ctypes
+            return ctypes.windll.user32.GetSystemMetrics(80)  # SM_CMONITORS
+        
+        elif platform.system() == "Linux":
+            count = 0
+            for status_path in glob.glob('/sys/class/drm/card*-*/status'):
+                with open(status_path, 'r') as f:
+                    if f.read().strip() == 'connected':
+                        count += 1
+            return count
+    except Exception:
+        pass
+    
+    return 0
+
+def get_hardware_fingerprint():
+    """Build a cheap fingerprint of the machine from boot time, PCI devices and monitors."""
+    parts = [
+        str(SPECS_SNAPSHOT_VERSION),
+        platform.system(),
+        platform.release(),
+        platform.machine(),
+        # psutil can report boot time a second apart between calls on Windows
+        str(round(psutil.boot_time() / 10)),
+        str(psutil.virtual_memory().total),
+        str(count_connected_monitors()),
+    ]
+    parts.extend(get_pci_device_list())
+    return hashlib.sha256("|".join(parts).encode('utf-8')).hexdigest()
+
+def load_specs_snapshot():
+    """Load the saved specs snapshot from disk, or None if there isn't a usable one."""
+    try:
+        with open(SPECS_CACHE_PATH, 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+        if isinstance(snapshot, dict) and 'fingerprint' in snapshot and 'specs' in snapshot:
+            return snapshot
+    except (OSError, ValueError):
+        pass
+    return None
+
+def save_specs_snapshot(snapshot):
+    """Write the specs snapshot to disk atomically."""
+    try:
+        os.makedirs(os.path.dirname(SPECS_CACHE_PATH), exist_ok=True)
+        temp_path = SPECS_CACHE_PATH + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, indent=2)
+        os.replace(temp_path, SPECS_CACHE_PATH)
+    except OSError as e:
+        print(f"Could not save specs snapshot: {e}")
+
+def get_system_specs(force_refresh=False):
+    """Get system specs, only re-running hardware detection when the fingerprint changes."""
+    global _specs_snapshot
+    
+    with _specs_lock:
+        fingerprint = get_hardware_fingerprint()
+        
+        if _specs_snapshot is None and not force_refresh:
+            _specs_snapshot = load_specs_snapshot()
+        
+        if (force_refresh or _specs_snapshot is None
+                or _specs_snapshot['fingerprint'] != fingerprint):
+            _specs_snapshot = {
+                'fingerprint': fingerprint,
+                'specs': detect_system_specs()
+            }
+            save_specs_snapshot(_specs_snapshot)
+        
+        specs = dict(_specs_snapshot['specs'])
+    
+    # Free space changes between checks without any hardware change
+    specs['storage_free_gb'] = get_storage_free_gb()
     
     return specs
 
@@ -307,9 +433,9 @@ Be specific and technical. Use actual game requirements if you know them. If the
 # ============================================
 
 @eel.expose
-def get_system_info():
+def get_system_info(force_refresh=False):
     """Exposed function to get system specs from frontend."""
-    return get_system_specs()
+    return get_system_specs(force_refresh)
 
 @eel.expose
 def check_game_compatibility(game_name):
@@ -5,6 +5,10 @@ import json
 import psutil
 import platform
 import subprocess
+import glob
+import hashlib
+import threading
+import functools
 import google.generativeai as genai
 import os
 from dotenv import load_dotenv
@@ -195,8 +199,16 @@ def get_cpu_info_windows():
     
     return platform.processor()
 
-def get_system_specs():
-    """Get relevant system specifications for gaming."""
+def get_storage_free_gb():
+    """Get free space on the system drive in GB."""
+    try:
+        disk = psutil.disk_usage('/')
+        return round(disk.free / (1024**3), 2)
+    except:
+        return "Unknown"
+
+def detect_system_specs():
+    """Run every hardware probe and return the relevant specs for gaming."""
     specs = {}
     
     specs['os'] = f"{platform.system()} {platform.release()}"
@@ -229,11 +241,126 @@ def get_system_specs():
     svmem = psutil.virtual_memory()
     specs['ram_total_gb'] = round(svmem.total / (1024**3), 2)
     
+    specs['storage_free_gb'] = get_storage_free_gb()
+    
+    return specs
+
+# ============================================
+# HARDWARE SNAPSHOT CACHE
+# ============================================
+
+# Detected specs are saved here and reused until the hardware fingerprint changes
+SPECS_CACHE_PATH = "./cache/system_specs.json"
+
+# Bump this when detect_system_specs() starts returning different fields
+SPECS_SNAPSHOT_VERSION = 1
+
+_specs_snapshot = None
+_specs_lock = threading.Lock()
+
+def get_pci_device_list():
+    """List PCI vendor/device IDs without spawning lspci or PowerShell."""
     try:
-        disk = psutil.disk_usage('/')
-        specs['storage_free_gb'] = round(disk.free / (1024**3), 2)
-    except:
-        specs['storage_free_gb'] = "Unknown"
+        if platform.system() == "Windows":
+            import winreg
+            devices = []
+            with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"SYSTEM\CurrentControlSet\Enum\PCI") as key:
+                index = 0
+                while True:
+                    try:
+                        devices.append(winreg.EnumKey(key, index))
+                    except OSError:
+                        break
+                    index += 1
+            return sorted(devices)
+        
+        elif platform.system() == "Linux":
+            # One line per device: bus/devfn, vendor+device ID, ...
+            with open('/proc/bus/pci/devices', 'r') as f:
+                return sorted(line.split('\t')[1] for line in f if '\t' in line)
+    except Exception:
+        pass
+    
+    return []
+
+def count_connected_monitors():
+    """Count connected monitors without creating a GUI window."""
+    try:
+        if platform.system() == "Windows":
+            import ctypes
+            return ctypes.windll.user32.GetSystemMetrics(80)  # SM_CMONITORS
+        
+        elif platform.system() == "Linux":
+            count = 0
+            for status_path in glob.glob('/sys/class/drm/card*-*/status'):
+                with open(status_path, 'r') as f:
+                    if f.read().strip() == 'connected':
+                        count += 1
+            return count
+    except Exception:
+        pass
+    
+    return 0
+
+def get_hardware_fingerprint():
+    """Build a cheap fingerprint of the machine from boot time, PCI devices and monitors."""
+    parts = [
+        str(SPECS_SNAPSHOT_VERSION),
+        platform.system(),
+        platform.release(),
+        platform.machine(),
+        # psutil can report boot time a second apart between calls on Windows
+        str(round(psutil.boot_time() / 10)),
+        str(psutil.virtual_memory().total),
+        str(count_connected_monitors()),
+    ]
+    parts.extend(get_pci_device_list())
+    return hashlib.sha256("|".join(parts).encode('utf-8')).hexdigest()
+
+def load_specs_snapshot():
+    """Load the saved specs snapshot from disk, or None if there isn't a usable one."""
+    try:
+        with open(SPECS_CACHE_PATH, 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+        if isinstance(snapshot, dict) and 'fingerprint' in snapshot and 'specs' in snapshot:
+            return snapshot
+    except (OSError, ValueError):
+        pass
+    return None
+
+def save_specs_snapshot(snapshot):
+    """Write the specs snapshot to disk atomically."""
+    try:
+        os.makedirs(os.path.dirname(SPECS_CACHE_PATH), exist_ok=True)
+        temp_path = SPECS_CACHE_PATH + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, indent=2)
+        os.replace(temp_path, SPECS_CACHE_PATH)
+    except OSError as e:
+        print(f"Could not save specs snapshot: {e}")
+
+def get_system_specs(force_refresh=False):
+    """Get system specs, only re-running hardware detection when the fingerprint changes."""
+    global _specs_snapshot
+    
+    with _specs_lock:
+        fingerprint = get_hardware_fingerprint()
+        
+        if _specs_snapshot is None and not force_refresh:
+            _specs_snapshot = load_specs_snapshot()
+        
+        if (force_refresh or _specs_snapshot is None
+                or _specs_snapshot['fingerprint'] != fingerprint):
+            _specs_snapshot = {
+                'fingerprint': fingerprint,
+                'specs': detect_system_specs()
+            }
+            save_specs_snapshot(_specs_snapshot)
+        
+        specs = dict(_specs_snapshot['specs'])
+    
+    # Free space changes between checks without any hardware change
+    specs['storage_free_gb'] = get_storage_free_gb()
     
     return specs
 
@@ -331,8 +458,30 @@ def format_system_specs(specs):
     formatted += f"Free Storage: {specs.get('storage_free_gb', '?')} GB\n"
     return formatted
 
-def compare_specs_with_ai(game_name, requirements_text, system_specs_text, system_specs, model):
-    """Send both game requirements and system specs to Google AI for comparison."""
+def compare_specs_with_ai(game_name, requirements_text, system_specs_text, system_specs, model,
+                          on_chunk=None, structured=False):
+    """Send both game requirements and system specs to Google AI for comparison.
+    
+    With on_chunk set the answer is streamed, on_chunk(text) being called
+    for every piece as Gemini sends it. With structured set Gemini answers
+    with a JSON object following ANALYSIS_SCHEMA instead of prose, see
+    parse_structured_analysis().
+    """
+    if structured:
+        prompt = f"""{system_specs_text}
+
+{requirements_text}
+
+Question: Can my PC run {game_name} at my monitor resolution ({system_specs.get('resolution', 'unknown')})? Give the overall verdict, the estimated FPS range [low, high] for each graphics preset, the recommended preset and the components that would hold the game back."""
+        try:
+            response = model.generate_content(prompt, generation_config=genai.GenerationConfig(
+                response_mime_type="application/json",
+                response_schema=ANALYSIS_SCHEMA
+            ))
+            return response.text
+        except Exception as e:
+            return f"Error querying Google AI: {str(e)}"
+    
     prompt = f"""{system_specs_text}
 
 {requirements_text}
@@ -343,23 +492,108 @@ Question: Can my PC run {game_name}? Please compare my system specs against the
 3. Estimated FPS range I can expect"""
     
     try:
-        response = model.generate_content(prompt)
-        return response.text
+        if on_chunk is None:
+            response = model.generate_content(prompt)
+            return response.text
+        
+        chunks = []
+        for chunk in model.generate_content(prompt, stream=True):
+            chunks.append(chunk.text)
+            on_chunk(chunk.text)
+        return ''.join(chunks)
     except Exception as e:
         return f"Error querying Google AI: {str(e)}"
 
+# ============================================
+# STRUCTURED AI ANALYSIS
+# ============================================
+
+ANALYSIS_VERDICTS = ['Yes', 'Maybe', 'No']
+ANALYSIS_PRESETS = ['low', 'medium', 'high', 'ultra']
+ANALYSIS_COMPONENTS = ['cpu', 'gpu', 'vram', 'ram', 'storage', 'os']
+
+# Gemini response schema for the structured answer, so it returns only the
+# values and no prose around them
+ANALYSIS_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'verdict': {'type': 'string', 'enum': ANALYSIS_VERDICTS},
+        'fps': {
+            'type': 'object',
+            'properties': {
+                preset: {'type': 'array', 'items': {'type': 'integer'}, 'min_items': 2, 'max_items': 2}
+                for preset in ANALYSIS_PRESETS
+            },
+            'required': ANALYSIS_PRESETS
+        },
+        'recommended_preset': {'type': 'string', 'enum': ANALYSIS_PRESETS},
+        'bottlenecks': {'type': 'array', 'items': {'type': 'string', 'enum': ANALYSIS_COMPONENTS},
+                        'max_items': len(ANALYSIS_COMPONENTS)}
+    },
+    'required': ['verdict', 'fps', 'recommended_preset', 'bottlenecks']
+}
+
+def parse_structured_analysis(text):
+    """Validate a structured answer into a record, or return None if it doesn't fit.
+    
+    Record: {'verdict': 'Yes'/'Maybe'/'No', 'fps': {preset: [low, high]},
+    'recommended_preset': preset, 'bottlenecks': [component, ...]}
+    """
+    try:
+        data = json.loads(text)
+        
+        fps = {}
+        for preset in ANALYSIS_PRESETS:
+            low, high = (int(value) for value in data['fps'][preset])
+            fps[preset] = [min(low, high), max(low, high)]
+        
+        record = {
+            'verdict': data['verdict'],
+            'fps': fps,
+            'recommended_preset': data['recommended_preset'],
+            'bottlenecks': list(dict.fromkeys(data['bottlenecks']))
+        }
+    except (ValueError, TypeError, KeyError):
+        return None
+    
+    if (record['verdict'] not in ANALYSIS_VERDICTS
+            or record['recommended_preset'] not in ANALYSIS_PRESETS
+            or not all(component in ANALYSIS_COMPONENTS for component in record['bottlenecks'])):
+        return None
+    return record
+
+def format_structured_analysis(record):
+    """Turn a structured record into plain text for places that only show ai_analysis."""
+    lines = [f"Verdict: {record['verdict']}",
+             f"Recommended preset: {record['recommended_preset'].title()}"]
+    lines += [f"{preset.title()}: {low}-{high} FPS" for preset, (low, high) in record['fps'].items()]
+    if record['bottlenecks']:
+        lines.append("Bottlenecks: " + ", ".join(component.upper() for component in record['bottlenecks']))
+    return "\n".join(lines)
+
 # ============================================
 # EEL EXPOSED FUNCTIONS
 # ============================================
 
+def push_analysis_chunk(stream_id, text):
+    """Send one piece of a streamed analysis to the page, then yield so Eel sends it right away."""
+    eel.receive_analysis_chunk(stream_id, text)
+    eel.sleep(0)
+
 @eel.expose
-def get_system_info():
+def get_system_info(force_refresh=False):
     """Exposed function to get system specs from frontend."""
-    return get_system_specs()
+    return get_system_specs(force_refresh)
 
 @eel.expose
-def check_game_compatibility(game_name):
-    """Main compatibility check function exposed to frontend."""
+def check_game_compatibility(game_name, detailed=False, stream_id=None):
+    """Main compatibility check function exposed to frontend.
+    
+    By default Gemini gives a structured answer (verdict, FPS per preset,
+    recommended preset, bottlenecks) in structured_analysis. Detailed
+    requests get prose, which with a stream_id is also pushed to the page's
+    receive_analysis_chunk() as Gemini generates it.
+    """
     try:
         system_specs = get_system_specs()
         
@@ -387,15 +621,27 @@ def check_game_compatibility(game_name):
             req_text,
             specs_text,
             system_specs,
-            ai_model
+            ai_model,
+            functools.partial(push_analysis_chunk, stream_id) if stream_id and detailed else None,
+            not detailed
         )
         
+        structured_analysis = None
+        if not detailed and not ai_response.startswith("Error querying Google AI"):
+            structured_analysis = parse_structured_analysis(ai_response)
+            if structured_analysis is None:
+                print(f"Unparseable structured answer: {ai_response}")
+                ai_response = "Error querying Google AI: the answer was not in the expected format"
+            else:
+                ai_response = format_structured_analysis(structured_analysis)
+        
         return {
             "success": True,
             "game_name": search_results[0]['name'],
             "requirements": requirements,
             "system_specs": system_specs,
             "ai_analysis": ai_response,
+            "structured_analysis": structured_analysis,
             "requirements_text": req_text
         }
         
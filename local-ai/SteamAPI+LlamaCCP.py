@@ -1,50 +1,646 @@
 import eel
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 import json
 import psutil
 import platform
 import subprocess
-from llama_cpp import Llama
+import atexit
+import base64
+import queue
+import os
+import glob
+import hashlib
+import threading
+import functools
+import mmap
+import struct
+import codecs
+import pickle
+import re
+import html
+import html.entities
+import shutil
+import sqlite3
+import argparse
+import array
+import bisect
+import collections
+import unicodedata
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError, wait, FIRST_COMPLETED
+import llama_cpp
+from llama_cpp import Llama, LlamaGrammar, StoppingCriteriaList
 
 # ============================================
 # AI MODEL INITIALIZATION
 # ============================================
 
-# Path to your GGUF model file
-MODEL_PATH = "./models/Llama-3.2-3B-Instruct-Q4_K_M.gguf"
+# GGUF models go in this folder, the registry picks the best one this PC can
+# run (see MODEL REGISTRY) and others can be switched to from the web UI
+MODELS_DIR = "./models"
 
-print("Loading AI model from:", MODEL_PATH)
-print("This should only take a few seconds...")
+# Set to a GGUF file path to always start with that model instead
+MODEL_PATH = None
 
-try:
-    ai_model = Llama(
-        model_path=MODEL_PATH,
-        n_ctx=2048,        # Context window size
-        n_threads=6,       # Number of CPU threads (adjust based on your CPU)
-        n_batch=512,       # Batch size for prompt processing
-        verbose=False      # Set to True for debugging
-    )
-    print("AI model loaded successfully!")
-except Exception as e:
-    print(f"Error loading AI model: {e}")
-    print("\nMake sure you have:")
-    print("1. Created a 'models' folder in the same directory as this script")
-    print("2. Downloaded a GGUF model file to that folder")
-    print("3. Updated MODEL_PATH to match your model filename")
+# The model loads on a background thread once the window is up. Spec
+# detection, the Steam lookup and rule-based verdicts don't need it, only
+# AI analyses wait for it.
+ai_model = None
+active_model_path = None
+model_ready = threading.Event()
+model_status = {'state': 'loading', 'progress': 0.0, 'message': "Waiting to load the AI model"}
+
+# Share of the progress bar spent reading the file, the rest is llama.cpp setup
+MODEL_READ_PROGRESS = 0.9
+MODEL_READ_CHUNK_BYTES = 16 * 1024 * 1024
+
+def load_ai_model(model_path):
+    """Load a GGUF model into ai_model, keeping model_status up to date.
+    
+    The file is read through once first. That gives real progress numbers
+    and leaves it in the OS page cache, so llama.cpp's own load is quick.
+    """
+    global ai_model
+    
+    print("Loading AI model from:", model_path)
+    start = time.perf_counter()
+    
+    try:
+        # The scheduler's batch context holds on to the old model, free it first
+        inference_scheduler.release_batcher()
+        
+        if model_path is None:
+            raise FileNotFoundError(f"no .gguf model found in {MODELS_DIR}")
+        
+        total_bytes = os.path.getsize(model_path)
+        read_bytes = 0
+        model_status['message'] = f"Reading {os.path.basename(model_path)}"
+        with open(model_path, 'rb') as f:
+            while True:
+                chunk = f.read(MODEL_READ_CHUNK_BYTES)
+                if not chunk:
+                    break
+                read_bytes += len(chunk)
+                model_status['progress'] = MODEL_READ_PROGRESS * read_bytes / max(total_bytes, 1)
+        
+        model_status.update(progress=MODEL_READ_PROGRESS, message="Initializing llama.cpp")
+        config, source = load_llama_config(get_system_specs(), model_path)
+        print(f"llama.cpp settings ({source}): {config}")
+        ai_model = Llama(
+            model_path=model_path,
+            verbose=False,     # Set to True for debugging
+            **config
+        )
+        
+        elapsed = time.perf_counter() - start
+        model_status.update(state='ready', progress=1.0,
+                            message=f"{os.path.basename(model_path)} loaded in {elapsed:.1f}s")
+        print(f"AI model loaded successfully in {elapsed:.1f}s!")
+    except Exception as e:
+        model_status.update(state='error', message=f"Error loading AI model: {e}")
+        print(f"Error loading AI model: {e}")
+        print("\nSetup instructions:")
+        print("1. Install llama-cpp-python:")
+        print("   pip install llama-cpp-python")
+        print("\n2. Download a GGUF model:")
+        print("   Visit: https://huggingface.co/models?library=gguf")
+        print("   Recommended: llama-3.2-3b-instruct Q4_K_M (~2GB)")
+        print("\n3. Create 'models' folder and place the .gguf file inside")
+        print("4. Optionally set MODEL_PATH in the script to pick a specific file\n")
+    finally:
+        model_ready.set()
+
+def start_model_load(model_path):
+    """Start loading a model on a background thread, replacing the current one.
+    
+    The old model is released first so two never sit in memory together;
+    a check already running keeps its own reference until it finishes.
+    """
+    global ai_model, active_model_path
+    
+    model_ready.clear()
+    model_status.update(state='loading', progress=0.0, message="Waiting to load the AI model")
     ai_model = None
+    active_model_path = model_path
+    threading.Thread(target=load_ai_model, args=(model_path,), daemon=True).start()
+
+def wait_for_model():
+    """Wait until the model has loaded or failed, return it (None on failure).
+    
+    Sleeps through Eel so other requests from the page keep being served.
+    """
+    while not model_ready.is_set():
+        eel.sleep(0.1)
+    return ai_model
+
+# ============================================
+# LLAMA RUNTIME TUNING
+# ============================================
+
+# Fastest settings found by --calibrate, used while the model and CPU stay the same
+LLAMA_TUNING_PATH = "./cache/llama_tuning.json"
+
+# Machines with less RAM than this get a smaller context and batch
+LLAMA_LOW_RAM_GB = 8
+
+# Tokens generated for each thread count during calibration
+CALIBRATION_GENERATED_TOKENS = 48
+
+def parse_cpu_list(text):
+    """Expand a Linux CPU list like "0-7,16" into a set of CPU numbers."""
+    cpus = set()
+    for part in text.strip().split(','):
+        if '-' in part:
+            first, last = part.split('-')
+            cpus.update(range(int(first), int(last) + 1))
+        elif part:
+            cpus.add(int(part))
+    return cpus
+
+def count_performance_cores():
+    """Count physical performance cores on a hybrid CPU (Intel P-cores, Apple P-cluster).
+    
+    Returns None when the CPU isn't hybrid or the split can't be read, in
+    which case every physical core counts.
+    """
+    try:
+        if platform.system() == "Linux":
+            # Only present on hybrid Intel CPUs, lists the P-cores' logical CPUs
+            with open('/sys/devices/cpu_core/cpus', 'r') as f:
+                cpus = parse_cpu_list(f.read())
+            cores = set()
+            for cpu in cpus:
+                with open(f'/sys/devices/system/cpu/cpu{cpu}/topology/thread_siblings_list', 'r') as f:
+                    cores.add(f.read().strip())
+            return len(cores) or None
+        
+        elif platform.system() == "Windows":
+            import ctypes
+            
+            # GetLogicalProcessorInformationEx(RelationProcessorCore) returns one
+            # record per physical core: DWORD Relationship, DWORD Size, then
+            # PROCESSOR_RELATIONSHIP whose second byte is the EfficiencyClass
+            kernel32 = ctypes.windll.kernel32
+            length = ctypes.c_ulong(0)
+            kernel32.GetLogicalProcessorInformationEx(0, None, ctypes.byref(length))
+            buffer = ctypes.create_string_buffer(length.value)
+            if not kernel32.GetLogicalProcessorInformationEx(0, buffer, ctypes.byref(length)):
+                return None
+            
+            data = buffer.raw[:length.value]
+            classes = []
+            offset = 0
+            while offset < len(data):
+                relationship, size = struct.unpack_from('<II', data, offset)
+                if relationship == 0:
+                    classes.append(data[offset + 9])
+                offset += size
+            
+            if classes and max(classes) != min(classes):
+                return classes.count(max(classes))
+        
+        elif platform.system() == "Darwin":
+            levels = subprocess.check_output(["sysctl", "-n", "hw.nperflevels"],
+                                             encoding='utf-8', timeout=PROBE_TIMEOUT).strip()
+            if int(levels) > 1:
+                return int(subprocess.check_output(["sysctl", "-n", "hw.perflevel0.physicalcpu"],
+                                                   encoding='utf-8', timeout=PROBE_TIMEOUT).strip())
+    except Exception:
+        pass
+    
+    return None
+
+def llama_memory_budget(specs, model_path):
+    """Installed RAM, available RAM and model size in GB, and whether RAM is low."""
+    ram_gb = as_number(specs.get('ram_total_gb')) or psutil.virtual_memory().total / (1024**3)
+    
+    try:
+        model_gb = os.path.getsize(model_path) / (1024**3)
+    except OSError:
+        model_gb = 0
+    
+    return {
+        'ram_gb': ram_gb,
+        'available_gb': psutil.virtual_memory().available / (1024**3),
+        'model_gb': model_gb,
+        'low_ram': ram_gb < LLAMA_LOW_RAM_GB
+    }
+
+def auto_llama_config(specs, model_path):
+    """Pick llama.cpp settings for this machine from its detected specs.
+    
+    Token generation is limited by memory bandwidth and slowed down by
+    efficiency cores, so it runs on the performance cores only. Prompt
+    processing is compute bound and uses every physical core.
+    """
+    physical_cores = int(as_number(specs.get('cpu_cores')) or psutil.cpu_count(logical=False) or 4)
+    performance_cores = min(count_performance_cores() or physical_cores, physical_cores)
+    budget = llama_memory_budget(specs, model_path)
+    
+    return {
+        'n_threads': performance_cores,
+        'n_threads_batch': physical_cores,
+        'n_batch': 256 if budget['low_ram'] else 512,
+        'n_ctx': 2048 if budget['low_ram'] else 4096,
+        'use_mmap': True,
+        # Pinning the weights stops them being paged out between checks, but
+        # only when that leaves plenty of memory for everything else
+        'use_mlock': budget['available_gb'] > budget['model_gb'] * 2 + 4
+    }
+
+def load_llama_config(specs, model_path):
+    """Return (settings, source), calibrated ones when they match this model and CPU."""
+    config = auto_llama_config(specs, model_path)
+    
+    try:
+        with open(LLAMA_TUNING_PATH, 'r', encoding='utf-8') as f:
+            tuning = json.load(f)
+        if tuning['model'] == model_identifier(model_path) and tuning['cpu'] == specs.get('cpu'):
+            config.update(tuning['config'])
+            return config, "calibrated"
+    except (OSError, ValueError, KeyError):
+        pass
+    
+    return config, "auto"
+
+def calibration_prompt(specs):
+    """A check-sized prompt for timing models, built from the bundled requirements corpus."""
+    with open(REQUIREMENTS_CORPUS_PATH, 'r', encoding='utf-8') as f:
+        sample_requirements = clean_html_requirements(json.load(f)[0])
+    return (f"<|system|>\nYou are a PC gaming expert.<|end|>\n<|user|>\n{format_system_specs(specs)}\n\n"
+            f"GAME REQUIREMENTS:\n{sample_requirements}\n\nCan my PC run this game?<|end|>\n<|assistant|>")
+
+def time_prompt(model, tokens):
+    """Seconds the model takes to evaluate a prompt from scratch."""
+    model.reset()
+    start = time.perf_counter()
+    model.eval(tokens)
+    return time.perf_counter() - start
+
+def time_generation(model, tokens, count=CALIBRATION_GENERATED_TOKENS):
+    """Seconds the model takes to generate count tokens after a prompt."""
+    start = time.perf_counter()
+    for _ in zip(range(count), model.generate(tokens, temp=0.0)):
+        pass
+    return time.perf_counter() - start
+
+def calibrate_llama_config(model_path=None):
+    """Time a few thread and batch settings on a sample check and save the fastest.
+    
+    Prompt processing only depends on n_threads_batch and n_batch, token
+    generation only on n_threads, so each is picked from its own timings.
+    """
+    model_path = model_path or choose_model_path()
+    if model_path is None:
+        print(f"No .gguf model found in {MODELS_DIR}")
+        return None
+    
+    print(f"Calibrating {model_path}")
+    specs = get_system_specs()
+    config = auto_llama_config(specs, model_path)
+    logical_cores = int(as_number(specs.get('cpu_threads')) or psutil.cpu_count(logical=True) or 4)
+    
+    thread_options = sorted({config['n_threads'], config['n_threads_batch'], logical_cores,
+                             max(1, config['n_threads'] // 2)})
+    batch_options = sorted({256, 512, config['n_batch']})
+    
+    prompt = calibration_prompt(specs)
+    
+    prompt_times = {}
+    generation_times = {}
+    for threads in thread_options:
+        for n_batch in batch_options:
+            model = Llama(model_path=model_path, verbose=False,
+                          **dict(config, n_threads=threads, n_threads_batch=threads, n_batch=n_batch, use_mlock=False))
+            tokens = model.tokenize(prompt.encode('utf-8'), add_bos=True, special=True)
+            
+            prompt_times[(threads, n_batch)] = time_prompt(model, tokens)
+            print(f"threads={threads:<3} n_batch={n_batch:<4} prompt: {len(tokens) / prompt_times[(threads, n_batch)]:7.1f} tokens/s")
+            
+            if threads not in generation_times:
+                generation_times[threads] = time_generation(model, tokens)
+                print(f"threads={threads:<3} generation: {CALIBRATION_GENERATED_TOKENS / generation_times[threads]:7.1f} tokens/s")
+            
+            del model
+    
+    best_threads_batch, best_batch = min(prompt_times, key=prompt_times.get)
+    tuned = {
+        'n_threads': min(generation_times, key=generation_times.get),
+        'n_threads_batch': best_threads_batch,
+        'n_batch': best_batch
+    }
+    
+    os.makedirs(os.path.dirname(LLAMA_TUNING_PATH), exist_ok=True)
+    with open(LLAMA_TUNING_PATH, 'w', encoding='utf-8') as f:
+        json.dump({
+            'model': model_identifier(model_path),
+            'cpu': specs.get('cpu'),
+            'config': tuned,
+            'prompt_seconds': {f"{threads}x{n_batch}": round(seconds, 3)
+                               for (threads, n_batch), seconds in prompt_times.items()},
+            'generation_seconds': {str(threads): round(seconds, 3) for threads, seconds in generation_times.items()}
+        }, f, indent=2)
+    
+    print(f"Saved {tuned} to {LLAMA_TUNING_PATH}")
+    return tuned
+
+# ============================================
+# MODEL REGISTRY
+# ============================================
+
+# Measured throughput per model file, filled in by --benchmark-models
+MODEL_BENCHMARKS_PATH = "./cache/model_benchmarks.json"
+
+# Size of a typical check, used to turn throughput into seconds per check
+TYPICAL_PROMPT_TOKENS = 600
+TYPICAL_GENERATED_TOKENS = 100
+
+# Models measured slower than this per typical check aren't picked
+MODEL_LATENCY_TARGET_SECONDS = 20
+
+# RAM left for the OS, the browser window and everything else running, and
+# how much more than its file size llama.cpp needs for a model
+MODEL_RESERVED_RAM_GB = 4
+MODEL_RAM_OVERHEAD = 1.2
+
+# "Q4_K_M", "IQ3_XS", "Q8_0", "F16" and the parameter count ("3B", "7b")
+# as they appear in GGUF file names
+QUANTIZATION_PATTERN = re.compile(r'(?<![a-z0-9])(i?q[1-8](?:_[a-z0-9]+)*|bf16|f16|f32)(?![a-z0-9])', re.IGNORECASE)
+PARAMETER_COUNT_PATTERN = re.compile(r'(?<![a-z0-9.])(\d+(?:\.\d+)?)b(?![a-z0-9])', re.IGNORECASE)
+
+# Approximate bits per weight of the common llama.cpp quantizations
+QUANTIZATION_BITS = {
+    'Q2_K': 2.6, 'Q3_K_S': 3.5, 'Q3_K_M': 3.9, 'Q3_K_L': 4.3,
+    'Q4_0': 4.5, 'Q4_1': 5.0, 'Q4_K_S': 4.6, 'Q4_K_M': 4.9,
+    'Q5_0': 5.5, 'Q5_1': 6.0, 'Q5_K_S': 5.5, 'Q5_K_M': 5.7,
+    'Q6_K': 6.6, 'Q8_0': 8.5, 'BF16': 16.0, 'F16': 16.0, 'F32': 32.0,
+}
+
+def load_model_benchmarks():
+    """Measured throughput by model_identifier(), see benchmark_models()."""
+    try:
+        with open(MODEL_BENCHMARKS_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def describe_model(path, benchmarks):
+    """Registry entry for one GGUF file: size, quantization, rough quality and measured speed."""
+    name = os.path.basename(path)
+    size_gb = os.path.getsize(path) / (1024**3)
+    
+    quantization = QUANTIZATION_PATTERN.search(name)
+    quantization = quantization.group(1).upper() if quantization else None
+    parameters = PARAMETER_COUNT_PATTERN.search(name)
+    parameters = float(parameters.group(1)) if parameters else None
+    
+    bits = QUANTIZATION_BITS.get(quantization)
+    if bits is None and parameters:
+        bits = size_gb * 8 / parameters
+    elif bits is None:
+        bits = 4.5
+    if parameters is None:
+        parameters = size_gb * 8 / bits
+    
+    # Rough quality: parameter count, discounted for quantization below
+    # about 6 bits per weight where answers start to degrade noticeably
+    quality = parameters * min(1.0, max(bits - 1.5, 0.5) / 4.5)
+    
+    entry = {
+        'path': path,
+        'name': name,
+        'size_gb': round(size_gb, 2),
+        'quantization': quantization,
+        'parameters_b': round(parameters, 1),
+        'bits_per_weight': round(bits, 1),
+        'quality': round(quality, 2),
+        'prompt_tps': None,
+        'generation_tps': None,
+        'check_seconds': None
+    }
+    
+    measured = benchmarks.get(model_identifier(path))
+    if measured:
+        entry['prompt_tps'] = measured['prompt_tps']
+        entry['generation_tps'] = measured['generation_tps']
+        entry['check_seconds'] = round(TYPICAL_PROMPT_TOKENS / measured['prompt_tps']
+                                       + TYPICAL_GENERATED_TOKENS / measured['generation_tps'], 1)
+    return entry
+
+def scan_models(models_dir=MODELS_DIR):
+    """List every GGUF model in models_dir, smallest first."""
+    benchmarks = load_model_benchmarks()
+    entries = []
+    for path in glob.glob(os.path.join(models_dir, '*.gguf')):
+        try:
+            entries.append(describe_model(path, benchmarks))
+        except OSError as e:
+            print(f"Skipping model {path}: {e}")
+    return sorted(entries, key=lambda entry: entry['size_gb'])
+
+def select_model(models, ram_gb, latency_target=MODEL_LATENCY_TARGET_SECONDS):
+    """Pick the best model that fits in RAM and meets the latency target.
+    
+    Models nobody has benchmarked yet are assumed fast enough. When nothing
+    fits the smallest model is returned, or None if there are no models.
+    """
+    ram_budget_gb = ram_gb - MODEL_RESERVED_RAM_GB
+    candidates = [model for model in models
+                  if model['size_gb'] * MODEL_RAM_OVERHEAD <= ram_budget_gb
+                  and (model['check_seconds'] is None or model['check_seconds'] <= latency_target)]
+    
+    if not candidates:
+        return models[0] if models else None
+    return max(candidates, key=lambda model: (model['quality'], -model['size_gb']))
+
+def choose_model_path():
+    """MODEL_PATH if set, otherwise the registry's pick for this PC's RAM."""
+    if MODEL_PATH:
+        return MODEL_PATH
+    selected = select_model(scan_models(), psutil.virtual_memory().total / (1024**3))
+    return selected['path'] if selected else None
+
+def benchmark_models(models_dir=MODELS_DIR):
+    """Measure prompt and generation throughput of every model and save it for select_model()."""
+    specs = get_system_specs()
+    prompt = calibration_prompt(specs)
+    benchmarks = load_model_benchmarks()
+    
+    for entry in scan_models(models_dir):
+        config, _ = load_llama_config(specs, entry['path'])
+        model = Llama(model_path=entry['path'], verbose=False, **dict(config, use_mlock=False))
+        tokens = model.tokenize(prompt.encode('utf-8'), add_bos=True, special=True)
+        
+        prompt_seconds = time_prompt(model, tokens)
+        generation_seconds = time_generation(model, tokens)
+        del model
+        
+        benchmarks[model_identifier(entry['path'])] = {
+            'prompt_tps': round(len(tokens) / prompt_seconds, 1),
+            'generation_tps': round(CALIBRATION_GENERATED_TOKENS / generation_seconds, 1)
+        }
+        print(f"{entry['name']}: prompt {len(tokens) / prompt_seconds:.1f} tokens/s, "
+              f"generation {CALIBRATION_GENERATED_TOKENS / generation_seconds:.1f} tokens/s")
+    
+    os.makedirs(os.path.dirname(MODEL_BENCHMARKS_PATH), exist_ok=True)
+    with open(MODEL_BENCHMARKS_PATH, 'w', encoding='utf-8') as f:
+        json.dump(benchmarks, f, indent=2)
+    
+    selected = select_model(scan_models(models_dir), psutil.virtual_memory().total / (1024**3))
+    if selected:
+        print(f"Selected model: {selected['name']}")
+
+# ============================================
+# GPU CLASSIFIER
+# ============================================
+
+# Every keyword the classifier cares about, compiled into one alternation so
+# a name is classified in a single left-to-right scan. Integrated names are
+# listed before the vendor words so "Radeon(TM) Graphics" isn't read as a
+# dedicated Radeon.
+GPU_CLASSIFIER_PATTERN = re.compile(r"""
+    (?P<virtual>parsec|virtual|remote|microsoft\ basic|\bvnc\b|teamviewer|splashtop|citrix
+        |vmware|hyper-v|generic\ pnp|\brdp\b|standard\ vga)
+  | (?P<integrated>\b(?:uhd|hd)\ graphics|\biris\b|radeon\(tm\)\ graphics|radeon\ graphics
+        |vega\ graphics|radeon\ vega|\bvega\ (?:[1-9]|1[01])\b
+        |\bintel\(r\)\ (?:uhd|hd)\b|\bintel\ (?:uhd|hd)\b)
+  | (?P<series>\b(?:rtx|gtx|gt|rx)\s*-?\s*(?P<model>\d{3,4})(?:(?P<mobile_suffix>mx?)\b)?
+        |\barc(?:\(tm\))?\s*a(?P<arc_model>\d{3})\b
+        |\b(?:rx\s*)?vega\s*(?P<vega_model>56|64)\b)
+  | (?P<mobile>\blaptop\b|\bmobile\b|max-q|\b\d{3,4}m\b)
+  | (?P<nvidia>\bnvidia\b|\bgeforce\b|\bquadro\b)
+  | (?P<amd>\bamd\b|\bradeon\b|\bati\b)
+  | (?P<intel>\bintel\b|\barc\b)
+""", re.VERBOSE)
+
+GPU_TIERS = ['entry', 'mid', 'high', 'enthusiast']
+
+def gpu_series_tier(vendor, model):
+    """Rough performance tier of a dedicated GPU from its model number."""
+    if vendor == 'intel':
+        # Arc A380 / A580 / A750 / A770
+        return 0 if model < 500 else 1
+    
+    if vendor == 'amd':
+        if model in (56, 64):
+            # RX Vega 56 / 64
+            return 1
+        if model < 1000:
+            # Polaris RX 470 - 590
+            return 0
+        # RX 5500 - 7900: the hundreds digit is the class, older generations rank lower
+        generation, model_class = model // 1000, (model // 100) % 10
+        class_rank = {4: 0, 5: 0, 6: 1, 7: 2, 8: 3, 9: 3}.get(model_class, 0)
+        return max(0, class_rank - (1 if generation <= 5 else 0))
+    
+    # NVIDIA: GTX 970 / 1060 / 1660 / RTX 2080 / 3060 / 4090
+    generation, model_class = model // 100, model % 100
+    class_rank = 0 if model_class <= 50 else 1 if model_class <= 60 else 2 if model_class <= 70 else 3
+    age_penalty = 2 if generation <= 9 else 1 if generation <= 20 else 0
+    return max(0, class_rank - age_penalty)
+
+@functools.lru_cache(maxsize=4096)
+def classify_gpu(name):
+    """Classify a GPU adapter name in one pass.
+    
+    Returns a dict with:
+        vendor: 'nvidia', 'amd', 'intel' or None
+        class: 'dedicated', 'integrated', 'virtual' or 'unknown'
+        tier: 'entry', 'mid', 'high', 'enthusiast', 'integrated', 'virtual' or 'unknown'
+        model: the series model number (3060, 6700, 770...) or None
+        mobile: True for laptop parts ("Laptop GPU", "Max-Q", "980M")
+    """
+    vendor = None
+    model = None
+    virtual = integrated = mobile = False
+    
+    for match in GPU_CLASSIFIER_PATTERN.finditer((name or '').lower()):
+        group = match.lastgroup
+        if group == 'virtual':
+            virtual = True
+        elif group == 'integrated':
+            integrated = True
+            text = match.group()
+            if vendor is None:
+                vendor = 'amd' if 'radeon' in text or 'vega' in text else 'intel'
+        elif group == 'series':
+            if match.group('arc_model'):
+                model = int(match.group('arc_model'))
+                vendor = vendor or 'intel'
+            elif match.group('vega_model'):
+                model = int(match.group('vega_model'))
+                vendor = vendor or 'amd'
+            else:
+                model = int(match.group('model'))
+                vendor = vendor or ('amd' if match.group().startswith('rx') else 'nvidia')
+                # "GTX 980M" / "RX 6800M" laptop parts
+                mobile = mobile or bool(match.group('mobile_suffix'))
+        elif group == 'mobile':
+            mobile = True
+        elif vendor is None:
+            vendor = group
+    
+    if virtual:
+        return {'vendor': vendor, 'class': 'virtual', 'tier': 'virtual', 'model': model, 'mobile': mobile}
+    if integrated:
+        return {'vendor': vendor, 'class': 'integrated', 'tier': 'integrated', 'model': model, 'mobile': mobile}
+    if vendor is None:
+        return {'vendor': None, 'class': 'unknown', 'tier': 'unknown', 'model': model, 'mobile': mobile}
+    
+    tier = 'unknown'
+    if model is not None:
+        tier_index = gpu_series_tier(vendor, model)
+        # Laptop parts run well below the desktop card with the same number
+        if mobile:
+            tier_index = max(0, tier_index - 1)
+        tier = GPU_TIERS[tier_index]
+    
+    return {'vendor': vendor, 'class': 'dedicated', 'tier': tier, 'model': model, 'mobile': mobile}
+
+def pick_primary_gpu(gpu_names):
+    """Pick the gaming GPU from a list of adapter names, preferring dedicated over integrated."""
+    dedicated_gpus = []
+    integrated_gpus = []
+    
+    for name in gpu_names:
+        name = (name or '').strip()
+        gpu_class = classify_gpu(name)['class']
+        
+        if gpu_class == 'dedicated':
+            dedicated_gpus.append(name)
+        elif gpu_class == 'integrated':
+            integrated_gpus.append(name)
+    
+    if dedicated_gpus:
+        return dedicated_gpus[0]
+    elif integrated_gpus:
+        return integrated_gpus[0]
+    return None
 
 # ============================================
 # SYSTEM INFORMATION FUNCTIONS
 # ============================================
 
+# Longest any single hardware probe (or its subprocess) may take, in seconds
+PROBE_TIMEOUT = 10
+
 def run_powershell_command(command):
     """Run a PowerShell command and return the output."""
+    if platform.system() == "Windows":
+        try:
+            return powershell_worker.run(command)
+        except Exception as e:
+            print(f"PowerShell worker error, falling back to a new process: {e}")
+    
     try:
         result = subprocess.run(
             ["powershell", "-Command", command],
             capture_output=True,
             text=True,
+            timeout=PROBE_TIMEOUT,
             creationflags=subprocess.CREATE_NO_WINDOW if platform.system() == "Windows" else 0
         )
         return result.stdout.strip()
@@ -52,314 +648,3377 @@ def run_powershell_command(command):
         print(f"PowerShell command error: {e}")
         return ""
 
-def get_monitor_resolution():
-    """Get the monitor resolution."""
+def get_gpu_info_fixed():
+    """Get GPU information, prioritizing dedicated GPUs.
+    
+    Windows is covered by the batched CIM query in get_windows_hardware_facts().
+    """
+    gpu_name = "Unknown"
+    
+    try:
+        if platform.system() == "Linux":
+            try:
+                nvidia_info = subprocess.check_output(
+                    ["nvidia-smi", "--query-gpu=name", "--format=csv,noheader"],
+                    encoding='utf-8', timeout=PROBE_TIMEOUT
+                )
+                gpu_name = nvidia_info.strip()
+            except:
+                lspci_info = subprocess.check_output(["lspci"], encoding='utf-8', timeout=PROBE_TIMEOUT)
+                for line in lspci_info.split('\n'):
+                    if 'VGA' in line or 'Display' in line or '3D' in line:
+                        if classify_gpu(line)['class'] != 'virtual':
+                            gpu_name = line.split(':')[-1].strip()
+                            break
+        
+        elif platform.system() == "Darwin":
+            gpu_info = subprocess.check_output(
+                ["system_profiler", "SPDisplaysDataType"],
+                encoding='utf-8', timeout=PROBE_TIMEOUT
+            )
+            for line in gpu_info.split('\n'):
+                if 'Chipset Model:' in line:
+                    gpu_name = line.split(':')[1].strip()
+                    break
+    
+    except Exception as e:
+        print(f"GPU detection error: {e}")
+    
+    return gpu_name
+
+def get_cpu_name():
+    """Get the CPU model name on Linux and macOS, Windows uses the batched CIM query."""
+    cpu_name = platform.processor()
+    try:
+        if platform.system() == "Linux":
+            cpu_name = get_cpu_info_linux()
+        elif platform.system() == "Darwin":
+            cpu_name = subprocess.check_output(["sysctl", "-n", "machdep.cpu.brand_string"], 
+                                              encoding='utf-8', timeout=PROBE_TIMEOUT).strip()
+    except Exception as e:
+        print(f"CPU info error: {e}")
+    
+    return cpu_name
+
+def get_storage_free_gb():
+    """Get free space on the system drive in GB."""
     try:
-        import tkinter as tk
-        root = tk.Tk()
-        root.withdraw()
-        width = root.winfo_screenwidth()
-        height = root.winfo_screenheight()
-        root.destroy()
-        return f"{width}x{height}"
+        disk = psutil.disk_usage('/')
+        return round(disk.free / (1024**3), 2)
     except:
-        return "1920x1080"
+        return "Unknown"
 
-def get_gpu_info_fixed():
-    """Get GPU information using PowerShell, prioritizing dedicated GPUs."""
-    gpu_name = "Unknown"
+# ============================================
+# WINDOWS HARDWARE QUERY
+# ============================================
+
+class PowerShellWorker:
+    """A long-lived powershell.exe that runs scripts sent to it over stdin.
+    
+    Starting PowerShell costs hundreds of milliseconds, so one process is
+    kept around and reused. Each script is sent base64 encoded on a single
+    line and its output is read back up to an end marker.
+    """
+    
+    END_MARKER = "__SHCE_END_OF_OUTPUT__"
+    
+    LOOP_SCRIPT = (
+        "[Console]::OutputEncoding = [Text.Encoding]::UTF8; "
+        "while (($line = [Console]::In.ReadLine()) -ne $null) { "
+        "try { "
+        "$script = [Text.Encoding]::UTF8.GetString([Convert]::FromBase64String($line)); "
+        "$output = Invoke-Expression $script | Out-String -Width 4096; "
+        "[Console]::Out.WriteLine($output) "
+        "} catch { [Console]::Out.WriteLine('') }; "
+        "[Console]::Out.WriteLine('" + END_MARKER + "'); "
+        "[Console]::Out.Flush() }"
+    )
+    
+    def __init__(self):
+        self.process = None
+        self.output_lines = None
+        self.lock = threading.Lock()
+    
+    def _start(self):
+        self.process = subprocess.Popen(
+            ["powershell", "-NoProfile", "-NoLogo", "-NonInteractive", "-Command", self.LOOP_SCRIPT],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding='utf-8',
+            errors='replace',
+            bufsize=1,
+            creationflags=subprocess.CREATE_NO_WINDOW
+        )
+        
+        # readline() can't time out, so a reader thread feeds a queue instead
+        self.output_lines = queue.Queue()
+        threading.Thread(
+            target=self._read_output,
+            args=(self.process.stdout, self.output_lines),
+            daemon=True
+        ).start()
+    
+    @staticmethod
+    def _read_output(stream, output_lines):
+        for line in stream:
+            output_lines.put(line.rstrip('\r\n'))
+        output_lines.put(None)
+    
+    def run(self, script, timeout=PROBE_TIMEOUT):
+        """Run a script in the worker and return its output as text."""
+        with self.lock:
+            if self.process is None or self.process.poll() is not None:
+                self._start()
+            
+            encoded = base64.b64encode(script.encode('utf-8')).decode('ascii')
+            self.process.stdin.write(encoded + "\n")
+            self.process.stdin.flush()
+            
+            lines = []
+            deadline = time.monotonic() + timeout
+            while True:
+                try:
+                    line = self.output_lines.get(timeout=max(0, deadline - time.monotonic()))
+                except queue.Empty:
+                    # The worker is stuck on this script, start fresh next time
+                    self.close()
+                    raise TimeoutError(f"PowerShell script timed out after {timeout}s")
+                
+                if line is None:
+                    self.process = None
+                    raise RuntimeError("PowerShell worker exited unexpectedly")
+                if line == self.END_MARKER:
+                    break
+                lines.append(line)
+            
+            return "\n".join(lines).strip()
+    
+    def close(self):
+        """Stop the worker process."""
+        if self.process is not None:
+            try:
+                self.process.kill()
+            except OSError:
+                pass
+            self.process = None
+
+powershell_worker = PowerShellWorker()
+atexit.register(powershell_worker.close)
+
+# One round trip for every hardware fact we need on Windows.
+# AdapterRAM is a 32-bit field and caps at 4 GB, so the driver's 64-bit
+# qwMemorySize registry value is read as well for real VRAM sizes.
+WINDOWS_HARDWARE_SCRIPT = r"""
+$cpu = @(Get-CimInstance Win32_Processor | Select-Object Name, NumberOfCores, NumberOfLogicalProcessors, MaxClockSpeed)
+$gpu = @(Get-CimInstance Win32_VideoController | Select-Object Name, AdapterRAM, PNPDeviceID, CurrentHorizontalResolution, CurrentVerticalResolution, CurrentRefreshRate)
+$vram = @(Get-ItemProperty -Path 'HKLM:\SYSTEM\CurrentControlSet\Control\Class\{4d36e968-e325-11ce-bfc1-08002be10318}\0*' -ErrorAction SilentlyContinue |
+    Select-Object DriverDesc, @{ Name = 'MemorySize'; Expression = { $_.'HardwareInformation.qwMemorySize' } })
+$os = Get-CimInstance Win32_OperatingSystem | Select-Object Caption, Version, BuildNumber, OSArchitecture
+@{ cpu = $cpu; gpu = $gpu; vram = $vram; os = $os } | ConvertTo-Json -Depth 4 -Compress
+"""
+
+def as_list(value):
+    """ConvertTo-Json turns one-element arrays into plain objects, undo that."""
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return value
+    return [value]
+
+def get_windows_hardware_facts():
+    """Get CPU, GPU, display and OS facts on Windows with a single batched CIM query."""
+    output = run_powershell_command(WINDOWS_HARDWARE_SCRIPT)
+    data = json.loads(output)
+    
+    facts = {}
+    
+    cpus = as_list(data.get('cpu'))
+    if cpus:
+        facts['cpu'] = (cpus[0].get('Name') or '').strip() or platform.processor()
+        facts['cpu_cores'] = sum(cpu.get('NumberOfCores') or 0 for cpu in cpus) or psutil.cpu_count(logical=False)
+        facts['cpu_threads'] = sum(cpu.get('NumberOfLogicalProcessors') or 0 for cpu in cpus) or psutil.cpu_count(logical=True)
+    
+    registry_vram = {}
+    for entry in as_list(data.get('vram')):
+        memory_size = entry.get('MemorySize')
+        if entry.get('DriverDesc') and isinstance(memory_size, int):
+            registry_vram[entry['DriverDesc'].strip()] = memory_size
+    
+    gpus = as_list(data.get('gpu'))
+    gpu_name = pick_primary_gpu(gpu.get('Name', '') for gpu in gpus)
+    if gpu_name:
+        facts['gpu'] = gpu_name
+        for gpu in gpus:
+            if (gpu.get('Name') or '').strip() == gpu_name:
+                vram_bytes = max(registry_vram.get(gpu_name, 0), gpu.get('AdapterRAM') or 0)
+                if vram_bytes:
+                    facts['gpu_vram_gb'] = round(vram_bytes / (1024**3), 1)
+                break
+    
+    # Prefer the resolution reported by the gaming GPU's own output
+    display_gpus = [gpu for gpu in gpus if gpu.get('CurrentHorizontalResolution')]
+    display_gpus.sort(key=lambda gpu: (gpu.get('Name') or '').strip() != gpu_name)
+    if display_gpus:
+        facts['resolution'] = (f"{display_gpus[0]['CurrentHorizontalResolution']}x"
+                               f"{display_gpus[0]['CurrentVerticalResolution']}")
+    
+    os_info = data.get('os')
+    if os_info and os_info.get('Caption'):
+        facts['os'] = f"{os_info['Caption'].strip()} ({os_info.get('Version', '')})"
+    
+    return facts
+
+# ============================================
+# LINUX NATIVE HARDWARE DETECTION
+# ============================================
+
+# Bundled display adapter subset of pci.ids, the system copy covers the rest
+PCI_IDS_PATH = "./data/pci.ids"
+SYSTEM_PCI_IDS_PATHS = ["/usr/share/hwdata/pci.ids", "/usr/share/misc/pci.ids"]
+
+# Short vendor names used when building "NVIDIA GeForce RTX 3060" style names
+PCI_VENDOR_NAMES = {'10de': "NVIDIA", '1002': "AMD", '8086': "Intel"}
+
+def read_sysfs(path):
+    """Read a small sysfs/procfs file, returning None if it doesn't exist."""
+    try:
+        with open(path, 'r') as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+@functools.lru_cache(maxsize=None)
+def load_pci_ids(path):
+    """Parse a pci.ids file into {vendor_id: (vendor_name, {device_id: device_name})}."""
+    vendors = {}
+    devices = None
+    
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                if not line.strip() or line.startswith('#'):
+                    continue
+                # Device classes come after all the vendors
+                if line.startswith('C '):
+                    break
+                if not line.startswith('\t'):
+                    vendor_id, _, vendor_name = line.strip().partition('  ')
+                    devices = {}
+                    vendors[vendor_id.lower()] = (vendor_name, devices)
+                elif not line.startswith('\t\t') and devices is not None:
+                    device_id, _, device_name = line.strip().partition('  ')
+                    devices[device_id.lower()] = device_name
+    except OSError:
+        pass
+    
+    return vendors
+
+def lookup_pci_ids_text(vendor_id, device_id):
+    """Look up a GPU name in the bundled or system pci.ids text files."""
+    vendor_name = None
+    device_name = None
+    
+    for path in [PCI_IDS_PATH] + SYSTEM_PCI_IDS_PATHS:
+        vendor = load_pci_ids(path).get(vendor_id)
+        if vendor:
+            vendor_name = vendor_name or vendor[0]
+            device_name = vendor[1].get(device_id)
+            if device_name:
+                break
+    
+    vendor_label = PCI_VENDOR_NAMES.get(vendor_id, vendor_name or f"PCI vendor {vendor_id}")
+    if not device_name:
+        return f"{vendor_label} device {device_id}"
+    
+    # "GA106 [GeForce RTX 3060]" -> "GeForce RTX 3060"
+    if '[' in device_name and device_name.endswith(']'):
+        device_name = device_name[device_name.index('[') + 1:-1]
+    
+    if vendor_label.lower() in device_name.lower():
+        return device_name
+    return f"{vendor_label} {device_name}"
+
+# ============================================
+# GPU ID LOOKUP TABLE
+# ============================================
+
+# Compiled from data/pci.ids by build_gpu_table.py
+GPU_TABLE_PATH = "./data/gpu_ids.bin"
+GPU_TABLE_MAGIC = b"SHCEGPU1"
+GPU_TABLE_HEADER = struct.Struct("<8sI")
+GPU_TABLE_RECORD = struct.Struct("<IBBIH")
+
+GPU_FLAG_INTEGRATED = 0x01
+GPU_FLAG_VIRTUAL = 0x02
+
+class GpuIdTable:
+    """Memory-mapped, pre-sorted table of PCI IDs to GPU name, class and VRAM.
+    
+    Records are fixed size and sorted by (vendor << 16 | device), so a
+    lookup is a binary search over the mapped file with nothing parsed
+    up front. See build_gpu_table.py for the layout.
+    """
+    
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        magic, self.count = GPU_TABLE_HEADER.unpack_from(self.data, 0)
+        if magic != GPU_TABLE_MAGIC:
+            raise ValueError(f"{path} is not a GPU ID table")
+    
+    def lookup(self, vendor_id, device_id):
+        """Find a GPU by hex vendor/device ID, returning a dict or None."""
+        try:
+            key = (int(vendor_id, 16) << 16) | int(device_id, 16)
+        except ValueError:
+            return None
+        
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            offset = GPU_TABLE_HEADER.size + middle * GPU_TABLE_RECORD.size
+            record_key = struct.unpack_from("<I", self.data, offset)[0]
+            
+            if record_key < key:
+                low = middle + 1
+            elif record_key > key:
+                high = middle
+            else:
+                _, flags, vram_class, name_offset, name_length = GPU_TABLE_RECORD.unpack_from(self.data, offset)
+                return {
+                    'name': self.data[name_offset:name_offset + name_length].decode('utf-8'),
+                    'vendor': PCI_VENDOR_NAMES.get(vendor_id, vendor_id),
+                    'integrated': bool(flags & GPU_FLAG_INTEGRATED),
+                    'virtual': bool(flags & GPU_FLAG_VIRTUAL),
+                    'vram_gb': vram_class or None
+                }
+        
+        return None
+
+@functools.lru_cache(maxsize=1)
+def get_gpu_id_table():
+    """Open the GPU ID table once, or return None if it's missing."""
+    try:
+        return GpuIdTable(GPU_TABLE_PATH)
+    except (OSError, ValueError) as e:
+        print(f"GPU ID table unavailable, using pci.ids instead: {e}")
+        return None
+
+def lookup_gpu_id(vendor_id, device_id):
+    """Look up a PCI ID in the GPU table, or None if it isn't listed."""
+    table = get_gpu_id_table()
+    if table is None:
+        return None
+    return table.lookup(vendor_id, device_id)
+
+def get_cpu_info_linux():
+    """Get the CPU model name from /proc/cpuinfo."""
+    try:
+        with open('/proc/cpuinfo', 'r') as f:
+            for line in f:
+                if line.startswith('model name'):
+                    return line.split(':', 1)[1].strip()
+    except OSError as e:
+        print(f"CPU info error: {e}")
+    
+    return platform.processor()
+
+def get_gpus_linux():
+    """List display adapters from sysfs without running lspci or nvidia-smi.
+    
+    Scans PCI devices with a display class (0x03xxxx), which also covers
+    GPUs that have no DRM card node. VRAM comes from amdgpu's
+    mem_info_vram_total when available, and the NVIDIA driver's own model
+    name is used when its proc entry exists.
+    """
+    gpus = []
+    
+    for device_dir in sorted(glob.glob('/sys/bus/pci/devices/*')):
+        device_class = read_sysfs(os.path.join(device_dir, 'class'))
+        if not device_class or not device_class.startswith('0x03'):
+            continue
+        
+        vendor_id = (read_sysfs(os.path.join(device_dir, 'vendor')) or '')[2:].lower()
+        device_id = (read_sysfs(os.path.join(device_dir, 'device')) or '')[2:].lower()
+        entry = lookup_gpu_id(vendor_id, device_id) or {}
+        name = entry.get('name') or lookup_pci_ids_text(vendor_id, device_id)
+        
+        nvidia_info = read_sysfs(f"/proc/driver/nvidia/gpus/{os.path.basename(device_dir)}/information")
+        if nvidia_info:
+            for line in nvidia_info.split('\n'):
+                if line.startswith('Model:'):
+                    name = line.split(':', 1)[1].strip()
+                    break
+        
+        # Measured VRAM beats the table's VRAM class for the chip
+        vram_gb = entry.get('vram_gb')
+        vram_bytes = read_sysfs(os.path.join(device_dir, 'mem_info_vram_total'))
+        if vram_bytes and vram_bytes.isdigit():
+            vram_gb = round(int(vram_bytes) / (1024**3), 1)
+        
+        gpus.append({
+            'name': name,
+            'vendor_id': vendor_id,
+            'device_id': device_id,
+            'vram_gb': vram_gb,
+            'integrated': entry.get('integrated'),
+            'virtual': entry.get('virtual'),
+            'boot_vga': read_sysfs(os.path.join(device_dir, 'boot_vga')) == '1'
+        })
+    
+    return gpus
+
+def get_linux_gpu_facts():
+    """Get the primary GPU name and VRAM on Linux straight from sysfs."""
+    gpus = get_gpus_linux()
+    if not gpus:
+        return {}
+    
+    def gpu_rank(gpu):
+        # Dedicated first, then integrated, then virtual adapters. GPUs that
+        # aren't in the GPU table are ranked by their name keywords instead.
+        gpu_class = classify_gpu(gpu['name'])['class']
+        if gpu['virtual'] or gpu_class == 'virtual':
+            return 2
+        if gpu['integrated'] is None:
+            return 1 if gpu_class == 'integrated' else 0
+        return 1 if gpu['integrated'] else 0
+    
+    # Ties go to the display the system booted on
+    gpus.sort(key=lambda gpu: (gpu_rank(gpu), not gpu['boot_vga']))
+    
+    facts = {'gpu': gpus[0]['name']}
+    if gpus[0]['vram_gb']:
+        facts['gpu_vram_gb'] = gpus[0]['vram_gb']
+    
+    return facts
+
+# ============================================
+# DISPLAY DETECTION
+# ============================================
+
+# Native display probes for each platform, so no GUI toolkit window is ever
+# created. Every probe returns a list of monitors, primary first:
+#   {'name', 'width', 'height', 'resolution', 'refresh_hz', 'primary'}
+
+def make_monitor(name, width, height, refresh_hz=None, primary=False):
+    """Build a monitor entry in the shape every display probe returns."""
+    return {
+        'name': name,
+        'width': width,
+        'height': height,
+        'resolution': f"{width}x{height}",
+        'refresh_hz': round(refresh_hz) if refresh_hz else None,
+        'primary': primary
+    }
+
+def parse_edid(edid):
+    """Read the monitor name and preferred mode (width, height, refresh) from EDID bytes."""
+    if len(edid) < 128 or edid[:8] != b'\x00\xff\xff\xff\xff\xff\xff\x00':
+        return None
+    
+    name = None
+    preferred = None
+    
+    # Four 18-byte descriptors; the first detailed timing is the preferred mode
+    for offset in range(54, 126, 18):
+        block = edid[offset:offset + 18]
+        pixel_clock = int.from_bytes(block[0:2], 'little') * 10000
+        
+        if pixel_clock and preferred is None:
+            h_active = block[2] | ((block[4] & 0xF0) << 4)
+            h_blank = block[3] | ((block[4] & 0x0F) << 8)
+            v_active = block[5] | ((block[7] & 0xF0) << 4)
+            v_blank = block[6] | ((block[7] & 0x0F) << 8)
+            if h_active and v_active:
+                refresh = pixel_clock / ((h_active + h_blank) * (v_active + v_blank))
+                preferred = (h_active, v_active, refresh)
+        elif not pixel_clock and block[3] == 0xFC:
+            name = block[5:18].split(b'\n')[0].decode('ascii', errors='ignore').strip()
+    
+    return name, preferred
+
+def get_monitors_drm():
+    """Read connected monitors from DRM sysfs connectors (Linux, works headless)."""
+    monitors = []
+    
+    for connector in sorted(glob.glob('/sys/class/drm/card*-*')):
+        if read_sysfs(os.path.join(connector, 'status')) != 'connected':
+            continue
+        
+        connector_name = os.path.basename(connector).split('-', 1)[1]
+        name = connector_name
+        width = height = refresh = None
+        
+        try:
+            with open(os.path.join(connector, 'edid'), 'rb') as f:
+                edid_info = parse_edid(f.read())
+            if edid_info:
+                name = edid_info[0] or connector_name
+                if edid_info[1]:
+                    width, height, refresh = edid_info[1]
+        except OSError:
+            pass
+        
+        # The first listed mode is the preferred one
+        if width is None:
+            modes = read_sysfs(os.path.join(connector, 'modes'))
+            match = re.match(r'(\d+)x(\d+)', modes or '')
+            if not match:
+                continue
+            width, height = int(match.group(1)), int(match.group(2))
+        
+        # Built-in laptop panels count as the primary display
+        monitors.append(make_monitor(name, width, height, refresh, connector_name.startswith('eDP')))
+    
+    monitors.sort(key=lambda monitor: not monitor['primary'])
+    if monitors:
+        monitors[0]['primary'] = True
+    return monitors
+
+def get_monitors_xrandr():
+    """Read the current mode of each output from xrandr (Linux with an X/Wayland session)."""
+    if not (os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY')) or not shutil.which('xrandr'):
+        return []
+    
+    output = subprocess.check_output(["xrandr", "--query"], encoding='utf-8', timeout=PROBE_TIMEOUT)
+    monitors = []
+    current = None
+    
+    for line in output.split('\n'):
+        if ' connected' in line:
+            current = {'name': line.split()[0], 'primary': ' primary ' in line}
+        elif line.startswith(' ') and current is not None and '*' in line:
+            parts = line.split()
+            mode = re.match(r'(\d+)x(\d+)', parts[0])
+            rates = [part for part in parts[1:] if '*' in part]
+            if mode:
+                refresh = float(rates[0].strip('*+')) if rates else None
+                monitors.append(make_monitor(current['name'], int(mode.group(1)), int(mode.group(2)),
+                                             refresh, current['primary']))
+            current = None
+    
+    monitors.sort(key=lambda monitor: not monitor['primary'])
+    return monitors
+
+def get_monitors_windows():
+    """Read each attached display's current mode with EnumDisplaySettings (Windows)."""
+    import ctypes
+    from ctypes import wintypes
+    
+    class DISPLAY_DEVICEW(ctypes.Structure):
+        _fields_ = [
+            ('cb', wintypes.DWORD),
+            ('DeviceName', wintypes.WCHAR * 32),
+            ('DeviceString', wintypes.WCHAR * 128),
+            ('StateFlags', wintypes.DWORD),
+            ('DeviceID', wintypes.WCHAR * 128),
+            ('DeviceKey', wintypes.WCHAR * 128),
+        ]
+    
+    class DEVMODEW(ctypes.Structure):
+        _fields_ = [
+            ('dmDeviceName', wintypes.WCHAR * 32),
+            ('dmSpecVersion', wintypes.WORD),
+            ('dmDriverVersion', wintypes.WORD),
+            ('dmSize', wintypes.WORD),
+            ('dmDriverExtra', wintypes.WORD),
+            ('dmFields', wintypes.DWORD),
+            ('dmPositionX', wintypes.LONG),
+            ('dmPositionY', wintypes.LONG),
+            ('dmDisplayOrientation', wintypes.DWORD),
+            ('dmDisplayFixedOutput', wintypes.DWORD),
+            ('dmColor', wintypes.SHORT),
+            ('dmDuplex', wintypes.SHORT),
+            ('dmYResolution', wintypes.SHORT),
+            ('dmTTOption', wintypes.SHORT),
+            ('dmCollate', wintypes.SHORT),
+            ('dmFormName', wintypes.WCHAR * 32),
+            ('dmLogPixels', wintypes.WORD),
+            ('dmBitsPerPel', wintypes.DWORD),
+            ('dmPelsWidth', wintypes.DWORD),
+            ('dmPelsHeight', wintypes.DWORD),
+            ('dmDisplayFlags', wintypes.DWORD),
+            ('dmDisplayFrequency', wintypes.DWORD),
+            ('dmICMMethod', wintypes.DWORD),
+            ('dmICMIntent', wintypes.DWORD),
+            ('dmMediaType', wintypes.DWORD),
+            ('dmDitherType', wintypes.DWORD),
+            ('dmReserved1', wintypes.DWORD),
+            ('dmReserved2', wintypes.DWORD),
+            ('dmPanningWidth', wintypes.DWORD),
+            ('dmPanningHeight', wintypes.DWORD),
+        ]
+    
+    DISPLAY_DEVICE_ATTACHED_TO_DESKTOP = 0x1
+    DISPLAY_DEVICE_PRIMARY_DEVICE = 0x4
+    ENUM_CURRENT_SETTINGS = -1
+    
+    user32 = ctypes.windll.user32
+    monitors = []
+    index = 0
+    
+    while True:
+        adapter = DISPLAY_DEVICEW()
+        adapter.cb = ctypes.sizeof(adapter)
+        if not user32.EnumDisplayDevicesW(None, index, ctypes.byref(adapter), 0):
+            break
+        index += 1
+        
+        if not adapter.StateFlags & DISPLAY_DEVICE_ATTACHED_TO_DESKTOP:
+            continue
+        
+        mode = DEVMODEW()
+        mode.dmSize = ctypes.sizeof(mode)
+        if not user32.EnumDisplaySettingsW(adapter.DeviceName, ENUM_CURRENT_SETTINGS, ctypes.byref(mode)):
+            continue
+        
+        # Asking again with the adapter name gives the attached monitor
+        monitor = DISPLAY_DEVICEW()
+        monitor.cb = ctypes.sizeof(monitor)
+        name = adapter.DeviceName
+        if user32.EnumDisplayDevicesW(adapter.DeviceName, 0, ctypes.byref(monitor), 0):
+            name = monitor.DeviceString or name
+        
+        # 0 and 1 mean "hardware default" rather than a real rate
+        refresh = mode.dmDisplayFrequency if mode.dmDisplayFrequency > 1 else None
+        monitors.append(make_monitor(name, mode.dmPelsWidth, mode.dmPelsHeight, refresh,
+                                     bool(adapter.StateFlags & DISPLAY_DEVICE_PRIMARY_DEVICE)))
+    
+    monitors.sort(key=lambda monitor: not monitor['primary'])
+    return monitors
+
+def get_monitors_macos():
+    """Read active displays and their current modes from CoreGraphics (macOS)."""
+    import ctypes
+    
+    cg = ctypes.cdll.LoadLibrary('/System/Library/Frameworks/CoreGraphics.framework/CoreGraphics')
+    cg.CGMainDisplayID.restype = ctypes.c_uint32
+    cg.CGDisplayCopyDisplayMode.restype = ctypes.c_void_p
+    cg.CGDisplayCopyDisplayMode.argtypes = [ctypes.c_uint32]
+    cg.CGDisplayModeGetPixelWidth.restype = ctypes.c_size_t
+    cg.CGDisplayModeGetPixelWidth.argtypes = [ctypes.c_void_p]
+    cg.CGDisplayModeGetPixelHeight.restype = ctypes.c_size_t
+    cg.CGDisplayModeGetPixelHeight.argtypes = [ctypes.c_void_p]
+    cg.CGDisplayModeGetRefreshRate.restype = ctypes.c_double
+    cg.CGDisplayModeGetRefreshRate.argtypes = [ctypes.c_void_p]
+    cg.CGDisplayModeRelease.argtypes = [ctypes.c_void_p]
+    
+    display_ids = (ctypes.c_uint32 * 16)()
+    count = ctypes.c_uint32()
+    if cg.CGGetActiveDisplayList(16, display_ids, ctypes.byref(count)) != 0:
+        return []
+    
+    main_display = cg.CGMainDisplayID()
+    monitors = []
+    
+    for display_id in display_ids[:count.value]:
+        mode = cg.CGDisplayCopyDisplayMode(display_id)
+        if not mode:
+            continue
+        try:
+            monitors.append(make_monitor(
+                f"Display {display_id}",
+                cg.CGDisplayModeGetPixelWidth(mode),
+                cg.CGDisplayModeGetPixelHeight(mode),
+                cg.CGDisplayModeGetRefreshRate(mode),
+                display_id == main_display
+            ))
+        finally:
+            cg.CGDisplayModeRelease(mode)
+    
+    monitors.sort(key=lambda monitor: not monitor['primary'])
+    return monitors
+
+def get_monitors_screeninfo():
+    """Fall back to the optional screeninfo package (no refresh rates)."""
+    try:
+        import screeninfo
+    except ImportError:
+        return []
+    
+    return [make_monitor(m.name or f"Monitor {i + 1}", m.width, m.height,
+                         primary=bool(getattr(m, 'is_primary', i == 0)))
+            for i, m in enumerate(screeninfo.get_monitors())]
+
+def get_monitors():
+    """List connected monitors with resolution and refresh rate, primary first."""
+    if platform.system() == "Windows":
+        probes = [get_monitors_windows]
+    elif platform.system() == "Linux":
+        # xrandr reports the mode actually in use and the real primary; DRM
+        # only knows the EDID preferred mode, so it is the headless fallback
+        probes = [get_monitors_xrandr, get_monitors_drm]
+    elif platform.system() == "Darwin":
+        probes = [get_monitors_macos]
+    else:
+        probes = []
+    probes.append(get_monitors_screeninfo)
+    
+    for probe in probes:
+        try:
+            monitors = probe()
+            if monitors:
+                return monitors
+        except Exception as e:
+            print(f"Display detection error ({probe.__name__}): {e}")
+    
+    return []
+
+# ============================================
+# HARDWARE PROBE ENGINE
+# ============================================
+
+def probe_cpu():
+    """Probe: CPU model and core/thread counts."""
+    return {
+        'cpu': get_cpu_name(),
+        'cpu_cores': psutil.cpu_count(logical=False),
+        'cpu_threads': psutil.cpu_count(logical=True)
+    }
+
+def probe_gpu():
+    """Probe: Primary gaming GPU."""
+    if platform.system() == "Linux":
+        facts = get_linux_gpu_facts()
+        if facts:
+            return facts
+    return {'gpu': get_gpu_info_fixed()}
+
+def probe_display():
+    """Probe: Every connected monitor, with the primary's resolution and refresh rate."""
+    monitors = get_monitors()
+    if not monitors:
+        # A headless machine is a real answer, not a probe failure
+        return {'resolution': "Headless", 'refresh_hz': None, 'monitors': []}
+    return {
+        'resolution': monitors[0]['resolution'],
+        'refresh_hz': monitors[0]['refresh_hz'],
+        'monitors': monitors
+    }
+
+def probe_memory():
+    """Probe: Total installed RAM."""
+    svmem = psutil.virtual_memory()
+    return {'ram_total_gb': round(svmem.total / (1024**3), 2)}
+
+def probe_windows():
+    """Probe: CPU, GPU, VRAM, display and OS in one batched CIM query."""
+    return get_windows_hardware_facts()
+
+def probe_storage():
+    """Probe: Free space on the system drive."""
+    return {'storage_free_gb': get_storage_free_gb()}
+
+# name -> (probe function, timeout in seconds, fallback values)
+HARDWARE_PROBES = {
+    'cpu': (probe_cpu, PROBE_TIMEOUT, {'cpu': platform.processor(), 'cpu_cores': '?', 'cpu_threads': '?'}),
+    'gpu': (probe_gpu, PROBE_TIMEOUT, {'gpu': "Unknown"}),
+    'display': (probe_display, 5, {'resolution': "Unknown"}),
+    'memory': (probe_memory, 2, {'ram_total_gb': '?'}),
+    'storage': (probe_storage, 2, {'storage_free_gb': "Unknown"}),
+}
+
+# On Windows the CPU, GPU and display probes are one batched PowerShell query
+if platform.system() == "Windows":
+    HARDWARE_PROBES = {
+        'windows': (probe_windows, PROBE_TIMEOUT, {
+            'cpu': platform.processor(),
+            'cpu_cores': psutil.cpu_count(logical=False),
+            'cpu_threads': psutil.cpu_count(logical=True),
+            'gpu': "Unknown",
+            'resolution': "Unknown"
+        }),
+        # Listed after the CIM query so its per-monitor modes win, but with
+        # no fallback so a failure keeps the CIM resolution
+        'display': (probe_display, 5, {}),
+        'memory': HARDWARE_PROBES['memory'],
+        'storage': HARDWARE_PROBES['storage'],
+    }
+
+def run_hardware_probes(probes=None):
+    """Run all hardware probes concurrently and merge their results.
+    
+    Returns (specs, failed) where failed lists the probes that errored or
+    timed out and were filled in with their fallback values instead.
+    """
+    probes = probes or HARDWARE_PROBES
+    specs = {}
+    failed = []
+    
+    executor = ThreadPoolExecutor(max_workers=len(probes), thread_name_prefix="probe")
+    start = time.monotonic()
+    futures = {name: executor.submit(probe[0]) for name, probe in probes.items()}
+    
+    for name, future in futures.items():
+        probe_func, timeout, fallback = probes[name]
+        remaining = max(0, start + timeout - time.monotonic())
+        try:
+            specs.update(future.result(timeout=remaining))
+        except FutureTimeoutError:
+            print(f"Hardware probe '{name}' timed out after {timeout}s")
+            specs.update(fallback)
+            failed.append(name)
+        except Exception as e:
+            print(f"Hardware probe '{name}' failed: {e}")
+            specs.update(fallback)
+            failed.append(name)
+    
+    # Don't wait for timed-out probes, their subprocess timeouts clean them up
+    executor.shutdown(wait=False)
+    
+    print(f"Hardware probes finished in {time.monotonic() - start:.2f}s")
+    return specs, failed
+
+def detect_system_specs():
+    """Run every hardware probe and return the relevant specs for gaming."""
+    specs = {'os': f"{platform.system()} {platform.release()}"}
+    
+    probe_specs, failed = run_hardware_probes()
+    specs.update(probe_specs)
+    if failed:
+        specs['incomplete_probes'] = failed
+    
+    return specs
+
+# ============================================
+# HARDWARE SNAPSHOT CACHE
+# ============================================
+
+# Detected specs are saved here and reused until the hardware fingerprint changes
+SPECS_CACHE_PATH = "./cache/system_specs.json"
+
+# Bump this when detect_system_specs() starts returning different fields
+SPECS_SNAPSHOT_VERSION = 4
+
+# Snapshots with failed probes are saved too, and the failed probes alone
+# are run again once the snapshot is this old
+SPECS_RETRY_SECONDS = 600
+
+_specs_snapshot = None
+_specs_lock = threading.Lock()
+
+def get_pci_device_list():
+    """List PCI vendor/device IDs without spawning lspci or PowerShell."""
+    try:
+        if platform.system() == "Windows":
+            import winreg
+            devices = []
+            with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"SYSTEM\CurrentControlSet\Enum\PCI") as key:
+                index = 0
+                while True:
+                    try:
+                        devices.append(winreg.EnumKey(key, index))
+                    except OSError:
+                        break
+                    index += 1
+            return sorted(devices)
+        
+        elif platform.system() == "Linux":
+            # One line per device: bus/devfn, vendor+device ID, ...
+            with open('/proc/bus/pci/devices', 'r') as f:
+                return sorted(line.split('\t')[1] for line in f if '\t' in line)
+    except Exception:
+        pass
+    
+    return []
+
+def count_connected_monitors():
+    """Count connected monitors without creating a GUI window."""
+    try:
+        if platform.system() == "Windows":
+            import ctypes
+            return ctypes.windll.user32.GetSystemMetrics(80)  # SM_CMONITORS
+        
+        elif platform.system() == "Linux":
+            count = 0
+            for status_path in glob.glob('/sys/class/drm/card*-*/status'):
+                with open(status_path, 'r') as f:
+                    if f.read().strip() == 'connected':
+                        count += 1
+            return count
+    except Exception:
+        pass
+    
+    return 0
+
+def get_hardware_fingerprint():
+    """Build a cheap fingerprint of the machine from boot time, PCI devices and monitors."""
+    parts = [
+        str(SPECS_SNAPSHOT_VERSION),
+        platform.system(),
+        platform.release(),
+        platform.machine(),
+        # psutil can report boot time a second apart between calls on Windows
+        str(round(psutil.boot_time() / 10)),
+        str(psutil.virtual_memory().total),
+        str(count_connected_monitors()),
+    ]
+    parts.extend(get_pci_device_list())
+    return hashlib.sha256("|".join(parts).encode('utf-8')).hexdigest()
+
+def load_specs_snapshot():
+    """Load the saved specs snapshot from disk, or None if there isn't a usable one."""
+    try:
+        with open(SPECS_CACHE_PATH, 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+        if isinstance(snapshot, dict) and 'fingerprint' in snapshot and 'specs' in snapshot:
+            return snapshot
+    except (OSError, ValueError):
+        pass
+    return None
+
+def save_specs_snapshot(snapshot):
+    """Write the specs snapshot to disk atomically."""
+    try:
+        os.makedirs(os.path.dirname(SPECS_CACHE_PATH), exist_ok=True)
+        temp_path = SPECS_CACHE_PATH + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, indent=2)
+        os.replace(temp_path, SPECS_CACHE_PATH)
+    except OSError as e:
+        print(f"Could not save specs snapshot: {e}")
+
+def retry_failed_probes(specs):
+    """Run the probes listed in specs['incomplete_probes'] again and merge what they find."""
+    probes = {name: HARDWARE_PROBES[name] for name in specs['incomplete_probes'] if name in HARDWARE_PROBES}
+    probe_specs, failed = run_hardware_probes(probes) if probes else ({}, [])
+    
+    specs = dict(specs, **probe_specs)
+    specs.pop('incomplete_probes')
+    if failed:
+        specs['incomplete_probes'] = failed
+    return specs
+
+def get_system_specs(force_refresh=False):
+    """Get system specs, only re-running hardware detection when the fingerprint changes.
+    
+    A snapshot with failed probes is saved and used like any other, and
+    after SPECS_RETRY_SECONDS just the failed probes are run again.
+    """
+    global _specs_snapshot
+    
+    with _specs_lock:
+        fingerprint = get_hardware_fingerprint()
+        
+        if _specs_snapshot is None and not force_refresh:
+            _specs_snapshot = load_specs_snapshot()
+        
+        if (force_refresh or _specs_snapshot is None
+                or _specs_snapshot['fingerprint'] != fingerprint):
+            _specs_snapshot = {
+                'fingerprint': fingerprint,
+                'detected_at': time.time(),
+                'specs': detect_system_specs()
+            }
+            save_specs_snapshot(_specs_snapshot)
+        
+        elif ('incomplete_probes' in _specs_snapshot['specs']
+              and time.time() - _specs_snapshot.get('detected_at', 0) > SPECS_RETRY_SECONDS):
+            _specs_snapshot = {
+                'fingerprint': fingerprint,
+                'detected_at': time.time(),
+                'specs': retry_failed_probes(_specs_snapshot['specs'])
+            }
+            save_specs_snapshot(_specs_snapshot)
+        
+        specs = dict(_specs_snapshot['specs'])
+    
+    # Free space changes between checks without any hardware change
+    specs['storage_free_gb'] = get_storage_free_gb()
+    
+    return specs
+
+# ============================================
+# STEAM API CLIENT
+# ============================================
+
+STEAM_SEARCH_URL = "https://steamcommunity.com/actions/SearchApps/"
+STEAM_APPDETAILS_URL = "https://store.steampowered.com/api/appdetails"
+
+# (connect, read) timeouts in seconds
+STEAM_TIMEOUT = (3.05, 10)
+
+class SteamClient:
+    """Shared HTTP client for the Steam APIs.
+    
+    One pooled requests.Session keeps the TCP+TLS connections to
+    steamcommunity.com and store.steampowered.com alive between checks,
+    and transient failures (including 429 rate limits) are retried with
+    exponential backoff.
+    """
+    
+    def __init__(self, timeout=STEAM_TIMEOUT, retries=3, backoff_factor=0.5, pool_size=10):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': "SHCE/1.0 (System Hardware Compatability Engine)",
+            'Accept': "application/json"
+        })
+        
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            respect_retry_after_header=True
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+    
+    def get(self, url, **kwargs):
+        """GET a URL through the pooled session with the default timeouts."""
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.get(url, **kwargs)
+    
+    def get_json(self, url, **kwargs):
+        """GET a URL and decode its JSON body, raising on HTTP errors."""
+        response = self.get(url, **kwargs)
+        response.raise_for_status()
+        return response.json()
+    
+    def search_apps(self, game_name):
+        """Search Steam apps by name."""
+        return self.get_json(STEAM_SEARCH_URL + requests.utils.quote(game_name, safe=''))
+    
+    def get_app_details(self, app_id):
+        """Get the store appdetails response for one app."""
+        return self.get_json(STEAM_APPDETAILS_URL, params={'appids': app_id})
+    
+    def warm_up(self):
+        """Open the connections to both Steam hosts ahead of the first check."""
+        for url in (STEAM_SEARCH_URL, STEAM_APPDETAILS_URL):
+            try:
+                self.session.head(url, timeout=self.timeout)
+            except requests.RequestException:
+                pass
+    
+    def close(self):
+        self.session.close()
+
+steam_client = SteamClient()
+
+# ============================================
+# STEAM APPDETAILS CACHE
+# ============================================
+
+APPDETAILS_CACHE_PATH = "./cache/steam_appdetails.sqlite3"
+
+# Requirements rarely change, so cached appdetails are trusted for a week and
+# revalidated with ETag/Last-Modified after that
+APPDETAILS_CACHE_TTL = 7 * 24 * 3600
+APPDETAILS_CACHE_MAX_ENTRIES = 5000
+
+# Only these appdetails fields are kept, the rest of the response is large
+# (descriptions, screenshots, ...) and never used
+APPDETAILS_CACHED_FIELDS = ('name', 'type', 'is_free', 'pc_requirements')
+
+class AppDetailsCache:
+    """Persistent SQLite cache of Steam appdetails responses keyed by app_id.
+    
+    Entries older than the TTL are still kept so they can be revalidated
+    with a conditional request, or served if Steam can't be reached. When
+    the cache grows past max_entries the least recently used apps are
+    evicted. Last-access times are only written back once an hour so a
+    cache hit stays a single indexed SELECT. Each row can also carry the
+    parsed requirements record, which is dropped whenever the body changes.
+    """
+    
+    ACCESS_UPDATE_INTERVAL = 3600
+    
+    def __init__(self, path=APPDETAILS_CACHE_PATH, ttl=APPDETAILS_CACHE_TTL,
+                 max_entries=APPDETAILS_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.connection = None
+        self.lock = threading.Lock()
+    
+    def _connect(self):
+        if self.connection is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self.connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS appdetails (
+                    app_id INTEGER PRIMARY KEY,
+                    body TEXT NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    fetched_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    parsed TEXT,
+                    parser_version INTEGER
+                )
+            """)
+            columns = {row[1] for row in self.connection.execute("PRAGMA table_info(appdetails)")}
+            if 'parsed' not in columns:
+                self.connection.execute("ALTER TABLE appdetails ADD COLUMN parsed TEXT")
+                self.connection.execute("ALTER TABLE appdetails ADD COLUMN parser_version INTEGER")
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS appdetails_accessed ON appdetails (accessed_at)"
+            )
+        return self.connection
+    
+    def get(self, app_id):
+        """Return the cached entry for an app (fresh or stale), or None."""
+        with self.lock:
+            row = self._connect().execute(
+                "SELECT body, etag, last_modified, fetched_at, accessed_at FROM appdetails WHERE app_id = ?",
+                (int(app_id),)
+            ).fetchone()
+            if row is None:
+                return None
+            
+            now = time.time()
+            if now - row[4] > self.ACCESS_UPDATE_INTERVAL:
+                self.connection.execute(
+                    "UPDATE appdetails SET accessed_at = ? WHERE app_id = ?", (now, int(app_id))
+                )
+        
+        return {
+            'body': row[0],
+            'etag': row[1],
+            'last_modified': row[2],
+            'fetched_at': row[3],
+            'fresh': now - row[3] < self.ttl
+        }
+    
+    def put(self, app_id, body, etag=None, last_modified=None):
+        """Store an appdetails body and evict old apps if the cache is full."""
+        now = time.time()
+        with self.lock:
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO appdetails (app_id, body, etag, last_modified, fetched_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (int(app_id), body, etag, last_modified, now, now)
+            )
+            connection.execute("""
+                DELETE FROM appdetails WHERE app_id IN (
+                    SELECT app_id FROM appdetails ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.max_entries,))
+    
+    def mark_fresh(self, app_id):
+        """Restart the TTL of an entry after Steam confirmed it is unchanged."""
+        now = time.time()
+        with self.lock:
+            self._connect().execute(
+                "UPDATE appdetails SET fetched_at = ?, accessed_at = ? WHERE app_id = ?",
+                (now, now, int(app_id))
+            )
+    
+    def get_parsed(self, app_id, parser_version):
+        """Return the parsed requirements stored for an app, or None if missing or outdated."""
+        with self.lock:
+            row = self._connect().execute(
+                "SELECT parsed FROM appdetails WHERE app_id = ? AND parser_version = ?",
+                (int(app_id), parser_version)
+            ).fetchone()
+        return json.loads(row[0]) if row and row[0] else None
+    
+    def bodies(self):
+        """Return every cached appdetails body."""
+        with self.lock:
+            return [row[0] for row in self._connect().execute("SELECT body FROM appdetails")]
+    
+    def put_parsed(self, app_id, parsed, parser_version):
+        """Store the parsed requirements next to an app's cached details."""
+        with self.lock:
+            self._connect().execute(
+                "UPDATE appdetails SET parsed = ?, parser_version = ? WHERE app_id = ?",
+                (json.dumps(parsed, separators=(',', ':')), parser_version, int(app_id))
+            )
+
+appdetails_cache = AppDetailsCache()
+
+# Steam allows roughly 200 appdetails requests per 5 minutes per IP
+APPDETAILS_RATE_PER_SECOND = 200 / 300
+APPDETAILS_RATE_BURST = 10
+
+class TokenBucket:
+    """Thread-safe token bucket rate limiter."""
+    
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a token is available, then take it."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            
+            time.sleep(wait)
+
+appdetails_rate_limiter = TokenBucket(APPDETAILS_RATE_PER_SECOND, APPDETAILS_RATE_BURST)
+
+def trim_app_details(data, app_id):
+    """Keep only the appdetails fields the app uses.
+    
+    Unknown or region-locked apps come back as null, without an entry or
+    with success false; all of them become {'success': False}.
+    """
+    entry = data.get(str(app_id)) if isinstance(data, dict) else None
+    if not isinstance(entry, dict) or not entry.get('success') or not isinstance(entry.get('data'), dict):
+        return {'success': False}
+    return {
+        'success': True,
+        'data': {field: entry['data'][field] for field in APPDETAILS_CACHED_FIELDS if field in entry['data']}
+    }
+
+def fetch_app_details(app_id):
+    """Get appdetails for one app, from the cache when it's fresh enough.
+    
+    Stale entries are revalidated with If-None-Match / If-Modified-Since,
+    and served as-is if Steam can't be reached. Returns the entry for the
+    app: {'success': ..., 'data': {...}}.
+    """
+    cached = appdetails_cache.get(app_id)
+    if cached and cached['fresh']:
+        return json.loads(cached['body'])
+    
+    headers = {}
+    if cached:
+        if cached['etag']:
+            headers['If-None-Match'] = cached['etag']
+        if cached['last_modified']:
+            headers['If-Modified-Since'] = cached['last_modified']
+    
+    try:
+        appdetails_rate_limiter.acquire()
+        response = steam_client.get(STEAM_APPDETAILS_URL, params={'appids': app_id}, headers=headers)
+        
+        if response.status_code == 304 and cached:
+            appdetails_cache.mark_fresh(app_id)
+            return json.loads(cached['body'])
+        
+        response.raise_for_status()
+        entry = trim_app_details(response.json(), app_id)
+    except (requests.RequestException, ValueError, KeyError, TypeError):
+        if cached:
+            print(f"Steam unreachable, using cached details for app {app_id}")
+            return json.loads(cached['body'])
+        raise
+    
+    # Failed lookups can be temporary (region locks, rate limits), don't keep
+    # them, and keep serving what we had before
+    if not entry['success'] and cached:
+        print(f"Steam has no details for app {app_id} right now, using cached details")
+        return json.loads(cached['body'])
+    
+    if entry['success']:
+        appdetails_cache.put(
+            app_id,
+            json.dumps(entry, separators=(',', ':')),
+            response.headers.get('ETag'),
+            response.headers.get('Last-Modified')
+        )
+    
+    return entry
+
+# ============================================
+# REQUIREMENTS PARSER
+# ============================================
+
+# Bump this when parse_requirements_html() starts returning different records
+REQUIREMENTS_PARSER_VERSION = 2
+
+# Steam labels seen in pc_requirements, mapped to the record field they fill
+REQUIREMENT_LABELS = {
+    'os': 'os', 'operating system': 'os',
+    'processor': 'processors', 'cpu': 'processors',
+    'memory': 'memory_gb', 'ram': 'memory_gb', 'system memory': 'memory_gb',
+    'graphics': 'graphics', 'video card': 'graphics', 'video': 'graphics',
+    'graphics card': 'graphics', 'gpu': 'graphics',
+    'vram': 'vram_gb', 'video memory': 'vram_gb',
+    'directx': 'directx', 'direct x': 'directx',
+    'storage': 'storage_gb', 'hard drive': 'storage_gb', 'hard disk space': 'storage_gb',
+    'hard disk': 'storage_gb', 'disk space': 'storage_gb', 'hdd': 'storage_gb',
+}
+
+REQUIREMENT_LINE_BREAK_PATTERN = re.compile(r'<br\s*/?>|</?li[^>]*>|</?ul[^>]*>|</?p[^>]*>', re.IGNORECASE)
+REQUIREMENT_TAG_PATTERN = re.compile(r'<[^>]+>')
+REQUIREMENT_LINE_PATTERN = re.compile(r'^\s*([A-Za-z][A-Za-z ®™]{0,24}?)\s*\*?\s*:\s*(.*)$')
+REQUIREMENT_SIZE_PATTERN = re.compile(r'(\d+(?:[.,]\d+)?)\s*(TB|GB|MB|G|M)\b', re.IGNORECASE)
+REQUIREMENT_DIRECTX_PATTERN = re.compile(r'(\d+(?:\.\d+)?)')
+REQUIREMENT_ALTERNATIVES_PATTERN = re.compile(r'\s+or\s+|\s*/\s*|\s*\|\s*|\s*;\s*', re.IGNORECASE)
+# A parenthesized aside, or one left unclosed at the end of the value
+REQUIREMENT_PARENTHESES_PATTERN = re.compile(r'\(([^()]*)\)|\(([^()]*)$')
+REQUIREMENT_PARENTHESIZED_ALTERNATIVE_PATTERN = re.compile(r'^(?:or\b|/)\s*', re.IGNORECASE)
+REQUIREMENT_HARDWARE_BRAND_PATTERN = re.compile(
+    r'\b(?:nvidia|geforce|gtx|rtx|amd|radeon|rx|ryzen|intel|core|xeon|arc|apple)\b', re.IGNORECASE
+)
+
+# Parts like "or equivalent" that name no hardware to look up
+REQUIREMENT_FILLER_PARTS = {'equivalent', 'better', 'higher', 'above', 'similar', 'newer', 'equivalent or better'}
+REQUIREMENT_GRAPHICS_SIZE_PATTERN = re.compile(
+    r'\s*[\(,]?\s*\d+(?:[.,]\d+)?\s*(?:TB|GB|MB|G|M)\b(?:\s*(?:of\s+)?V?RAM)?\s*\)?', re.IGNORECASE
+)
+
+def parse_size_gb(text):
+    """Return the first size in a string ("8 GB", "512 MB") converted to GB."""
+    match = REQUIREMENT_SIZE_PATTERN.search(text)
+    if not match:
+        return None
+    
+    value = float(match.group(1).replace(',', '.'))
+    unit = match.group(2).upper()
+    if unit.startswith('T'):
+        value *= 1024
+    elif unit.startswith('M'):
+        value /= 1024
+    return round(value, 2)
+
+def unwrap_parenthesized_alternative(match):
+    """Keep "(or AMD R9 290)" as an alternative, drop other asides like "(3.2 GHz)"."""
+    inner = (match.group(1) if match.group(1) is not None else match.group(2)).strip()
+    if (REQUIREMENT_PARENTHESIZED_ALTERNATIVE_PATTERN.match(inner)
+            or REQUIREMENT_HARDWARE_BRAND_PATTERN.search(inner)):
+        return ' or ' + REQUIREMENT_PARENTHESIZED_ALTERNATIVE_PATTERN.sub('', inner)
+    return ' '
+
+def split_alternatives(text):
+    """Split "Intel i5-4460 or AMD FX-6300" style values into one entry per part."""
+    text = REQUIREMENT_PARENTHESES_PATTERN.sub(unwrap_parenthesized_alternative, text)
+    parts = [' '.join(part.split()).strip(' .,()') for part in REQUIREMENT_ALTERNATIVES_PATTERN.split(text)]
+    return [part for part in parts if part and part.lower() not in REQUIREMENT_FILLER_PARTS]
+
+def parse_requirements_html(html_text):
+    """Parse one Steam pc_requirements HTML block into a typed record.
+    
+    Returns {'os', 'processors', 'memory_gb', 'graphics', 'vram_gb',
+    'directx', 'storage_gb'}, with None or [] for anything not listed.
+    """
+    record = {
+        'os': None, 'processors': [], 'memory_gb': None, 'graphics': [],
+        'vram_gb': None, 'directx': None, 'storage_gb': None
+    }
+    if not html_text or html_text == 'Not specified':
+        return record
+    
+    for line in REQUIREMENT_LINE_BREAK_PATTERN.split(html_text):
+        line = html.unescape(REQUIREMENT_TAG_PATTERN.sub('', line)).strip()
+        match = REQUIREMENT_LINE_PATTERN.match(line)
+        if not match:
+            continue
+        
+        field = REQUIREMENT_LABELS.get(match.group(1).strip(' \u00ae\u2122').lower())
+        value = match.group(2).strip()
+        if not field or not value:
+            continue
+        
+        if field == 'os':
+            record['os'] = record['os'] or value
+        elif field == 'processors':
+            record['processors'] = split_alternatives(value)
+        elif field == 'graphics':
+            sizes = [parse_size_gb(size.group(0)) for size in REQUIREMENT_SIZE_PATTERN.finditer(value)]
+            if sizes and record['vram_gb'] is None:
+                record['vram_gb'] = min(sizes)
+            models = split_alternatives(REQUIREMENT_GRAPHICS_SIZE_PATTERN.sub(' ', value))
+            record['graphics'] = [model for model in models if model]
+        elif field == 'directx':
+            number = REQUIREMENT_DIRECTX_PATTERN.search(value)
+            if number:
+                record['directx'] = float(number.group(1))
+        else:
+            record[field] = parse_size_gb(value)
+    
+    return record
+
+def get_parsed_requirements(app_id, pc_requirements):
+    """Parse an app's minimum/recommended requirements, reusing the cached record."""
+    parsed = appdetails_cache.get_parsed(app_id, REQUIREMENTS_PARSER_VERSION)
+    if parsed is None:
+        parsed = {
+            'minimum': parse_requirements_html(pc_requirements.get('minimum')),
+            'recommended': parse_requirements_html(pc_requirements.get('recommended'))
+        }
+        appdetails_cache.put_parsed(app_id, parsed, REQUIREMENTS_PARSER_VERSION)
+    return parsed
+
+# ============================================
+# OFFLINE STEAM APP CATALOG
+# ============================================
+
+# Built by --import-catalog from a Steam app list dump, e.g. the JSON from
+# https://api.steampowered.com/ISteamApps/GetAppList/v2/
+STEAM_CATALOG_PATH = "./cache/steam_catalog.json"
+
+# Fuzzy matches scoring below this go to the remote Steam search instead
+CATALOG_MIN_SIMILARITY = 0.5
+
+# Entries that share a game's name but aren't the game itself
+CATALOG_EXTRA_WORDS = {'soundtrack', 'ost', 'dlc', 'demo', 'playtest', 'beta', 'server',
+                       'sdk', 'artbook', 'season', 'pass', 'pack', 'trailer', 'editor', 'tool'}
+
+def normalize_title(title):
+    """Normalize a game title for matching: lowercase, no accents, symbols or extra spaces."""
+    title = unicodedata.normalize('NFKD', title).encode('ascii', 'ignore').decode('ascii')
+    # "Baldur's" -> "baldurs" rather than "baldur s"
+    title = re.sub(r"['`]", '', title.lower())
+    words = re.sub(r'[^a-z0-9]+', ' ', title).split()
+    if len(words) > 1 and words[0] == 'the':
+        words = words[1:]
+    return ' '.join(words)
+
+def title_trigrams(normalized):
+    """Character trigrams of a normalized title, padded so word starts count."""
+    padded = f"  {normalized} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class SteamCatalog:
+    """In-process name -> app_id index over the offline Steam app list.
+    
+    Exact and prefix lookups use a sorted list of normalized titles and
+    take microseconds. Typos and partial names fall back to a trigram
+    index, which is built on first use because it takes a few seconds for
+    the full Steam catalog.
+    """
+    
+    def __init__(self, apps):
+        self.app_ids = array.array('I')
+        self.names = []
+        self.titles = []
+        for app_id, name in apps:
+            normalized = normalize_title(name)
+            if normalized:
+                self.app_ids.append(app_id)
+                self.names.append(name)
+                self.titles.append(normalized)
+        
+        order = sorted(range(len(self.titles)), key=self.titles.__getitem__)
+        self.sorted_titles = [self.titles[i] for i in order]
+        self.sorted_order = array.array('I', order)
+        
+        self.trigram_index = None
+        self.trigram_counts = None
+        self.index_lock = threading.Lock()
+    
+    def __len__(self):
+        return len(self.titles)
+    
+    def _rank(self, index):
+        # The game itself before its soundtrack/DLC/demo, then shorter titles
+        words = set(self.titles[index].split())
+        return (bool(words & CATALOG_EXTRA_WORDS), len(self.titles[index]), self.app_ids[index])
+    
+    def _results(self, indexes, limit):
+        return [{"app_id": self.app_ids[i], "name": self.names[i]} for i in indexes[:limit]]
+    
+    def build_trigram_index(self):
+        """Build the trigram index used for fuzzy matches (safe to call more than once)."""
+        with self.index_lock:
+            if self.trigram_index is not None:
+                return
+            index = {}
+            counts = array.array('H')
+            for i, title in enumerate(self.titles):
+                trigrams = title_trigrams(title)
+                counts.append(min(len(trigrams), 65535))
+                for trigram in trigrams:
+                    postings = index.get(trigram)
+                    if postings is None:
+                        postings = index[trigram] = array.array('I')
+                    postings.append(i)
+            self.trigram_counts = counts
+            self.trigram_index = index
+    
+    def search(self, query, limit=10):
+        """Find apps by title: exact, then prefix, then fuzzy trigram matches."""
+        normalized = normalize_title(query)
+        if not normalized:
+            return []
+        
+        # Exact and prefix matches are neighbours in the sorted title list
+        start = bisect.bisect_left(self.sorted_titles, normalized)
+        exact = []
+        prefix = []
+        position = start
+        while position < len(self.sorted_titles) and self.sorted_titles[position].startswith(normalized):
+            index = self.sorted_order[position]
+            if self.sorted_titles[position] == normalized:
+                exact.append(index)
+            elif self.sorted_titles[position][len(normalized)] == ' ':
+                prefix.append(index)
+            position += 1
+        
+        if exact or prefix:
+            return self._results(sorted(exact, key=self._rank) + sorted(prefix, key=self._rank), limit)
+        
+        self.build_trigram_index()
+        query_trigrams = title_trigrams(normalized)
+        shared = collections.Counter()
+        for trigram in query_trigrams:
+            shared.update(self.trigram_index.get(trigram, ()))
+        
+        scored = []
+        for index, count in shared.most_common(limit * 20):
+            similarity = count / (len(query_trigrams) + self.trigram_counts[index] - count)
+            if similarity >= CATALOG_MIN_SIMILARITY:
+                scored.append((-similarity, self._rank(index), index))
+        scored.sort()
+        
+        return self._results([index for _, _, index in scored], limit)
+
+_steam_catalog = None
+_steam_catalog_lock = threading.Lock()
+
+def import_steam_app_list(dump_path, catalog_path=STEAM_CATALOG_PATH):
+    """Build the offline catalog from a Steam app list JSON dump.
+    
+    Accepts the ISteamApps/GetAppList ({"applist": {"apps": [...]}}) and
+    IStoreService/GetAppList ({"response": {"apps": [...]}}) formats, or a
+    plain list of {"appid", "name"} objects. Returns the number of apps.
+    """
+    global _steam_catalog
+    
+    with open(dump_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    
+    if isinstance(data, dict):
+        data = (data.get('applist') or data.get('response') or {}).get('apps', [])
+    
+    apps = {}
+    for app in data:
+        name = (app.get('name') or '').strip()
+        if name and app.get('appid'):
+            apps[int(app['appid'])] = name
+    
+    os.makedirs(os.path.dirname(catalog_path), exist_ok=True)
+    temp_path = catalog_path + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(sorted(apps.items()), f, separators=(',', ':'), ensure_ascii=False)
+    os.replace(temp_path, catalog_path)
+    
+    with _steam_catalog_lock:
+        _steam_catalog = None
+    
+    return len(apps)
+
+def get_steam_catalog():
+    """Load the offline catalog once, or return None if it hasn't been imported."""
+    global _steam_catalog
+    
+    with _steam_catalog_lock:
+        if _steam_catalog is None:
+            try:
+                with open(STEAM_CATALOG_PATH, 'r', encoding='utf-8') as f:
+                    _steam_catalog = SteamCatalog(json.load(f))
+                print(f"Loaded offline Steam catalog ({len(_steam_catalog)} apps)")
+                # Have the fuzzy index ready before the first misspelled search
+                threading.Thread(target=_steam_catalog.build_trigram_index, daemon=True).start()
+            except (OSError, ValueError):
+                _steam_catalog = False
+        return _steam_catalog or None
+
+# ============================================
+# STEAM API FUNCTIONS
+# ============================================
+
+def search_game_by_name(game_name):
+    """Search for a game by name and return matching results with app IDs."""
+    catalog = get_steam_catalog()
+    if catalog:
+        results = catalog.search(game_name)
+        if results:
+            return results
+    
+    # Not in the offline catalog (or no catalog), ask Steam
+    try:
+        results = steam_client.search_apps(game_name)
+        
+        if not results:
+            return []
+        
+        return [{"app_id": game['appid'], "name": game['name']} for game in results]
+        
+    except:
+        return []
+
+def get_game_requirements(app_id):
+    """Get system requirements for a Steam game using the official API."""
+    try:
+        app_details = fetch_app_details(app_id)
+        
+        if not app_details['success']:
+            return {"error": "Game not found or data unavailable"}
+        
+        game_data = app_details['data']
+        
+        result = {
+            "name": game_data.get('name', 'Unknown'),
+            "app_id": app_id,
+            "type": game_data.get('type', 'Unknown'),
+            "is_free": game_data.get('is_free', False),
+        }
+        
+        pc_req = game_data.get('pc_requirements', {})
+        if pc_req:
+            result['pc_requirements'] = {
+                'minimum': pc_req.get('minimum', 'Not specified'),
+                'recommended': pc_req.get('recommended', 'Not specified')
+            }
+            result['parsed_requirements'] = get_parsed_requirements(app_id, result['pc_requirements'])
+        
+        return result
+        
+    except:
+        return {"error": "Failed to fetch game data"}
+
+# Real Steam pc_requirements blocks used to check the fast cleaner, see --bench-html
+REQUIREMENTS_CORPUS_PATH = "./data/requirements_corpus.json"
+
+# Requirement blobs are flattened by splitting on markup rather than building
+# a BeautifulSoup tree. Comments, doctypes, script/style bodies and bogus end
+# tags are dropped the way html.parser does. Anything left over that still
+# looks like markup (or a reference html.parser chokes on) is malformed HTML,
+# which goes to the BeautifulSoup version so the output always matches it
+# character for character.
+HTML_MARKUP_PATTERN = re.compile(r"""
+    <!--.*?-->
+  | <(script|style)\b(?:[^>"']|"[^"]*"|'[^']*')*>.*?</(?i:script|style)\s*>
+  | </?[a-zA-Z](?:[^<>"']|"[^<"]*"|'[^<']*')*>
+  | <(?:![^\[-]|\?)[^>]*>
+  | </[^a-zA-Z>][^>]*>
+""", re.DOTALL | re.IGNORECASE | re.VERBOSE)
+
+HTML_STRAY_MARKUP_PATTERN = re.compile(r'<[a-zA-Z/!?]|&#[0-9]+[a-fA-F]')
+HTML_REFERENCE_PATTERN = re.compile(
+    r'&(?:(#[xX][0-9a-fA-F]+|#[0-9]+)(?:;|(?![0-9a-fA-F]))|([a-zA-Z][-.a-zA-Z0-9]*);?)'
+)
+HTML_TRAILING_REFERENCE_PATTERN = re.compile(r'&[#a-zA-Z][-.a-zA-Z0-9]*\Z')
+
+def unescape_html_reference(match):
+    """Decode one character reference the way BeautifulSoup's html.parser builder does."""
+    number, name = match.groups()
+    if number:
+        return html.unescape(number.join('&;'))
+    
+    character = html.entities.html5.get(name + ';')
+    if character is None:
+        # Unknown entities keep the ampersand but lose the semicolon
+        return '&' + name
+    return character
+
+def clean_html_requirements(html_text):
+    """Clean HTML from requirements text to make it more readable."""
+    if not html_text or html_text == 'Not specified':
+        return html_text
+    
+    texts = []
+    position = 0
+    for markup in HTML_MARKUP_PATTERN.finditer(html_text):
+        texts.append(html_text[position:markup.start()])
+        position = markup.end()
+    texts.append(html_text[position:])
+    
+    if (HTML_TRAILING_REFERENCE_PATTERN.search(texts[-1])
+            or any(HTML_STRAY_MARKUP_PATTERN.search(text) for text in texts)):
+        return clean_html_requirements_bs4(html_text)
+    
+    lines = []
+    for text in texts:
+        text = HTML_REFERENCE_PATTERN.sub(unescape_html_reference, text).strip()
+        if text:
+            lines.append(text)
+    
+    return '\n'.join(lines)
+
+def clean_html_requirements_bs4(html_text):
+    """Reference implementation of clean_html_requirements() using BeautifulSoup."""
+    if not html_text or html_text == 'Not specified':
+        return html_text
+    
+    soup = BeautifulSoup(html_text, 'html.parser')
+    return soup.get_text(separator='\n', strip=True)
+
+def benchmark_html_cleaners(corpus_path=REQUIREMENTS_CORPUS_PATH, rounds=200):
+    """Check clean_html_requirements() against the BeautifulSoup version and time both.
+    
+    Runs over the bundled corpus plus every requirements block in the
+    appdetails cache, and returns the blobs whose output differs.
+    """
+    with open(corpus_path, 'r', encoding='utf-8') as f:
+        blobs = json.load(f)
+    
+    for body in appdetails_cache.bodies():
+        pc_req = json.loads(body).get('data', {}).get('pc_requirements') or {}
+        if isinstance(pc_req, dict):
+            blobs.extend(value for value in pc_req.values() if isinstance(value, str))
+    
+    mismatches = [blob for blob in blobs if clean_html_requirements(blob) != clean_html_requirements_bs4(blob)]
+    
+    timings = {}
+    for cleaner in (clean_html_requirements_bs4, clean_html_requirements):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for blob in blobs:
+                cleaner(blob)
+        timings[cleaner.__name__] = (time.perf_counter() - start) / (rounds * len(blobs)) * 1e6
+    
+    print(f"{len(blobs)} requirement blocks, {len(mismatches)} mismatches")
+    for name, microseconds in timings.items():
+        print(f"  {name}: {microseconds:.1f} us per block")
+    print(f"  speedup: {timings['clean_html_requirements_bs4'] / timings['clean_html_requirements']:.1f}x")
+    
+    return mismatches
+
+def format_requirements_for_ai(requirements):
+    """Format the requirements data into a clean string for the AI."""
+    if "error" in requirements:
+        return f"Error: {requirements['error']}"
+    
+    formatted = f"GAME REQUIREMENTS FOR: {requirements['name']}\n"
+    formatted += "=" * 50 + "\n"
+    
+    if 'pc_requirements' in requirements:
+        if requirements['pc_requirements']['minimum'] != 'Not specified':
+            formatted += "\nMinimum Requirements:\n"
+            formatted += clean_html_requirements(requirements['pc_requirements']['minimum']) + "\n"
+        
+        if requirements['pc_requirements']['recommended'] != 'Not specified':
+            formatted += "\nRecommended Requirements:\n"
+            formatted += clean_html_requirements(requirements['pc_requirements']['recommended']) + "\n"
+    
+    return formatted
+
+def format_system_specs(specs):
+    """Format system specs into readable text."""
+    formatted = "YOUR PC SPECS:\n"
+    formatted += "=" * 50 + "\n"
+    formatted += f"OS: {specs.get('os', 'Unknown')}\n"
+    formatted += f"Monitor Resolution: {specs.get('resolution', 'Unknown')}\n"
+    if specs.get('refresh_hz'):
+        formatted += f"Monitor Refresh Rate: {specs['refresh_hz']} Hz\n"
+    formatted += f"CPU: {specs.get('cpu', 'Unknown')}\n"
+    formatted += f"CPU Cores/Threads: {specs.get('cpu_cores', '?')}/{specs.get('cpu_threads', '?')}\n"
+    formatted += f"GPU: {specs.get('gpu', 'Unknown')}\n"
+    if specs.get('gpu_vram_gb'):
+        formatted += f"GPU VRAM: {specs['gpu_vram_gb']} GB\n"
+    formatted += f"RAM: {specs.get('ram_total_gb', '?')} GB\n"
+    formatted += f"Free Storage: {specs.get('storage_free_gb', '?')} GB\n"
+    return formatted
+
+# Longest prose analysis, in tokens
+PROSE_MAX_TOKENS = 300
+
+def build_analysis_prompt(game_name, requirements_text, system_specs_text, system_specs, structured=False):
+    """Build the analysis prompt, returned as (shared prefix, full prompt)."""
+    # Everything up to the game requirements is the same for every check on
+    # this PC, so its llama.cpp state is cached by prompt_prefix_cache
+    prefix = f"""<|system|>
+You are a PC gaming expert. Analyze system specifications against game requirements and provide clear compatibility assessments.<|end|>
+<|user|>
+{system_specs_text}
+
+"""
+    if structured:
+        return prefix, prefix + f"""{requirements_text}
+
+Can my PC run {game_name} at {system_specs.get('resolution', 'unknown')} resolution? Answer in JSON with the overall verdict, the estimated FPS range [low, high] for each graphics preset, the recommended preset and the components that would hold the game back.<|end|>
+<|assistant|>"""
+    
+    return prefix, prefix + f"""{requirements_text}
+
+Can my PC run {game_name}? Provide:
+1. Overall verdict (Yes/No/Maybe)
+2. Expected performance at {system_specs.get('resolution', 'unknown')} resolution
+3. Recommended graphics settings
+4. Estimated FPS range<|end|>
+<|assistant|>"""
+
+def compare_specs_with_ai(game_name, requirements_text, system_specs_text, system_specs, model,
+                          on_chunk=None, structured=False, should_stop=None):
+    """Send both game requirements and system specs to local AI for comparison.
+    
+    With on_chunk set the answer is streamed, on_chunk(text) being called
+    for every piece as the model produces it. With structured set the model
+    is constrained by ANALYSIS_GRAMMAR and returns a compact JSON object
+    instead of prose, see parse_structured_analysis(). should_stop() is
+    polled between tokens and ends generation early when it returns True.
+    """
+    prefix, prompt = build_analysis_prompt(game_name, requirements_text, system_specs_text,
+                                           system_specs, structured)
+    if structured:
+        return generate_structured_analysis(model, prefix, prompt, should_stop)
+    
+    generation_args = {
+        'max_tokens': PROSE_MAX_TOKENS,
+        'temperature': 0.3,
+        'stop': ["<|end|>", "<|user|>"],
+        'echo': False
+    }
+    if should_stop is not None:
+        generation_args['stopping_criteria'] = StoppingCriteriaList([lambda input_ids, logits: should_stop()])
+    
+    start = time.perf_counter()
+    restore_prompt_prefix(model, prefix)
+    
+    try:
+        if on_chunk is None:
+            response = model(prompt, **generation_args)
+            print(f"AI analysis took {time.perf_counter() - start:.2f}s")
+            return response['choices'][0]['text'].strip()
+        
+        chunks = []
+        for chunk in model(prompt, stream=True, **generation_args):
+            text = chunk['choices'][0]['text']
+            if not chunks:
+                print(f"First token after {time.perf_counter() - start:.2f}s")
+            chunks.append(text)
+            on_chunk(text)
+        
+        return ''.join(chunks).strip()
+        
+    except Exception as e:
+        return f"Error analyzing with AI: {str(e)}"
+
+# ============================================
+# STRUCTURED AI ANALYSIS
+# ============================================
+
+ANALYSIS_VERDICTS = ['Yes', 'Maybe', 'No']
+ANALYSIS_PRESETS = ['low', 'medium', 'high', 'ultra']
+ANALYSIS_COMPONENTS = ['cpu', 'gpu', 'vram', 'ram', 'storage', 'os']
+
+def bottleneck_grammar_rules(components):
+    """GBNF rules for the bottleneck list: each component at most once, in list order.
+    
+    Rule bottleneck-after-N continues a list whose last entry was
+    components[N] with any later component, or ends it.
+    """
+    rules = [f'bottleneck-{index} ::= "\\"{component}\\""' for index, component in enumerate(components)]
+    
+    def entries_from(start):
+        return [f"bottleneck-{index}" + (f" bottleneck-after-{index}" if index < len(components) - 1 else "")
+                for index in range(start, len(components))]
+    
+    rules.insert(0, 'bottlenecks ::= "[]" | "[" (' + " | ".join(entries_from(0)) + ') "]"')
+    for index in range(len(components) - 1):
+        rules.append(f'bottleneck-after-{index} ::= ("," (' + " | ".join(entries_from(index + 1)) + '))?')
+    return "\n".join(rules)
+
+# GBNF grammar for the structured answer: a fixed-order JSON object with no
+# free text, so the model can only spend tokens on the values themselves
+ANALYSIS_GRAMMAR = r'''
+root ::= "{" "\"verdict\":" verdict "," "\"fps\":" fps "," "\"recommended_preset\":" preset "," "\"bottlenecks\":" bottlenecks "}"
+verdict ::= "\"Yes\"" | "\"Maybe\"" | "\"No\""
+fps ::= "{" "\"low\":" range "," "\"medium\":" range "," "\"high\":" range "," "\"ultra\":" range "}"
+range ::= "[" number "," number "]"
+number ::= [0-9] | [1-9] [0-9] | [1-9] [0-9] [0-9]
+preset ::= "\"low\"" | "\"medium\"" | "\"high\"" | "\"ultra\""
+''' + bottleneck_grammar_rules(ANALYSIS_COMPONENTS) + "\n"
+
+# The longest answer the grammar allows is 183 characters (every component
+# listed, three-digit FPS) and a token is at least one character, so
+# generation can't cut a valid answer short
+ANALYSIS_MAX_TOKENS = 192
+
+@functools.lru_cache(maxsize=1)
+def analysis_grammar():
+    """Compile ANALYSIS_GRAMMAR once."""
+    return LlamaGrammar.from_string(ANALYSIS_GRAMMAR, verbose=False)
+
+def generate_structured_analysis(model, prefix, prompt, should_stop=None):
+    """Run a structured prompt and return the model's JSON text, or an error message."""
+    start = time.perf_counter()
+    restore_prompt_prefix(model, prefix)
+    
+    stopping_criteria = None
+    if should_stop is not None:
+        stopping_criteria = StoppingCriteriaList([lambda input_ids, logits: should_stop()])
+    
+    try:
+        response = model(prompt, max_tokens=ANALYSIS_MAX_TOKENS, temperature=0.3,
+                         grammar=analysis_grammar(), stopping_criteria=stopping_criteria, echo=False)
+        print(f"Structured AI analysis took {time.perf_counter() - start:.2f}s "
+              f"({response['usage']['completion_tokens']} tokens)")
+        return response['choices'][0]['text'].strip()
+    except Exception as e:
+        return f"Error analyzing with AI: {str(e)}"
+
+def parse_structured_analysis(text):
+    """Validate a structured answer into a record, or return None if it doesn't fit.
+    
+    Record: {'verdict': 'Yes'/'Maybe'/'No', 'fps': {preset: [low, high]},
+    'recommended_preset': preset, 'bottlenecks': [component, ...]}
+    """
+    try:
+        data = json.loads(text)
+        
+        fps = {}
+        for preset in ANALYSIS_PRESETS:
+            low, high = (int(value) for value in data['fps'][preset])
+            fps[preset] = [min(low, high), max(low, high)]
+        
+        record = {
+            'verdict': data['verdict'],
+            'fps': fps,
+            'recommended_preset': data['recommended_preset'],
+            'bottlenecks': list(dict.fromkeys(data['bottlenecks']))
+        }
+    except (ValueError, TypeError, KeyError):
+        return None
+    
+    if (record['verdict'] not in ANALYSIS_VERDICTS
+            or record['recommended_preset'] not in ANALYSIS_PRESETS
+            or not all(component in ANALYSIS_COMPONENTS for component in record['bottlenecks'])):
+        return None
+    return record
+
+def format_structured_analysis(record):
+    """Turn a structured record into plain text for places that only show ai_analysis."""
+    lines = [f"Verdict: {record['verdict']}",
+             f"Recommended preset: {record['recommended_preset'].title()}"]
+    lines += [f"{preset.title()}: {low}-{high} FPS" for preset, (low, high) in record['fps'].items()]
+    if record['bottlenecks']:
+        lines.append("Bottlenecks: " + ", ".join(component.upper() for component in record['bottlenecks']))
+    return "\n".join(lines)
+
+# ============================================
+# AI VERDICT CACHE
+# ============================================
+
+# Finished AI analyses, reused for identical hardware, game and model
+VERDICT_CACHE_PATH = "./cache/verdicts.sqlite3"
+VERDICT_CACHE_TTL = 30 * 24 * 3600
+VERDICT_CACHE_MAX_ENTRIES = 20000
+
+# Bump this when the prompt in compare_specs_with_ai() changes
+VERDICT_PROMPT_VERSION = 1
+
+# Free space moves all the time, so it only counts in steps of this many GB
+VERDICT_STORAGE_STEP_GB = 25
+
+class VerdictCache:
+    """Persistent SQLite cache of AI analyses keyed by a content hash.
+    
+    The key already covers everything the analysis depends on, so entries
+    never need invalidating; ones nobody asks for again just age out
+    through the TTL or least-recently-used eviction.
+    """
+    
+    ACCESS_UPDATE_INTERVAL = 3600
+    
+    def __init__(self, path=VERDICT_CACHE_PATH, ttl=VERDICT_CACHE_TTL,
+                 max_entries=VERDICT_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.connection = None
+        self.lock = threading.Lock()
+    
+    def _connect(self):
+        if self.connection is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self.connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS verdicts (
+                    key TEXT PRIMARY KEY,
+                    analysis TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS verdicts_accessed ON verdicts (accessed_at)"
+            )
+        return self.connection
+    
+    def get(self, key):
+        """Return the cached analysis for a key, or None if missing or expired."""
+        with self.lock:
+            row = self._connect().execute(
+                "SELECT analysis, created_at, accessed_at FROM verdicts WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            
+            now = time.time()
+            if now - row[1] > self.ttl:
+                return None
+            if now - row[2] > self.ACCESS_UPDATE_INTERVAL:
+                self.connection.execute("UPDATE verdicts SET accessed_at = ? WHERE key = ?", (now, key))
+        
+        return row[0]
+    
+    def put(self, key, analysis):
+        """Store an analysis, dropping expired entries and the least recently used past max_entries."""
+        now = time.time()
+        with self.lock:
+            connection = self._connect()
+            connection.execute("INSERT OR REPLACE INTO verdicts VALUES (?, ?, ?, ?)", (key, analysis, now, now))
+            connection.execute("DELETE FROM verdicts WHERE created_at < ?", (now - self.ttl,))
+            connection.execute("""
+                DELETE FROM verdicts WHERE key IN (
+                    SELECT key FROM verdicts ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.max_entries,))
+
+verdict_cache = VerdictCache()
+
+@functools.lru_cache(maxsize=8)
+def model_identifier(path):
+    """Identify a model file by name, size and modification time."""
+    try:
+        stat = os.stat(path)
+        return f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+    except OSError:
+        return os.path.basename(path)
+
+def verdict_cache_key(specs, app_id, requirements_text, model_id, structured=False):
+    """Hash everything an AI analysis depends on into a cache key.
+    
+    Uses the spec fields format_system_specs() puts in the prompt,
+    normalized so cosmetic differences (case, whitespace, a few GB of free
+    space) don't split the cache, plus the app, its requirements text, the
+    model, the prompt version and whether the structured prompt was used.
+    """
+    def text(value):
+        return ' '.join(str(value).lower().split()) if value is not None else ''
+    
+    def rounded(value, step=1):
+        number = as_number(value)
+        return int(number // step * step) if number is not None else text(value)
+    
+    fields = [
+        text(specs.get('os')), text(specs.get('resolution')), rounded(specs.get('refresh_hz')),
+        text(specs.get('cpu')), text(specs.get('cpu_cores')), text(specs.get('cpu_threads')),
+        text(specs.get('gpu')), rounded(specs.get('gpu_vram_gb')), round(as_number(specs.get('ram_total_gb')) or 0),
+        rounded(specs.get('storage_free_gb'), VERDICT_STORAGE_STEP_GB),
+        int(app_id), hashlib.sha256(requirements_text.encode('utf-8')).hexdigest(),
+        model_id, VERDICT_PROMPT_VERSION, bool(structured)
+    ]
+    return hashlib.sha256(json.dumps(fields).encode('utf-8')).hexdigest()
+
+# ============================================
+# PROMPT PREFIX STATE CACHE
+# ============================================
+
+# llama.cpp states saved right after the prompt prefix shared by every check
+PREFIX_STATE_DIR = "./cache/prefix_states"
+PREFIX_STATE_MAX_FILES = 4
+
+# Most disk space the saved states may take together. A state holds the KV
+# cache of the whole prefix, hundreds of MB for a 3-4B model
+PREFIX_STATE_MAX_BYTES = 2 * 1024**3
+
+class PromptPrefixCache:
+    """Reuses the llama.cpp state for the prompt prefix shared between checks.
+    
+    The system preamble and the PC specs block are the same for every game
+    checked on one machine. They are evaluated once, the model state is
+    saved (in memory and pickled to disk, so it survives restarts) and it is
+    loaded again before each request. llama.cpp then finds the prefix
+    already in its context and only evaluates the tokens after it.
+    """
+    
+    def __init__(self, directory=PREFIX_STATE_DIR, max_files=PREFIX_STATE_MAX_FILES,
+                 max_bytes=PREFIX_STATE_MAX_BYTES):
+        self.directory = directory
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.key = None
+        self.state = None
+        self.lock = threading.Lock()
+    
+    def _key(self, model, prefix):
+        model_id = model_identifier(model.model_path)
+        return hashlib.sha256(f"{model_id}\0{model.n_ctx()}\0{prefix}".encode('utf-8')).hexdigest()
+    
+    def _load(self, key):
+        path = os.path.join(self.directory, f"{key}.pkl")
+        try:
+            with open(path, 'rb') as f:
+                state = pickle.load(f)
+            os.utime(path)
+            return state
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Discarding prompt prefix state {path}: {e}")
+            return None
+    
+    def _save(self, key, state):
+        """Write a state to disk, keeping only the most recently used files that fit max_bytes."""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, f"{key}.pkl")
+            with open(path + '.tmp', 'wb') as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(path + '.tmp', path)
+            
+            files = sorted(glob.glob(os.path.join(self.directory, '*.pkl')), key=os.path.getmtime, reverse=True)
+            total_bytes = 0
+            for index, old_path in enumerate(files):
+                total_bytes += os.path.getsize(old_path)
+                if index >= self.max_files or total_bytes > self.max_bytes:
+                    os.remove(old_path)
+        except OSError as e:
+            print(f"Could not save prompt prefix state: {e}")
+    
+    def restore(self, model, prefix):
+        """Put the model in the state right after a prompt prefix.
+        
+        Returns where the state came from: 'context' if the model still had
+        it loaded, 'memory', 'disk', or 'evaluated' on first use.
+        """
+        key = self._key(model, prefix)
+        
+        with self.lock:
+            if key == self.key:
+                state = self.state
+                source = 'memory'
+            else:
+                state = self._load(key)
+                source = 'disk'
+            
+            if state is None:
+                model.reset()
+                model.eval(model.tokenize(prefix.encode('utf-8'), add_bos=True, special=True))
+                state = model.save_state()
+                # The state carries a row of logits per prefix token, n_vocab
+                # floats each. Only the last is ever sampled from, and
+                # load_state() broadcasts it back over the prefix rows
+                state.scores = state.scores[-1:].copy()
+                self._save(key, state)
+                source = 'evaluated'
+            elif (model.n_tokens >= state.n_tokens
+                  and (model.input_ids[:state.n_tokens] == state.input_ids[:state.n_tokens]).all()):
+                source = 'context'
+            else:
+                model.load_state(state)
+            
+            self.key = key
+            self.state = state
+        
+        return source, state.n_tokens
+
+prompt_prefix_cache = PromptPrefixCache()
+
+def restore_prompt_prefix(model, prefix):
+    """Load the cached state for a prompt prefix, carrying on without it if that fails."""
+    start = time.perf_counter()
+    try:
+        source, prefix_tokens = prompt_prefix_cache.restore(model, prefix)
+        print(f"Prompt prefix ({prefix_tokens} tokens) from {source} in {time.perf_counter() - start:.2f}s")
+    except Exception as e:
+        print(f"Prompt prefix cache unavailable: {e}")
+
+# ============================================
+# HARDWARE PERFORMANCE DATABASE
+# ============================================
+
+# Relative GPU and CPU performance scores, see the "about" entry in the file
+HARDWARE_SCORES_PATH = "./data/hardware_scores.json"
+
+# Matches scoring below this are treated as hardware the table doesn't know
+HARDWARE_MIN_SIMILARITY = 0.6
+
+# Laptop GPUs run well below the desktop card with the same name
+MOBILE_GPU_FACTOR = 0.75
+
+# Marketing noise dropped before tokenizing: trademarks, "12th Gen",
+# "8-Core", clock speeds
+HARDWARE_NOISE_PATTERN = re.compile(r"""
+    \(r\)|\(tm\)|®|™
+  | \b\d+(?:st|nd|rd|th)\s+gen\b
+  | \b(?:\d+|dual|quad|six|eight)[\s-]core\b
+  | @?\s*\b\d+(?:\.\d+)?\s*[gm]hz\b
+""", re.VERBOSE)
+
+# Memory sizes ("6 GB" -> "6gb"), laptop model numbers without their "M"
+# ("970m" -> "970"), letters glued to a model number ("rtx3060" -> "rtx",
+# "3060"), then plain words
+HARDWARE_TOKEN_PATTERN = re.compile(r'\d+\s*[gm]b\b|\d{3,4}(?=m\b)|[a-z]+(?=\d{3,})|[a-z0-9+]+')
+
+HARDWARE_STOPWORDS = {
+    'nvidia', 'geforce', 'amd', 'ati', 'intel', 'corporation', 'processor', 'cpu', 'gpu',
+    'graphics', 'card', 'series', 'with', 'or', 'and', 'better', 'equivalent', 'compatible',
+    'vram', 'video', 'memory', 'laptop', 'mobile', 'desktop', 'm'
+}
+
+# Suffixes that separate cards sharing a model number (3060 vs 3060 Ti)
+HARDWARE_SUFFIX_TOKENS = {'ti', 'super', 'xt', 'xtx', 'k', 'x', 'pro', 'max'}
+
+MOBILE_GPU_PATTERN = re.compile(r'laptop|mobile|max-q|\b\d{3,4}m\b')
+
+@functools.lru_cache(maxsize=8192)
+def hardware_tokens(name):
+    """Normalize a GPU or CPU name into its tuple of model tokens."""
+    text = HARDWARE_NOISE_PATTERN.sub(' ', (name or '').lower())
+    tokens = []
+    for token in HARDWARE_TOKEN_PATTERN.findall(text):
+        token = token.replace(' ', '')
+        if token not in HARDWARE_STOPWORDS and token not in tokens:
+            tokens.append(token)
+    return tuple(tokens)
+
+def token_digits(token):
+    """The digits of a token, so "8700k" and "8700" share a key."""
+    return ''.join(character for character in token if character.isdigit())
+
+def token_weight(token):
+    """How much a token counts when comparing names; model numbers count most."""
+    if token.endswith(('gb', 'mb')) and token[:-2].isdigit():
+        return 1
+    if any(character.isdigit() for character in token):
+        return 3
+    if token in HARDWARE_SUFFIX_TOKENS:
+        return 2
+    return 1
+
+def within_one_edit(a, b):
+    """True when two strings are at most one insert, delete or substitution apart."""
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+    
+    for index in range(len(a)):
+        if a[index] != b[index]:
+            if len(a) == len(b):
+                return a[index + 1:] == b[index + 1:]
+            return a[index:] == b[index + 1:]
+    return True
+
+def tokens_close(a, b):
+    """Fuzzy token match: same model number with a one-letter suffix difference, or a one-letter typo."""
+    a_digits = token_digits(a)
+    if a_digits or token_digits(b):
+        return a_digits == token_digits(b) and within_one_edit(a, b)
+    return len(a) >= 4 and len(b) >= 4 and within_one_edit(a, b)
+
+class HardwareScoreIndex:
+    """Fuzzy lookup of hardware names in one table of performance scores.
+    
+    Every entry is indexed by the digits of its model-number tokens (or by
+    its words when it has none), so a lookup only scores the few entries
+    sharing a model number with the query. Candidates are ranked by
+    weighted token overlap, where near-miss tokens ("8700" vs "8700k")
+    count half.
+    """
+    
+    def __init__(self, scores):
+        self.names = list(scores)
+        self.scores = [scores[name] for name in self.names]
+        self.tokens = [hardware_tokens(name) for name in self.names]
+        self.index = collections.defaultdict(list)
+        
+        for entry, tokens in enumerate(self.tokens):
+            for key in self._index_keys(tokens):
+                self.index[key].append(entry)
+    
+    @staticmethod
+    def _index_keys(tokens):
+        keys = {token_digits(token) for token in tokens if token_weight(token) == 3}
+        return keys or set(tokens)
+    
+    def _similarity(self, query, entry_tokens):
+        matched = 0.0
+        for token in entry_tokens:
+            if token in query:
+                matched += token_weight(token)
+            elif any(tokens_close(token, other) for other in query):
+                matched += token_weight(token) / 2
+        
+        total = sum(map(token_weight, query)) + sum(map(token_weight, entry_tokens)) - matched
+        return matched / total if total else 0.0
+    
+    def match(self, name):
+        """Return (entry name, score, similarity) for the best match, or None."""
+        query = hardware_tokens(name)
+        candidates = set()
+        for key in self._index_keys(query):
+            candidates.update(self.index.get(key, ()))
+        
+        best = None
+        for entry in candidates:
+            similarity = self._similarity(query, self.tokens[entry])
+            if best is None or similarity > best[2]:
+                best = (self.names[entry], self.scores[entry], similarity)
+        
+        if best is None or best[2] < HARDWARE_MIN_SIMILARITY:
+            return None
+        return best
+
+@functools.lru_cache(maxsize=1)
+def get_hardware_score_indexes():
+    """Load the bundled performance table, returns {'gpus': index, 'cpus': index}."""
+    try:
+        with open(HARDWARE_SCORES_PATH, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Hardware score table unavailable: {e}")
+        data = {}
+    
+    return {
+        'gpus': HardwareScoreIndex(data.get('gpus', {})),
+        'cpus': HardwareScoreIndex(data.get('cpus', {}))
+    }
+
+@functools.lru_cache(maxsize=4096)
+def gpu_score(name):
+    """Relative performance score of a GPU name from the bundled table, or None."""
+    match = get_hardware_score_indexes()['gpus'].match(name)
+    if match is None:
+        return None
+    
+    score = match[1]
+    if MOBILE_GPU_PATTERN.search((name or '').lower()) and not MOBILE_GPU_PATTERN.search(match[0].lower()):
+        score = round(score * MOBILE_GPU_FACTOR)
+    return score
+
+@functools.lru_cache(maxsize=4096)
+def cpu_score(name):
+    """Relative performance score of a CPU name from the bundled table, or None."""
+    match = get_hardware_score_indexes()['cpus'].match(name)
+    return match[1] if match else None
+
+# ============================================
+# RULE-BASED COMPATIBILITY SCORER
+# ============================================
+
+# Checks scoring at least this confident skip the AI model
+RULES_CONFIDENCE_THRESHOLD = 0.8
+
+# How much each component counts towards a "Yes" verdict's confidence
+RULES_WEIGHTS = {'gpu': 0.35, 'cpu': 0.25, 'ram': 0.2, 'vram': 0.1, 'storage': 0.1}
+
+# Rough scores for hardware missing from the performance table, by tier
+GPU_TIER_SCORES = {'integrated': 1200, 'entry': 6000, 'mid': 13000, 'high': 20000, 'enthusiast': 30000}
+CPU_TIER_SCORES = [3000, 9000, 18000, 35000]
+
+# Table scores are close estimates, tier estimates much rougher, so results
+# within this fraction of a requirement are treated as borderline
+TABLE_SCORE_TOLERANCE = 0.1
+TIER_SCORE_TOLERANCE = 0.3
+
+CPU_TIER_PATTERN = re.compile(r"""
+    \b(?:core\s*(?:\(tm\))?\s*)?i(?P<intel_class>[3579])(?:\s*-\s*|\s+)?(?P<intel_model>\d{3,5})?
+  | \bcore\s*(?:\(tm\))?\s*ultra\s*(?P<ultra_class>[579])
+  | \bryzen\s*(?:\(tm\))?\s*(?:(?P<threadripper>threadripper)|(?P<ryzen_class>[3579]))(?:\s+pro)?\s*(?P<ryzen_model>\d{4})?
+  | (?P<legacy>\bcore\s*2|pentium|celeron|athlon|phenom|\bfx\b|sempron|\bdual[\s-]core|\bquad[\s-]core
+        |\d(?:\.\d+)?\s*ghz)
+""", re.VERBOSE)
+
+@functools.lru_cache(maxsize=4096)
+def cpu_tier(name):
+    """Rough performance tier of a CPU name from 0 (legacy/entry) to 3 (enthusiast), or None."""
+    match = CPU_TIER_PATTERN.search((name or '').lower())
+    if match is None:
+        return None
+    
+    if match.group('intel_class'):
+        base = {'3': 0, '5': 1, '7': 2, '9': 3}[match.group('intel_class')]
+        model = match.group('intel_model')
+        if model is None:
+            return max(0, base - 1)
+        # i7-920 / i5-4460 / i7-8700 / i5-12400: older generations rank lower
+        generation = 1 if len(model) == 3 else int(model[:2]) if len(model) == 5 else int(model[0])
+        age_penalty = 2 if generation <= 3 else 1 if generation <= 7 else 0
+        return max(0, base - age_penalty)
+    
+    if match.group('ultra_class'):
+        return {'5': 1, '7': 2, '9': 3}[match.group('ultra_class')]
+    
+    if match.group('threadripper'):
+        return 3
+    
+    if match.group('ryzen_class'):
+        base = {'3': 0, '5': 1, '7': 2, '9': 3}[match.group('ryzen_class')]
+        model = match.group('ryzen_model')
+        # Ryzen 1000 / 2000 parts trail the later generations by a class
+        age_penalty = 1 if model and model[0] in '12' else 0
+        return max(0, base - age_penalty)
+    
+    return 0
+
+def gpu_performance(name):
+    """Return (score, from_table) for a GPU name, estimating from its tier when the table misses."""
+    score = gpu_score(name)
+    if score is not None:
+        return score, True
+    return GPU_TIER_SCORES.get(classify_gpu(name)['tier']), False
+
+def cpu_performance(name):
+    """Return (score, from_table) for a CPU name, estimating from its tier when the table misses."""
+    score = cpu_score(name)
+    if score is not None:
+        return score, True
+    tier = cpu_tier(name)
+    return (CPU_TIER_SCORES[tier] if tier is not None else None), False
+
+def as_number(value):
+    """Return a spec value as a float, or None for '?', 'Unknown' and the like."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def required_performance(names, performance_function):
+    """Score of the easiest alternative a requirement lists, as (score, from_table).
+    
+    Steam lists roughly equivalent parts ("GTX 960 or R7 370"), any one of
+    which is enough, so the lowest known score is the requirement.
+    """
+    known = [result for result in map(performance_function, names) if result[0] is not None]
+    if not known:
+        return None, False
+    return min(known)
+
+def check_requirement(label, system_value, minimum, recommended, unit=None, tolerance=0.0):
+    """Compare one component against the minimum and recommended requirement.
+    
+    Returns (status, certainty, reason) where status is 'recommended',
+    'minimum', 'below' or 'unknown', and certainty says how sure the
+    comparison is. Values within tolerance of a requirement are borderline
+    and less certain. Without a unit the values are performance scores and
+    the reason quotes their ratio.
+    """
+    if system_value is None or (minimum is None and recommended is None):
+        return 'unknown', 0.0, f"{label}: not enough information to compare"
+    
+    def margin(required):
+        return system_value / required - 1 if required else 1
+    
+    def describe(outcome, required):
+        level = 'recommended' if required is recommended else 'minimum'
+        if unit is None:
+            return f"{label}: performance is {system_value / required:.1f}x the {level}"
+        return f"{label}: {system_value:g}{unit} {outcome} the {required:g}{unit} {level}"
+    
+    if recommended is not None and margin(recommended) >= 0:
+        certainty = 1.0 if margin(recommended) >= tolerance else 0.85
+        return 'recommended', certainty, describe("meets", recommended)
+    
+    if minimum is None:
+        return 'unknown', 0.0, f"{label}: below recommended, no minimum listed"
+    
+    if margin(minimum) >= 0:
+        certainty = 0.8 if margin(minimum) >= tolerance else 0.6
+        return 'minimum', certainty, describe("meets", minimum)
+    
+    # Well short of the minimum is a sure fail, just short is worth a second opinion
+    clear_fail = margin(minimum) < -0.25 - tolerance
+    return 'below', 0.95 if clear_fail else 0.7, describe("is below", minimum)
+
+def check_performance(label, system, minimum, recommended):
+    """check_requirement() for (score, from_table) performance pairs."""
+    from_table = system[1] and all(flag for score, flag in (minimum, recommended) if score is not None)
+    return check_requirement(
+        label, system[0], minimum[0], recommended[0],
+        tolerance=TABLE_SCORE_TOLERANCE if from_table else TIER_SCORE_TOLERANCE
+    )
+
+def score_compatibility(specs, parsed):
+    """Score a system against parsed requirements without the AI model.
+    
+    Returns {'verdict': 'Yes'/'No'/'Maybe', 'confidence': 0-1, 'reasons': [...],
+    'level': 'recommended'/'minimum'/None}, level being the requirement set
+    every comparable component meets.
+    A missing GPU, CPU or RAM minimum is a "No"; short VRAM or storage alone
+    is a "Maybe". A "Yes" needs the GPU or CPU to be comparable and its
+    confidence is weighed over the components that could be compared, so
+    pages too vague to judge come back as an unsure "Maybe" for the AI model.
+    """
+    if not parsed:
+        return {'verdict': 'Maybe', 'confidence': 0.0, 'reasons': ["No PC requirements listed"], 'level': None}
+    
+    minimum = parsed.get('minimum') or {}
+    recommended = parsed.get('recommended') or {}
+    
+    checks = {
+        'gpu': check_performance(
+            "GPU", gpu_performance(specs.get('gpu')),
+            required_performance(minimum.get('graphics', []), gpu_performance),
+            required_performance(recommended.get('graphics', []), gpu_performance)
+        ),
+        'cpu': check_performance(
+            "CPU", cpu_performance(specs.get('cpu')),
+            required_performance(minimum.get('processors', []), cpu_performance),
+            required_performance(recommended.get('processors', []), cpu_performance)
+        ),
+        'ram': check_requirement(
+            "RAM", as_number(specs.get('ram_total_gb')),
+            minimum.get('memory_gb'), recommended.get('memory_gb'), unit=" GB"
+        ),
+        'vram': check_requirement(
+            "VRAM", as_number(specs.get('gpu_vram_gb')),
+            minimum.get('vram_gb'), recommended.get('vram_gb'), unit=" GB"
+        ),
+        'storage': check_requirement(
+            "Storage", as_number(specs.get('storage_free_gb')),
+            minimum.get('storage_gb'), recommended.get('storage_gb'), unit=" GB free"
+        ),
+    }
+    reasons = [reason for _, _, reason in checks.values()]
+    
+    core_failures = [certainty for name, (status, certainty, _) in checks.items()
+                     if status == 'below' and name in ('gpu', 'cpu', 'ram')]
+    if core_failures:
+        return {'verdict': 'No', 'confidence': max(core_failures), 'reasons': reasons, 'level': None}
+    
+    if any(status == 'below' for status, _, _ in checks.values()):
+        return {'verdict': 'Maybe', 'confidence': 0.5, 'reasons': reasons, 'level': None}
+    
+    known = {name: certainty for name, (status, certainty, _) in checks.items() if status != 'unknown'}
+    if 'gpu' not in known and 'cpu' not in known:
+        return {'verdict': 'Maybe', 'confidence': 0.0, 'reasons': reasons, 'level': None}
+    
+    confidence = sum(RULES_WEIGHTS[name] * certainty for name, certainty in known.items())
+    confidence /= sum(RULES_WEIGHTS[name] for name in known)
+    level = 'minimum' if any(status == 'minimum' for status, _, _ in checks.values()) else 'recommended'
+    return {'verdict': 'Yes', 'confidence': round(confidence, 2), 'reasons': reasons, 'level': level}
+
+def format_rules_analysis(score):
+    """Turn a rule-based score into the text shown in place of the AI analysis."""
+    if score['verdict'] == 'Yes':
+        summary = f"Yes - your PC meets the {score['level']} requirements."
+    elif score['verdict'] == 'No':
+        summary = "No - your PC is below the minimum requirements."
+    else:
+        summary = "Maybe - some components are borderline."
+    
+    return summary + "\n\n" + "\n".join(f"- {reason}" for reason in score['reasons'])
+
+# ============================================
+# BULK REQUIREMENTS FETCHER
+# ============================================
+
+def fetch_requirements_bulk(app_ids, max_workers=8):
+    """Fetch requirements for many apps concurrently, yielding results as they finish.
+    
+    Yields (app_id, requirements) pairs in completion order. Apps with
+    fresh cached details come back straight away, network fetches share
+    the appdetails token bucket so the whole run stays at Steam's allowed
+    rate, and at most max_workers * 2 fetches are queued at once so huge
+    app ID lists don't pile up in memory.
+    """
+    app_ids = iter(dict.fromkeys(app_ids))
+    
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="appdetails") as executor:
+        pending = {}
+        
+        def submit_next():
+            for app_id in app_ids:
+                pending[executor.submit(get_game_requirements, app_id)] = app_id
+                return True
+            return False
+        
+        for _ in range(max_workers * 2):
+            if not submit_next():
+                break
+        
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                app_id = pending.pop(future)
+                try:
+                    yield app_id, future.result()
+                except Exception as e:
+                    yield app_id, {"error": str(e)}
+                submit_next()
+
+def read_app_id_list(path):
+    """Read app IDs from a JSON list or a text file with one ID per line."""
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    
+    try:
+        return [int(app_id) for app_id in json.loads(text)]
+    except ValueError:
+        return [int(line) for line in text.split() if line.strip().isdigit()]
+
+# ============================================
+# FLEET COMPATIBILITY MATRIX
+# ============================================
+
+# Machines evaluated per vectorized block, keeps temporaries to a few
+# hundred MB even against tens of thousands of games
+FLEET_CHUNK_ROWS = 256
+
+# Requirements assume 1080p; GPU demand grows with pixel count, with this
+# exponent when a machine's native resolution is higher (or lower)
+REFERENCE_PIXELS = 1920 * 1080
+RESOLUTION_SCALING_EXPONENT = 0.5
+
+FLEET_VERDICT_NO = 0
+FLEET_VERDICT_MAYBE = 1
+FLEET_VERDICT_YES = 2
+
+FLEET_COMPONENTS = ('gpu', 'cpu', 'ram', 'vram', 'storage')
+
+def resolution_pixels(resolution):
+    """Pixel count of a "2560x1440" resolution string, or None."""
+    try:
+        width, height = str(resolution).lower().split('x')
+        return int(width) * int(height)
+    except ValueError:
+        return None
+
+def pack_fleet_specs(specs_list):
+    """Pack machine spec dicts into float32 NumPy columns, NaN where unknown.
+    
+    Returns {'gpu', 'cpu', 'ram', 'vram', 'storage', 'pixels'}, using the
+    same performance scores as the rule-based scorer.
+    """
+    import numpy as np
+    
+    rows = [
+        (
+            gpu_performance(specs.get('gpu'))[0],
+            cpu_performance(specs.get('cpu'))[0],
+            as_number(specs.get('ram_total_gb')),
+            as_number(specs.get('gpu_vram_gb')),
+            as_number(specs.get('storage_free_gb')),
+            resolution_pixels(specs.get('resolution'))
+        )
+        for specs in specs_list
+    ]
+    columns = np.array(rows, dtype=np.float32).reshape(len(rows), 6).T
+    return dict(zip(FLEET_COMPONENTS + ('pixels',), columns))
+
+def pack_game_requirements(parsed_list):
+    """Pack parsed requirements into float32 NumPy columns, NaN where not listed.
+    
+    Returns {'min_gpu', 'rec_gpu', 'min_cpu', ...} for every component in
+    FLEET_COMPONENTS. Games without parsed requirements are all NaN.
+    """
+    import numpy as np
+    
+    rows = []
+    for parsed in parsed_list:
+        row = []
+        for level in ('minimum', 'recommended'):
+            requirement = (parsed or {}).get(level) or {}
+            row += [
+                required_performance(requirement.get('graphics', []), gpu_performance)[0],
+                required_performance(requirement.get('processors', []), cpu_performance)[0],
+                requirement.get('memory_gb'),
+                requirement.get('vram_gb'),
+                requirement.get('storage_gb')
+            ]
+        rows.append(row)
+    
+    columns = np.array(rows, dtype=np.float32).reshape(len(rows), 10).T
+    names = [f"{level}_{component}" for level in ('min', 'rec') for component in FLEET_COMPONENTS]
+    return dict(zip(names, columns))
+
+def iter_fleet_compatibility(machines, games, chunk_rows=FLEET_CHUNK_ROWS, scale_for_resolution=True):
+    """Evaluate packed machines against packed games, one block of machines at a time.
     
-    virtual_keywords = ['parsec', 'virtual', 'remote', 'microsoft basic', 'vnc', 
-                       'teamviewer', 'splashtop', 'citrix', 'vmware', 'hyper-v',
-                       'generic pnp', 'rdp', 'standard vga']
+    Yields (row_start, verdict, meets_recommended, headroom) where each
+    matrix covers machines[row_start:row_start + chunk_rows] by all games:
+        verdict: int8 FLEET_VERDICT_NO / MAYBE / YES, the same rules as
+            score_compatibility() (short GPU, CPU or RAM is a No, short
+            VRAM or storage a Maybe, and a Yes needs the GPU or CPU to be
+            comparable, so games without requirements are a Maybe)
+        meets_recommended: bool, a Yes where no component only meets its
+            minimum, score_compatibility()'s 'recommended' level; games
+            listing no recommended tier never meet it
+        headroom: float32 ratio of the tightest GPU/CPU/RAM/VRAM minimum,
+            NaN when none of them is known
+    Unknown values never fail a requirement, as in the single-game check.
+    """
+    import numpy as np
     
-    integrated_keywords = ['intel(r) uhd', 'intel(r) hd', 'intel hd', 'intel uhd',
-                          'amd radeon(tm) graphics', 'radeon graphics', 'vega graphics',
-                          'radeon vega', 'intel iris xe']
+    machine_count = len(machines['gpu'])
     
-    try:
-        if platform.system() == "Windows":
-            ps_command = """
-            Get-CimInstance Win32_VideoController | Where-Object {
-                $_.Name -notmatch 'Parsec|Virtual|Remote|Microsoft Basic|Generic PnP|RDP|Standard VGA'
-            } | Select-Object Name | ConvertTo-Json
-            """
-            
-            gpu_info = run_powershell_command(ps_command)
-            
-            if gpu_info:
-                try:
-                    gpu_data = json.loads(gpu_info)
-                    
-                    if isinstance(gpu_data, dict):
-                        gpu_data = [gpu_data]
-                    
-                    dedicated_gpus = []
-                    integrated_gpus = []
-                    
-                    for gpu in gpu_data:
-                        name = gpu.get('Name', '').strip()
-                        name_lower = name.lower()
-                        
-                        if (name and 
-                            ('amd' in name_lower or 'radeon' in name_lower or
-                             'nvidia' in name_lower or 'geforce' in name_lower or
-                             'intel' in name_lower and 'arc' in name_lower or
-                             'intel' in name_lower and 'uhd' in name_lower or
-                             'intel' in name_lower and 'iris' in name_lower or
-                             'intel' in name_lower and 'hd graphics' in name_lower or
-                             'gtx' in name_lower or 'rtx' in name_lower or
-                             'rx' in name_lower)):
-                            
-                            is_integrated = any(keyword in name_lower for keyword in integrated_keywords)
-                            
-                            if is_integrated:
-                                integrated_gpus.append(name)
-                            else:
-                                dedicated_gpus.append(name)
-                    
-                    if dedicated_gpus:
-                        gpu_name = dedicated_gpus[0]
-                    elif integrated_gpus:
-                        gpu_name = integrated_gpus[0]
-                    
-                    return gpu_name
+    for start in range(0, machine_count, chunk_rows):
+        block = slice(start, start + chunk_rows)
+        system = {component: machines[component][block, None] for component in FLEET_COMPONENTS}
+        
+        if scale_for_resolution:
+            pixels = machines['pixels'][block, None]
+            scale = np.where(np.isnan(pixels), 1.0, (REFERENCE_PIXELS / pixels) ** RESOLUTION_SCALING_EXPONENT)
+            system['gpu'] = system['gpu'] * scale.astype(np.float32)
+        
+        shape = (len(system['gpu']), len(games['min_gpu']))
+        core_below = np.zeros(shape, dtype=bool)
+        core_known = np.zeros(shape, dtype=bool)
+        other_below = np.zeros(shape, dtype=bool)
+        meets_recommended = np.ones(shape, dtype=bool)
+        headroom = np.full(shape, np.nan, dtype=np.float32)
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            for component in FLEET_COMPONENTS:
+                minimum = games['min_' + component][None, :]
+                recommended = games['rec_' + component][None, :]
                 
-                except json.JSONDecodeError:
-                    print("Failed to parse GPU JSON data")
+                # Same statuses as check_requirement(): NaN comparisons are False,
+                # so unknown values land in neither group
+                missed_recommended = ~(system[component] >= recommended)
+                below = missed_recommended & (system[component] < minimum)
+                if component in ('gpu', 'cpu', 'ram'):
+                    core_below |= below
+                else:
+                    other_below |= below
+                if component in ('gpu', 'cpu'):
+                    core_known |= ~missed_recommended | ~np.isnan(system[component] - minimum)
+                meets_recommended &= ~(missed_recommended & (system[component] >= minimum))
+                
+                if component != 'storage':
+                    np.fmin(headroom, system[component] / minimum, out=headroom)
         
-        elif platform.system() == "Linux":
-            try:
-                nvidia_info = subprocess.check_output(
-                    ["nvidia-smi", "--query-gpu=name", "--format=csv,noheader"],
-                    encoding='utf-8'
-                )
-                gpu_name = nvidia_info.strip()
-            except:
-                lspci_info = subprocess.check_output(["lspci"], encoding='utf-8')
-                for line in lspci_info.split('\n'):
-                    if 'VGA' in line or 'Display' in line or '3D' in line:
-                        line_lower = line.lower()
-                        if not any(keyword in line_lower for keyword in virtual_keywords):
-                            gpu_name = line.split(':')[-1].strip()
-                            break
+        verdict = np.full(shape, FLEET_VERDICT_YES, dtype=np.int8)
+        verdict[other_below | ~core_known] = FLEET_VERDICT_MAYBE
+        verdict[core_below] = FLEET_VERDICT_NO
         
-        elif platform.system() == "Darwin":
-            gpu_info = subprocess.check_output(
-                ["system_profiler", "SPDisplaysDataType"],
-                encoding='utf-8'
-            )
-            for line in gpu_info.split('\n'):
-                if 'Chipset Model:' in line:
-                    gpu_name = line.split(':')[1].strip()
-                    break
+        yield start, verdict, meets_recommended & (verdict == FLEET_VERDICT_YES), headroom
+
+def fleet_compatibility(specs_list, parsed_list, chunk_rows=FLEET_CHUNK_ROWS, scale_for_resolution=True):
+    """Evaluate every machine against every game in vectorized blocks.
     
-    except Exception as e:
-        print(f"GPU detection error: {e}")
+    Returns {'verdict', 'meets_recommended', 'headroom'} as machines x games
+    NumPy matrices, see iter_fleet_compatibility(). Use that generator
+    directly when the full matrices won't fit in memory.
+    """
+    import numpy as np
     
-    return gpu_name
+    machines = pack_fleet_specs(specs_list)
+    games = pack_game_requirements(parsed_list)
+    shape = (len(specs_list), len(parsed_list))
+    
+    result = {
+        'verdict': np.empty(shape, dtype=np.int8),
+        'meets_recommended': np.empty(shape, dtype=bool),
+        'headroom': np.empty(shape, dtype=np.float32)
+    }
+    for start, verdict, meets_recommended, headroom in iter_fleet_compatibility(
+            machines, games, chunk_rows, scale_for_resolution):
+        rows = slice(start, start + len(verdict))
+        result['verdict'][rows] = verdict
+        result['meets_recommended'][rows] = meets_recommended
+        result['headroom'][rows] = headroom
+    
+    return result
 
-def get_cpu_info_windows():
-    """Get CPU information using PowerShell."""
-    try:
-        ps_command = "Get-CimInstance Win32_Processor | Select-Object Name | ConvertTo-Json"
-        cpu_info = run_powershell_command(ps_command)
-        
-        if cpu_info:
-            cpu_data = json.loads(cpu_info)
-            
-            if isinstance(cpu_data, dict):
-                return cpu_data.get('Name', '').strip()
-            elif isinstance(cpu_data, list) and len(cpu_data) > 0:
-                return cpu_data[0].get('Name', '').strip()
-    except Exception as e:
-        print(f"CPU detection error: {e}")
+def check_fleet_against_scorer(specs_list, parsed_list):
+    """Check fleet_compatibility() cell by cell against score_compatibility().
     
-    return platform.processor()
+    Returns (machine index, game index, fleet verdict, scorer verdict) for
+    every cell where the verdict or the recommended level differs.
+    """
+    fleet = fleet_compatibility(specs_list, parsed_list, scale_for_resolution=False)
+    verdict_names = {FLEET_VERDICT_NO: 'No', FLEET_VERDICT_MAYBE: 'Maybe', FLEET_VERDICT_YES: 'Yes'}
+    
+    mismatches = []
+    for row, specs in enumerate(specs_list):
+        for column, parsed in enumerate(parsed_list):
+            score = score_compatibility(specs, parsed)
+            verdict = verdict_names[int(fleet['verdict'][row, column])]
+            if (verdict != score['verdict']
+                    or bool(fleet['meets_recommended'][row, column]) != (score['level'] == 'recommended')):
+                mismatches.append((row, column, verdict, score['verdict']))
+    
+    print(f"{len(specs_list)} machines x {len(parsed_list)} games, {len(mismatches)} cells differ from the scorer")
+    return mismatches
 
-def get_system_specs():
-    """Get relevant system specifications for gaming."""
-    specs = {}
+def check_fleet_on_corpus(machines_path, corpus_path=REQUIREMENTS_CORPUS_PATH):
+    """Run check_fleet_against_scorer() for a machines JSON against the bundled corpus.
     
-    specs['os'] = f"{platform.system()} {platform.release()}"
-    specs['resolution'] = get_monitor_resolution()
+    Every corpus page is used as a minimum tier, paired with the next page
+    as its recommended tier, and on its own; one game has no requirements
+    at all, like an app whose details couldn't be fetched.
+    """
+    with open(machines_path, 'r', encoding='utf-8') as f:
+        specs_list = json.load(f)
+    with open(corpus_path, 'r', encoding='utf-8') as f:
+        pages = [parse_requirements_html(blob) for blob in json.load(f)]
     
-    specs['cpu'] = platform.processor()
-    try:
-        if platform.system() == "Windows":
-            specs['cpu'] = get_cpu_info_windows()
-        elif platform.system() == "Linux":
-            cpu_info = subprocess.check_output(["cat", "/proc/cpuinfo"], 
-                                              encoding='utf-8')
-            for line in cpu_info.split('\n'):
-                if "model name" in line:
-                    specs['cpu'] = line.split(':')[1].strip()
-                    break
-        elif platform.system() == "Darwin":
-            cpu_name = subprocess.check_output(["sysctl", "-n", "machdep.cpu.brand_string"], 
-                                              encoding='utf-8').strip()
-            specs['cpu'] = cpu_name
-    except Exception as e:
-        print(f"CPU info error: {e}")
+    parsed_list = [None]
+    for index, page in enumerate(pages):
+        parsed_list.append({'minimum': page, 'recommended': pages[(index + 1) % len(pages)]})
+        parsed_list.append({'minimum': page, 'recommended': parse_requirements_html(None)})
     
-    specs['cpu_cores'] = psutil.cpu_count(logical=False)
-    specs['cpu_threads'] = psutil.cpu_count(logical=True)
+    return check_fleet_against_scorer(specs_list, parsed_list)
+
+def run_fleet_matrix(machines_path, app_ids_path, output_path):
+    """Evaluate a JSON list of machine specs against a list of app IDs and save the matrices."""
+    import numpy as np
     
-    specs['gpu'] = get_gpu_info_fixed()
+    with open(machines_path, 'r', encoding='utf-8') as f:
+        specs_list = json.load(f)
+    app_ids = read_app_id_list(app_ids_path)
     
-    svmem = psutil.virtual_memory()
-    specs['ram_total_gb'] = round(svmem.total / (1024**3), 2)
+    parsed_by_app = {}
+    for app_id, requirements in fetch_requirements_bulk(app_ids):
+        parsed_by_app[app_id] = requirements.get('parsed_requirements')
     
-    try:
-        disk = psutil.disk_usage('/')
-        specs['storage_free_gb'] = round(disk.free / (1024**3), 2)
-    except:
-        specs['storage_free_gb'] = "Unknown"
+    start = time.perf_counter()
+    result = fleet_compatibility(specs_list, [parsed_by_app.get(app_id) for app_id in app_ids])
+    elapsed = time.perf_counter() - start
     
-    return specs
+    np.savez_compressed(output_path, app_ids=np.array(app_ids), **result)
+    print(f"Evaluated {len(specs_list)} machines x {len(app_ids)} games in {elapsed:.2f}s, saved to {output_path}")
 
 # ============================================
-# STEAM API FUNCTIONS
+# CONTINUOUS BATCHING
 # ============================================
 
-def search_game_by_name(game_name):
-    """Search for a game by name and return matching results with app IDs."""
-    url = "https://steamcommunity.com/actions/SearchApps/" + game_name
-    
+# Most detailed analyses decoded together as sequences of one llama.cpp
+# context. Batching only starts once analyses are waiting for the model, a
+# lone one keeps the regular path and its prompt prefix cache. Fewer slots
+# are used when the spare RAM can't hold this many, and 1 turns it off.
+BATCH_SLOTS = 4
+
+# Context each sequence gets, enough for a check prompt and its answer
+BATCH_SLOT_CONTEXT = 2048
+
+# Tokens handed to llama_decode() per step, shared by all sequences
+BATCH_TOKENS = 512
+
+BATCH_TEMPERATURE = 0.3
+BATCH_TOP_K = 40
+
+# Chat markers that end an answer, the same stops as the single-sequence path
+# plus the special tokens llama.cpp would otherwise stop on by itself
+BATCH_STOP_STRINGS = ["<|end|>", "<|user|>", "<|eot_id|>", "<|end_of_text|>"]
+
+# KV cache size per token assumed when the GGUF metadata doesn't say, about
+# what an 8B model with grouped-query attention needs
+BATCH_KV_BYTES_PER_TOKEN = 128 * 1024
+
+def kv_bytes_per_token(model):
+    """Bytes of f16 KV cache one token takes in a model, from its GGUF metadata."""
+    metadata = model.metadata
+    architecture = metadata.get('general.architecture', '')
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        results = response.json()
+        layers = int(metadata[f'{architecture}.block_count'])
+        embedding = int(metadata[f'{architecture}.embedding_length'])
+        heads = int(metadata[f'{architecture}.attention.head_count'])
+        kv_heads = int(metadata.get(f'{architecture}.attention.head_count_kv', heads))
+    except (KeyError, ValueError):
+        return BATCH_KV_BYTES_PER_TOKEN
+    
+    # Keys and values, two bytes each
+    return 2 * layers * embedding * kv_heads // heads * 2
+
+def batch_slots_for(model, max_slots=BATCH_SLOTS, slot_context=BATCH_SLOT_CONTEXT):
+    """How many batch sequences fit in the RAM left beside the model, at most max_slots.
+    
+    Uses the same memory budget as auto_llama_config(); low-RAM machines
+    get a single slot, which means no batching.
+    """
+    budget = llama_memory_budget(get_system_specs(), model.model_path)
+    if budget['low_ram']:
+        return 1
+    
+    spare_gb = min(budget['available_gb'],
+                   budget['ram_gb'] - budget['model_gb'] * MODEL_RAM_OVERHEAD - MODEL_RESERVED_RAM_GB)
+    slots = int(spare_gb * 1024**3 // (kv_bytes_per_token(model) * slot_context))
+    return max(1, min(max_slots, slots))
+
+def clear_llama_sequence(ctx, seq_id):
+    """Drop a sequence's KV cells, with whichever API this llama-cpp-python version has."""
+    if hasattr(llama_cpp, 'llama_memory_seq_rm'):
+        llama_cpp.llama_memory_seq_rm(llama_cpp.llama_get_memory(ctx), seq_id, -1, -1)
+    else:
+        llama_cpp.llama_kv_cache_seq_rm(ctx, seq_id, -1, -1)
+
+class ContinuousBatcher:
+    """Decodes several prompts at once as sequences of one llama.cpp context.
+    
+    Every step packs a single llama_decode() batch with the next token of
+    each generating sequence plus chunks of newly admitted prompts, so a
+    request arriving while others generate joins at the next step instead
+    of waiting for them to finish. Each slot is one seq_id in the shared
+    KV cache, cleared when its sequence ends so the slot can take the next
+    request. Uses its own context next to the model's regular one.
+    """
+    
+    def __init__(self, model, slots=BATCH_SLOTS, slot_context=BATCH_SLOT_CONTEXT):
+        import numpy as np
         
-        if not results:
-            return []
+        self.np = np
+        self.model = model
+        self.slot_context = slot_context
+        self.n_vocab = model.n_vocab()
+        self.stop_holdback = max(len(stop) for stop in BATCH_STOP_STRINGS) - 1
+        self.rng = np.random.default_rng()
         
-        return [{"app_id": game['appid'], "name": game['name']} for game in results]
+        params = llama_cpp.llama_context_default_params()
+        params.n_ctx = slots * slot_context
+        params.n_batch = BATCH_TOKENS
+        params.n_ubatch = BATCH_TOKENS
+        params.n_seq_max = slots
+        params.n_threads = model.context_params.n_threads
+        params.n_threads_batch = model.context_params.n_threads_batch
         
-    except:
-        return []
-
-def get_game_requirements(app_id):
-    """Get system requirements for a Steam game using the official API."""
-    url = f"https://store.steampowered.com/api/appdetails?appids={app_id}"
+        new_context = getattr(llama_cpp, 'llama_init_from_model', None) or llama_cpp.llama_new_context_with_model
+        self.ctx = new_context(model.model, params)
+        if not self.ctx:
+            raise RuntimeError("could not create the batched llama.cpp context")
+        self.batch = llama_cpp.llama_batch_init(BATCH_TOKENS, 0, 1)
+        self.slots = [None] * slots
     
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
-        
-        if not data[str(app_id)]['success']:
-            return {"error": "Game not found or data unavailable"}
+    def close(self):
+        """Free the context and batch, the model itself stays loaded."""
+        if self.ctx:
+            llama_cpp.llama_batch_free(self.batch)
+            llama_cpp.llama_free(self.ctx)
+            self.ctx = None
+    
+    def fits(self, request):
+        """Whether a batch request's prompt and answer fit in one slot."""
+        if 'tokens' not in request:
+            request['tokens'] = self.model.tokenize(request['prompt'].encode('utf-8'), add_bos=True, special=True)
+        return len(request['tokens']) + request['max_tokens'] <= self.slot_context
+    
+    def run(self, first_job, take_job, finish):
+        """Decode first_job and every job take_job() hands over while slots are free.
         
-        game_data = data[str(app_id)]['data']
+        take_job() returns the next job to admit or None, and finish(job,
+        text) gets each sequence's generated text (None if cancelled).
+        Jobs must fit() a slot.
+        """
+        self._admit(first_job, finish)
         
-        result = {
-            "name": game_data.get('name', 'Unknown'),
-            "app_id": app_id,
-            "type": game_data.get('type', 'Unknown'),
-            "is_free": game_data.get('is_free', False),
+        while any(self.slots):
+            while None in self.slots:
+                job = take_job()
+                if job is None:
+                    break
+                self._admit(job, finish)
+            
+            if any(self.slots):
+                self._step()
+    
+    def _admit(self, job, finish):
+        self.slots[self.slots.index(None)] = {
+            'job': job,
+            'finish': finish,
+            'tokens': job.batch_request['tokens'],
+            'evaluated': 0,
+            'pending': None,
+            'generated': 0,
+            'text': '',
+            'sent': 0,
+            'decoder': codecs.getincrementaldecoder('utf-8')(errors='replace')
         }
+    
+    def _add(self, index, token, position, seq_id, logits):
+        self.batch.token[index] = token
+        self.batch.pos[index] = position
+        self.batch.n_seq_id[index] = 1
+        self.batch.seq_id[index][0] = seq_id
+        self.batch.logits[index] = logits
+    
+    def _step(self):
+        count = 0
+        sampled = []
         
-        pc_req = game_data.get('pc_requirements', {})
-        if pc_req:
-            result['pc_requirements'] = {
-                'minimum': pc_req.get('minimum', 'Not specified'),
-                'recommended': pc_req.get('recommended', 'Not specified')
-            }
+        # One token for every sequence that is generating
+        for seq_id, slot in enumerate(self.slots):
+            if slot and slot['pending'] is not None:
+                self._add(count, slot['pending'], slot['evaluated'], seq_id, True)
+                sampled.append((count, seq_id))
+                slot['evaluated'] += 1
+                slot['pending'] = None
+                count += 1
         
-        return result
+        # Then as much of the waiting prompts as fits
+        for seq_id, slot in enumerate(self.slots):
+            remaining = len(slot['tokens']) - slot['evaluated'] if slot else 0
+            if remaining <= 0 or count >= BATCH_TOKENS or slot['generated']:
+                continue
+            for position in range(slot['evaluated'], slot['evaluated'] + min(remaining, BATCH_TOKENS - count)):
+                last = position == len(slot['tokens']) - 1
+                self._add(count, slot['tokens'][position], position, seq_id, last)
+                if last:
+                    sampled.append((count, seq_id))
+                count += 1
+                slot['evaluated'] = position + 1
         
-    except:
-        return {"error": "Failed to fetch game data"}
-
-def clean_html_requirements(html_text):
-    """Clean HTML from requirements text to make it more readable."""
-    if not html_text or html_text == 'Not specified':
-        return html_text
-    
-    soup = BeautifulSoup(html_text, 'html.parser')
-    return soup.get_text(separator='\n', strip=True)
-
-def format_requirements_for_ai(requirements):
-    """Format the requirements data into a clean string for the AI."""
-    if "error" in requirements:
-        return f"Error: {requirements['error']}"
+        self.batch.n_tokens = count
+        result = llama_cpp.llama_decode(self.ctx, self.batch)
+        if result != 0:
+            raise RuntimeError(f"llama_decode failed ({result})")
+        
+        for index, seq_id in sampled:
+            logits = self.np.ctypeslib.as_array(llama_cpp.llama_get_logits_ith(self.ctx, index), shape=(self.n_vocab,))
+            self._accept(seq_id, self._sample(logits))
     
-    formatted = f"GAME REQUIREMENTS FOR: {requirements['name']}\n"
-    formatted += "=" * 50 + "\n"
+    def _sample(self, logits):
+        """Top-k sampling at BATCH_TEMPERATURE."""
+        np = self.np
+        top = np.argpartition(logits, -BATCH_TOP_K)[-BATCH_TOP_K:]
+        weights = (logits[top] - logits[top].max()) / BATCH_TEMPERATURE
+        probabilities = np.exp(weights)
+        return int(top[self.rng.choice(len(top), p=probabilities / probabilities.sum())])
     
-    if 'pc_requirements' in requirements:
-        if requirements['pc_requirements']['minimum'] != 'Not specified':
-            formatted += "\nMinimum Requirements:\n"
-            formatted += clean_html_requirements(requirements['pc_requirements']['minimum']) + "\n"
+    def _accept(self, seq_id, token):
+        slot = self.slots[seq_id]
+        job = slot['job']
+        slot['generated'] += 1
         
-        if requirements['pc_requirements']['recommended'] != 'Not specified':
-            formatted += "\nRecommended Requirements:\n"
-            formatted += clean_html_requirements(requirements['pc_requirements']['recommended']) + "\n"
+        if token == self.model.token_eos():
+            return self._release(seq_id)
+        
+        slot['text'] += slot['decoder'].decode(self.model.detokenize([token], special=True))
+        stops = [slot['text'].find(stop) for stop in BATCH_STOP_STRINGS if stop in slot['text']]
+        if stops:
+            slot['text'] = slot['text'][:min(stops)]
+            return self._release(seq_id)
+        
+        # Stream what can't be the start of a stop string any more
+        if len(slot['text']) - self.stop_holdback > slot['sent']:
+            job.chunks.append(slot['text'][slot['sent']:len(slot['text']) - self.stop_holdback])
+            slot['sent'] = len(slot['text']) - self.stop_holdback
+        
+        if (job.cancelled or slot['generated'] >= job.batch_request['max_tokens']
+                or slot['evaluated'] >= self.slot_context - 1):
+            return self._release(seq_id)
+        slot['pending'] = token
     
-    return formatted
+    def _release(self, seq_id):
+        slot = self.slots[seq_id]
+        job = slot['job']
+        self.slots[seq_id] = None
+        clear_llama_sequence(self.ctx, seq_id)
+        
+        if len(slot['text']) > slot['sent']:
+            job.chunks.append(slot['text'][slot['sent']:])
+        slot['finish'](job, None if job.cancelled else slot['text'].strip())
 
-def format_system_specs(specs):
-    """Format system specs into readable text."""
-    formatted = "YOUR PC SPECS:\n"
-    formatted += "=" * 50 + "\n"
-    formatted += f"OS: {specs.get('os', 'Unknown')}\n"
-    formatted += f"Monitor Resolution: {specs.get('resolution', 'Unknown')}\n"
-    formatted += f"CPU: {specs.get('cpu', 'Unknown')}\n"
-    formatted += f"CPU Cores/Threads: {specs.get('cpu_cores', '?')}/{specs.get('cpu_threads', '?')}\n"
-    formatted += f"GPU: {specs.get('gpu', 'Unknown')}\n"
-    formatted += f"RAM: {specs.get('ram_total_gb', '?')} GB\n"
-    formatted += f"Free Storage: {specs.get('storage_free_gb', '?')} GB\n"
-    return formatted
+# ============================================
+# INFERENCE SCHEDULER
+# ============================================
 
-def compare_specs_with_ai(game_name, requirements_text, system_specs_text, system_specs, model):
-    """Send both game requirements and system specs to local AI for comparison."""
-    prompt = f"""<|system|>
-You are a PC gaming expert. Analyze system specifications against game requirements and provide clear compatibility assessments.<|end|>
-<|user|>
-{system_specs_text}
+# AI analyses allowed to wait for the model at once, more are turned away
+INFERENCE_QUEUE_SIZE = 8
 
-{requirements_text}
+# How much each new wait time moves the reported average
+INFERENCE_WAIT_SMOOTHING = 0.2
 
-Can my PC run {game_name}? Provide:
-1. Overall verdict (Yes/No/Maybe)
-2. Expected performance at {system_specs.get('resolution', 'unknown')} resolution
-3. Recommended graphics settings
-4. Estimated FPS range<|end|>
-<|assistant|>"""
+class InferenceJob:
+    """One AI analysis waiting for or running on the model worker.
     
-    try:
-        response = model(
-            prompt,
-            max_tokens=300,
-            temperature=0.3,
-            stop=["<|end|>", "<|user|>"],
-            echo=False
-        )
+    run(on_chunk, should_stop) produces the result on its own. A job that
+    can be batched also has batch_request: {'model', 'prompt', 'max_tokens',
+    'finish'}, finish(text) turning the generated text into the result.
+    """
+    
+    def __init__(self, key, run, batch_request=None):
+        self.key = key
+        self.run = run
+        self.batch_request = batch_request
+        self.waiters = []
+        self.chunks = []
+        self.result = None
+        self.cancelled = False
+        self.submitted_at = time.perf_counter()
+        self.wait_seconds = None
+        self.done = threading.Event()
+
+class InferenceScheduler:
+    """Runs AI analyses on a dedicated model worker thread.
+    
+    The llama.cpp context isn't thread safe and generation would block the
+    Eel event loop, so checks hand their analysis to this worker through a
+    bounded queue and wait for it with eel.sleep. A check identical to one
+    already queued or running (same key) joins it instead of running
+    twice. Each waiter belongs to a client, and cancelling a client drops
+    its waiters; a job left with none is skipped, or stopped mid-generation.
+    
+    When a batchable job comes up while others are waiting, it and the
+    batchable jobs behind it for the same model are decoded together by a
+    ContinuousBatcher, queued jobs joining as slots free up. Jobs that
+    can't join, like ones too long for a slot, run on their own after the
+    batch.
+    """
+    
+    def __init__(self, max_queued=INFERENCE_QUEUE_SIZE, batch_slots=BATCH_SLOTS):
+        self.queue = queue.Queue(maxsize=max_queued)
+        self.batch_slots = batch_slots
+        self.batcher = None
+        self.batcher_lock = threading.Lock()
+        self.deferred = collections.deque()
+        self.in_flight = {}
+        self.running = set()
+        self.completed = 0
+        self.average_wait_seconds = 0.0
+        self.lock = threading.Lock()
+        self.worker = None
+    
+    def submit(self, key, run, client_id=None, batch_request=None):
+        """Queue a job under key, or join the identical job in flight.
         
-        return response['choices'][0]['text'].strip()
+        Returns (job, waiter) to pass to wait(), raises queue.Full when the
+        queue is full.
+        """
+        waiter = {'client_id': client_id, 'cancelled': False}
         
-    except Exception as e:
-        return f"Error analyzing with AI: {str(e)}"
+        with self.lock:
+            if self.worker is None:
+                self.worker = threading.Thread(target=self._work, name="inference-worker", daemon=True)
+                self.worker.start()
+            
+            job = self.in_flight.get(key)
+            if job is None or job.cancelled:
+                job = InferenceJob(key, run, batch_request)
+                self.queue.put_nowait(job)
+                self.in_flight[key] = job
+            
+            job.waiters.append(waiter)
+        
+        return job, waiter
+    
+    def wait(self, job, waiter, on_chunk=None):
+        """Wait for a job through Eel, passing its chunks to on_chunk as they arrive.
+        
+        Returns the job's result, or None if the waiter was cancelled.
+        """
+        sent = 0
+        while True:
+            done = job.done.is_set()
+            while on_chunk is not None and sent < len(job.chunks):
+                on_chunk(job.chunks[sent])
+                sent += 1
+            
+            if waiter['cancelled']:
+                return None
+            if done:
+                return job.result
+            eel.sleep(0.05)
+    
+    def cancel(self, client_id):
+        """Drop every waiter of a client, cancelling jobs nobody else is waiting for."""
+        with self.lock:
+            for job in self.in_flight.values():
+                for waiter in [waiter for waiter in job.waiters if waiter['client_id'] == client_id]:
+                    waiter['cancelled'] = True
+                    job.waiters.remove(waiter)
+                    if not job.waiters:
+                        job.cancelled = True
+    
+    def status(self):
+        """Queue depth, analyses running and the average time spent waiting for the model."""
+        with self.lock:
+            return {
+                'queued': self.queue.qsize() + len(self.deferred),
+                'running': len(self.running),
+                'completed': self.completed,
+                'average_wait_seconds': round(self.average_wait_seconds, 2)
+            }
+    
+    def release_batcher(self):
+        """Free the batch context and its hold on the model, after any batch in progress.
+        
+        Called before another model is loaded.
+        """
+        with self.batcher_lock:
+            if self.batcher is not None:
+                self.batcher.close()
+                self.batcher = None
+    
+    def _start(self, job):
+        """Mark a job as running, or finish it straight away if it was cancelled while queued."""
+        with self.lock:
+            if not job.cancelled:
+                self.running.add(job)
+                job.wait_seconds = time.perf_counter() - job.submitted_at
+                self.average_wait_seconds += INFERENCE_WAIT_SMOOTHING * (job.wait_seconds - self.average_wait_seconds)
+                print(f"Analysis started after {job.wait_seconds:.2f}s in the queue "
+                      f"({self.queue.qsize()} still queued, {len(self.running)} running)")
+                return True
+        
+        self._finish(job, None)
+        return False
+    
+    def _finish(self, job, result):
+        with self.lock:
+            if job in self.running:
+                self.running.discard(job)
+                self.completed += 1
+            if self.in_flight.get(job.key) is job:
+                del self.in_flight[job.key]
+        job.result = result
+        job.done.set()
+    
+    def _finish_batched(self, job, text):
+        if text is None:
+            self._finish(job, None)
+            return
+        try:
+            self._finish(job, job.batch_request['finish'](text))
+        except Exception as e:
+            self._finish(job, f"Error analyzing with AI: {str(e)}")
+    
+    def _run_alone(self, job):
+        try:
+            result = job.run(job.chunks.append, lambda: job.cancelled)
+        except Exception as e:
+            result = f"Error analyzing with AI: {str(e)}"
+        self._finish(job, result)
+    
+    def _next_job(self, block):
+        if self.deferred:
+            return self.deferred.popleft()
+        try:
+            return self.queue.get(block=block)
+        except queue.Empty:
+            return None
+    
+    def _others_waiting(self):
+        return self.queue.qsize() + len(self.deferred) > 0
+    
+    def _open_batcher(self, model):
+        """The batcher for a model, or None when batching is off or doesn't fit. Needs batcher_lock."""
+        if self.batcher is not None and self.batcher.model is not model:
+            self.batcher.close()
+            self.batcher = None
+        
+        if self.batcher is None:
+            slots = batch_slots_for(model, self.batch_slots)
+            if slots < 2:
+                return None
+            try:
+                self.batcher = ContinuousBatcher(model, slots)
+                print(f"Batched decoding with {slots} slots")
+            except Exception as e:
+                print(f"Batched decoding unavailable, running analyses one at a time: {e}")
+                self.batch_slots = 1
+                return None
+        return self.batcher
+    
+    def _batchable(self, job):
+        # A job queued before a model switch still holds the old model;
+        # opening a batch context on it would keep both models resident
+        return job.batch_request is not None and job.batch_request['model'] is ai_model
+    
+    def _can_join(self, batcher, job):
+        request = job.batch_request
+        return request is not None and request['model'] is batcher.model and batcher.fits(request)
+    
+    def _take_batchable(self, batcher):
+        """Next queued job that can join the running batch, or None."""
+        while True:
+            job = self._next_job(block=False)
+            if job is None:
+                return None
+            if not self._can_join(batcher, job):
+                # Runs on its own after this batch
+                self.deferred.appendleft(job)
+                return None
+            if self._start(job):
+                return job
+    
+    def _run_batch(self, batcher, job):
+        try:
+            batcher.run(job, lambda: self._take_batchable(batcher), self._finish_batched)
+        except Exception as e:
+            print(f"Batched decoding failed: {e}")
+            for seq_id, slot in enumerate(batcher.slots):
+                if slot:
+                    batcher.slots[seq_id] = None
+                    self._finish(slot['job'], f"Error analyzing with AI: {str(e)}")
+            batcher.close()
+            self.batcher = None
+    
+    def _work(self):
+        while True:
+            job = self._next_job(block=True)
+            
+            # A lone analysis keeps the regular path with its grammar and
+            # prompt prefix cache, batching only pays off with others waiting
+            if self.batch_slots > 1 and self._batchable(job) and self._others_waiting():
+                with self.batcher_lock:
+                    batcher = self._open_batcher(job.batch_request['model'])
+                    if batcher is not None and self._can_join(batcher, job):
+                        if self._start(job):
+                            self._run_batch(batcher, job)
+                        continue
+            
+            if self._start(job):
+                self._run_alone(job)
+
+inference_scheduler = InferenceScheduler()
 
 # ============================================
 # EEL EXPOSED FUNCTIONS
 # ============================================
 
+def push_analysis_chunk(stream_id, text):
+    """Send one piece of a streamed analysis to the page, then yield so Eel sends it right away."""
+    eel.receive_analysis_chunk(stream_id, text)
+    eel.sleep(0)
+
 @eel.expose
-def get_system_info():
+def get_system_info(force_refresh=False):
     """Exposed function to get system specs from frontend."""
-    return get_system_specs()
+    return get_system_specs(force_refresh)
+
+@eel.expose
+def get_model_status():
+    """Exposed function reporting AI model loading: state, progress (0-1) and message."""
+    return dict(model_status)
+
+@eel.expose
+def get_queue_status():
+    """Exposed function reporting the inference queue: depth, analyses running and average wait."""
+    return inference_scheduler.status()
+
+@eel.expose
+def list_models():
+    """Exposed function listing the models in MODELS_DIR, the active one and the registry's pick."""
+    models = scan_models()
+    selected = select_model(models, psutil.virtual_memory().total / (1024**3))
+    return {
+        "models": models,
+        "active": active_model_path,
+        "recommended": selected['path'] if selected else None
+    }
+
+@eel.expose
+def switch_model(model_path):
+    """Exposed function to load a different model from MODELS_DIR without restarting."""
+    if not model_ready.is_set():
+        return {"success": False, "error": "A model is still loading"}
+    if model_path not in [model['path'] for model in scan_models()]:
+        return {"success": False, "error": f"Unknown model: {model_path}"}
+    
+    start_model_load(model_path)
+    return {"success": True}
 
 @eel.expose
-def check_game_compatibility(game_name):
-    """Main compatibility check function exposed to frontend."""
+def check_game_compatibility(game_name, detailed=False, stream_id=None, client_id=None):
+    """Main compatibility check function exposed to frontend.
+    
+    Clear-cut results come from the rule-based scorer in milliseconds, the
+    AI model only runs for borderline cases or when detailed is set.
+    Borderline cases get a structured answer (verdict, FPS per preset,
+    recommended preset, bottlenecks) in structured_analysis. Detailed
+    requests get prose, which with a stream_id is also pushed to the page's
+    receive_analysis_chunk() as it is generated.
+    
+    AI analyses run on the inference scheduler's worker. A new check from
+    the same client_id cancels that client's previous one.
+    """
     try:
-        if ai_model is None:
-            return {
-                "success": False,
-                "error": "AI model not loaded. Check console for details."
-            }
+        if client_id:
+            inference_scheduler.cancel(client_id)
         
         system_specs = get_system_specs()
         
@@ -380,24 +4039,109 @@ def check_game_compatibility(game_name):
             }
         
         req_text = format_requirements_for_ai(requirements)
-        specs_text = format_system_specs(system_specs)
-        
-        print(f"Analyzing {search_results[0]['name']}...")
+        score = score_compatibility(system_specs, requirements.get('parsed_requirements'))
+        structured_analysis = None
+        queue_wait_seconds = None
         
-        ai_response = compare_specs_with_ai(
-            search_results[0]['name'],
-            req_text,
-            specs_text,
-            system_specs,
-            ai_model
-        )
+        if not detailed and score['confidence'] >= RULES_CONFIDENCE_THRESHOLD:
+            analysis = format_rules_analysis(score)
+            analysis_source = "rules"
+        else:
+            # Borderline cases get the compact structured answer, detailed
+            # requests the streamed prose analysis
+            structured = not detailed
+            model_path = active_model_path or ''
+            cache_key = verdict_cache_key(system_specs, search_results[0]['app_id'], req_text,
+                                          model_identifier(model_path), structured)
+            analysis = verdict_cache.get(cache_key)
+            analysis_source = "ai-cached"
+            
+            if analysis is None:
+                model = wait_for_model()
+                if model is None:
+                    return {
+                        "success": False,
+                        "error": f"{model_status['message']}. Check console for details."
+                    }
+                
+                # The model may have been switched while this check waited
+                if model.model_path != model_path:
+                    cache_key = verdict_cache_key(system_specs, search_results[0]['app_id'], req_text,
+                                                  model_identifier(model.model_path), structured)
+                
+                specs_text = format_system_specs(system_specs)
+                game = search_results[0]['name']
+                
+                def store_analysis(analysis):
+                    """Check a finished analysis and keep it in the verdict cache."""
+                    if structured and not analysis.startswith("Error analyzing with AI"):
+                        record = parse_structured_analysis(analysis)
+                        if record is None:
+                            print(f"Unparseable structured answer: {analysis}")
+                            analysis = "Error analyzing with AI: the answer was not in the expected format"
+                        else:
+                            analysis = json.dumps(record)
+                    
+                    if not analysis.startswith("Error analyzing with AI"):
+                        verdict_cache.put(cache_key, analysis)
+                    return analysis
+                
+                def run_analysis(on_chunk, should_stop):
+                    """Runs on the model worker when the analysis isn't batched."""
+                    print(f"Analyzing {game}...")
+                    analysis = compare_specs_with_ai(game, req_text, specs_text, system_specs, model,
+                                                     None if structured else on_chunk, structured, should_stop)
+                    if should_stop():
+                        return None
+                    return store_analysis(analysis)
+                
+                # Detailed prose can be batched with other checks waiting for the
+                # model; structured answers stay on the grammar-constrained path
+                batch_request = None
+                if not structured:
+                    batch_request = {
+                        'model': model,
+                        'prompt': build_analysis_prompt(game, req_text, specs_text, system_specs)[1],
+                        'max_tokens': PROSE_MAX_TOKENS,
+                        'finish': store_analysis
+                    }
+                
+                try:
+                    job, waiter = inference_scheduler.submit(cache_key, run_analysis, client_id, batch_request)
+                except queue.Full:
+                    return {
+                        "success": False,
+                        "error": "Too many checks are waiting for the AI model, please try again shortly."
+                    }
+                
+                analysis = inference_scheduler.wait(
+                    job, waiter, functools.partial(push_analysis_chunk, stream_id) if stream_id else None
+                )
+                if analysis is None:
+                    return {
+                        "success": False,
+                        "cancelled": True,
+                        "error": "Check cancelled"
+                    }
+                analysis_source = "ai"
+                queue_wait_seconds = job.wait_seconds
+            
+            if structured and not analysis.startswith("Error analyzing with AI"):
+                structured_analysis = json.loads(analysis)
+                analysis = format_structured_analysis(structured_analysis)
         
         return {
             "success": True,
             "game_name": search_results[0]['name'],
             "requirements": requirements,
             "system_specs": system_specs,
-            "ai_analysis": ai_response,
+            "ai_analysis": analysis,
+            "structured_analysis": structured_analysis,
+            "analysis_source": analysis_source,
+            "queue_wait_seconds": queue_wait_seconds,
+            "verdict": score['verdict'],
+            "confidence": score['confidence'],
+            "reasons": score['reasons'],
             "requirements_text": req_text
         }
         
@@ -412,23 +4156,63 @@ def check_game_compatibility(game_name):
 # ============================================
 
 def main():
-    if ai_model is None:
-        print("\nERROR: AI model failed to load!")
-        print("\nSetup instructions:")
-        print("1. Install llama-cpp-python:")
-        print("   pip install llama-cpp-python")
-        print("\n2. Download a GGUF model:")
-        print("   Visit: https://huggingface.co/models?library=gguf")
-        print("   Recommended: llama-3.2-3b-instruct Q4_K_M (~2GB)")
-        print("\n3. Create 'models' folder and place the .gguf file inside")
-        print("4. Update MODEL_PATH in the script to match your filename\n")
+    parser = argparse.ArgumentParser(description="Game Compatibility Checker (llama.cpp)")
+    parser.add_argument('--import-catalog', metavar='APPLIST_JSON',
+                        help="build the offline Steam catalog from a GetAppList JSON dump and exit")
+    parser.add_argument('--fetch-requirements', metavar='APP_IDS_FILE',
+                        help="fetch requirements for every app ID in the file as JSON lines and exit")
+    parser.add_argument('--fleet-matrix', nargs=3, metavar=('MACHINES_JSON', 'APP_IDS_FILE', 'OUTPUT_NPZ'),
+                        help="evaluate a list of machine specs against a list of games, save the matrices and exit")
+    parser.add_argument('--check-fleet', metavar='MACHINES_JSON',
+                        help="check the fleet matrix against the single-game scorer on the bundled corpus and exit")
+    parser.add_argument('--benchmark-models', action='store_true',
+                        help="measure the throughput of every model in the models folder, save it and exit")
+    parser.add_argument('--calibrate', action='store_true',
+                        help="time llama.cpp thread and batch settings on this machine, save the fastest and exit")
+    parser.add_argument('--bench-html', action='store_true',
+                        help="verify the fast requirements HTML cleaner against BeautifulSoup, time both and exit")
+    args = parser.parse_args()
+    
+    if args.import_catalog:
+        count = import_steam_app_list(args.import_catalog)
+        print(f"Imported {count} apps into {STEAM_CATALOG_PATH}")
+        return
+    
+    if args.fetch_requirements:
+        for app_id, requirements in fetch_requirements_bulk(read_app_id_list(args.fetch_requirements)):
+            print(json.dumps({"app_id": app_id, "requirements": requirements}), flush=True)
+        return
+    
+    if args.fleet_matrix:
+        run_fleet_matrix(*args.fleet_matrix)
+        return
+    
+    if args.check_fleet:
+        check_fleet_on_corpus(args.check_fleet)
+        return
+    
+    if args.bench_html:
+        benchmark_html_cleaners()
+        return
+    
+    if args.benchmark_models:
+        benchmark_models()
+        return
+    
+    if args.calibrate:
+        calibrate_llama_config()
         return
     
     print("\n" + "="*60)
     print("Game Compatibility Checker - Starting...")
     print("="*60)
-    print("\nAI model ready!")
-    print("Opening web interface...\n")
+    print("\nOpening web interface, the AI model loads in the background...\n")
+    
+    # Load the model, detect the hardware and open the Steam connections
+    # while the window comes up
+    start_model_load(choose_model_path())
+    threading.Thread(target=get_system_specs, daemon=True).start()
+    threading.Thread(target=steam_client.warm_up, daemon=True).start()
     
     eel.init('web')
     eel.start('index.html', size=(1400, 900), port=8080)
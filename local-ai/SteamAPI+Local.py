@@ -5,26 +5,75 @@ import json
 import psutil
 import platform
 import subprocess
-from transformers import pipeline
+import os
+import glob
+import hashlib
+import threading
+import queue
+import time
 
 # ============================================
 # AI MODEL INITIALIZATION
 # ============================================
 
-print("Loading AI model... This may take a minute on first run.")
-print("The model will be cached for future use.")
-
-try:
-    # Initialize the model - downloads automatically on first run
-    ai_model = pipeline(
-        'text-generation',
-        model='microsoft/Phi-3.5-mini-instruct',
-        device=0  # Use CPU (-1), change to 0 for GPU
-    )
-    print("AI model loaded successfully!")
-except Exception as e:
-    print(f"Error loading AI model: {e}")
-    ai_model = None
+# The model loads on a background thread once the window is up, spec
+# detection and the Steam lookup run meanwhile and only the analysis waits
+ai_model = None
+model_ready = threading.Event()
+model_status = {'state': 'loading', 'progress': 0.0, 'message': "Waiting to load the AI model"}
+
+def load_ai_model():
+    """Load the Phi-3.5 pipeline into ai_model, keeping model_status up to date."""
+    global ai_model
+    
+    print("Loading AI model... This may take a minute on first run.")
+    print("The model will be cached for future use.")
+    start = time.perf_counter()
+    
+    try:
+        # Importing transformers pulls in torch, which alone takes seconds
+        model_status['message'] = "Loading transformers"
+        import torch
+        from transformers import pipeline
+        
+        # First GPU when CUDA is available, otherwise the CPU
+        device = 0 if torch.cuda.is_available() else -1
+        print(f"Running the model on {'GPU' if device == 0 else 'CPU'}")
+        
+        # Initialize the model - downloads automatically on first run
+        model_status.update(progress=0.2, message="Loading Phi-3.5 (downloads on first run)")
+        ai_model = pipeline(
+            'text-generation',
+            model='microsoft/Phi-3.5-mini-instruct',
+            device=device
+        )
+        
+        # Batched prompts are padded on the left so every answer starts
+        # right after its own prompt; Phi-3.5 has no pad token of its own
+        ai_model.tokenizer.padding_side = 'left'
+        if ai_model.tokenizer.pad_token is None:
+            ai_model.tokenizer.pad_token = ai_model.tokenizer.eos_token
+        
+        elapsed = time.perf_counter() - start
+        model_status.update(state='ready', progress=1.0, message=f"AI model loaded in {elapsed:.1f}s")
+        print(f"AI model loaded successfully in {elapsed:.1f}s!")
+    except Exception as e:
+        model_status.update(state='error', message=f"Error loading AI model: {e}")
+        print(f"Error loading AI model: {e}")
+        print("Please ensure you have internet connection for first-time model download.")
+        print("Required packages: transformers, torch")
+        print("\nInstall with: pip install transformers torch\n")
+    finally:
+        model_ready.set()
+
+def wait_for_model():
+    """Wait until the model has loaded or failed, return it (None on failure).
+    
+    Sleeps through Eel so other requests from the page keep being served.
+    """
+    while not model_ready.is_set():
+        eel.sleep(0.1)
+    return ai_model
 
 # ============================================
 # SYSTEM INFORMATION FUNCTIONS
@@ -170,8 +219,16 @@ def get_cpu_info_windows():
     
     return platform.processor()
 
-def get_system_specs():
-    """Get relevant system specifications for gaming."""
+def get_storage_free_gb():
+    """Get free space on the system drive in GB."""
+    try:
+        disk = psutil.disk_usage('/')
+        return round(disk.free / (1024**3), 2)
+    except:
+        return "Unknown"
+
+def detect_system_specs():
+    """Run every hardware probe and return the relevant specs for gaming."""
     specs = {}
     
     specs['os'] = f"{platform.system()} {platform.release()}"
@@ -204,11 +261,126 @@ def get_system_specs():
     svmem = psutil.virtual_memory()
     specs['ram_total_gb'] = round(svmem.total / (1024**3), 2)
     
+    specs['storage_free_gb'] = get_storage_free_gb()
+    
+    return specs
+
+# ============================================
+# HARDWARE SNAPSHOT CACHE
+# ============================================
+
+# Detected specs are saved here and reused until the hardware fingerprint changes
+SPECS_CACHE_PATH = "./cache/system_specs.json"
+
+# Bump this when detect_system_specs() starts returning different fields
+SPECS_SNAPSHOT_VERSION = 1
+
+_specs_snapshot = None
+_specs_lock = threading.Lock()
+
+def get_pci_device_list():
+    """List PCI vendor/device IDs without spawning lspci or PowerShell."""
+    try:
+        if platform.system() == "Windows":
+            import winreg
+            devices = []
+            with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"SYSTEM\CurrentControlSet\Enum\PCI") as key:
+                index = 0
+                while True:
+                    try:
+                        devices.append(winreg.EnumKey(key, index))
+                    except OSError:
+                        break
+                    index += 1
+            return sorted(devices)
+        
+        elif platform.system() == "Linux":
+            # One line per device: bus/devfn, vendor+device ID, ...
+            with open('/proc/bus/pci/devices', 'r') as f:
+                return sorted(line.split('\t')[1] for line in f if '\t' in line)
+    except Exception:
+        pass
+    
+    return []
+
+def count_connected_monitors():
+    """Count connected monitors without creating a GUI window."""
     try:
-        disk = psutil.disk_usage('/')
-        specs['storage_free_gb'] = round(disk.free / (1024**3), 2)
-    except:
-        specs['storage_free_gb'] = "Unknown"
+        if platform.system() == "Windows":
+            import ctypes
+            return ctypes.windll.user32.GetSystemMetrics(80)  # SM_CMONITORS
+        
+        elif platform.system() == "Linux":
+            count = 0
+            for status_path in glob.glob('/sys/class/drm/card*-*/status'):
+                with open(status_path, 'r') as f:
+                    if f.read().strip() == 'connected':
+                        count += 1
+            return count
+    except Exception:
+        pass
+    
+    return 0
+
+def get_hardware_fingerprint():
+    """Build a cheap fingerprint of the machine from boot time, PCI devices and monitors."""
+    parts = [
+        str(SPECS_SNAPSHOT_VERSION),
+        platform.system(),
+        platform.release(),
+        platform.machine(),
+        # psutil can report boot time a second apart between calls on Windows
+        str(round(psutil.boot_time() / 10)),
+        str(psutil.virtual_memory().total),
+        str(count_connected_monitors()),
+    ]
+    parts.extend(get_pci_device_list())
+    return hashlib.sha256("|".join(parts).encode('utf-8')).hexdigest()
+
+def load_specs_snapshot():
+    """Load the saved specs snapshot from disk, or None if there isn't a usable one."""
+    try:
+        with open(SPECS_CACHE_PATH, 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+        if isinstance(snapshot, dict) and 'fingerprint' in snapshot and 'specs' in snapshot:
+            return snapshot
+    except (OSError, ValueError):
+        pass
+    return None
+
+def save_specs_snapshot(snapshot):
+    """Write the specs snapshot to disk atomically."""
+    try:
+        os.makedirs(os.path.dirname(SPECS_CACHE_PATH), exist_ok=True)
+        temp_path = SPECS_CACHE_PATH + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, indent=2)
+        os.replace(temp_path, SPECS_CACHE_PATH)
+    except OSError as e:
+        print(f"Could not save specs snapshot: {e}")
+
+def get_system_specs(force_refresh=False):
+    """Get system specs, only re-running hardware detection when the fingerprint changes."""
+    global _specs_snapshot
+    
+    with _specs_lock:
+        fingerprint = get_hardware_fingerprint()
+        
+        if _specs_snapshot is None and not force_refresh:
+            _specs_snapshot = load_specs_snapshot()
+        
+        if (force_refresh or _specs_snapshot is None
+                or _specs_snapshot['fingerprint'] != fingerprint):
+            _specs_snapshot = {
+                'fingerprint': fingerprint,
+                'specs': detect_system_specs()
+            }
+            save_specs_snapshot(_specs_snapshot)
+        
+        specs = dict(_specs_snapshot['specs'])
+    
+    # Free space changes between checks without any hardware change
+    specs['storage_free_gb'] = get_storage_free_gb()
     
     return specs
 
@@ -306,9 +478,9 @@ def format_system_specs(specs):
     formatted += f"Free Storage: {specs.get('storage_free_gb', '?')} GB\n"
     return formatted
 
-def compare_specs_with_ai(game_name, requirements_text, system_specs_text, system_specs, model):
-    """Send both game requirements and system specs to local AI for comparison."""
-    prompt = f"""{system_specs_text}
+def build_analysis_prompt(game_name, requirements_text, system_specs_text, system_specs):
+    """Build the analysis prompt sent to the model."""
+    return f"""{system_specs_text}
 
 {requirements_text}
 
@@ -318,19 +490,17 @@ Question: Can my PC run {game_name}? Please analyze and provide:
 3. Expected FPS range
 
 Answer:"""
+
+def compare_specs_with_ai(game_name, requirements_text, system_specs_text, system_specs, model):
+    """Send both game requirements and system specs to local AI for comparison.
+    
+    The prompt goes through pipeline_batcher, so checks made at the same
+    time share one forward pass.
+    """
+    prompt = build_analysis_prompt(game_name, requirements_text, system_specs_text, system_specs)
     
     try:
-        response = model(
-            prompt,
-            max_length=500,
-            num_return_sequences=1,
-            temperature=0.7,
-            do_sample=True,
-            pad_token_id=model.tokenizer.eos_token_id
-        )
-        
-        # Extract the generated text after the prompt
-        generated_text = response[0]['generated_text']
+        generated_text = pipeline_batcher.generate(model, prompt)
         
         # Remove the prompt from the response to get only the answer
         answer = generated_text[len(prompt):].strip()
@@ -340,25 +510,116 @@ Answer:"""
     except Exception as e:
         return f"Error analyzing with AI: {str(e)}"
 
+# ============================================
+# BATCHED GENERATION
+# ============================================
+
+# Prompts generated together in one pipeline call
+PIPELINE_BATCH_SIZE = 4
+
+# How long the first prompt of a batch waits for others to join
+PIPELINE_BATCH_WAIT_SECONDS = 0.05
+
+# Longest answer, in tokens. Counted past the prompt so padding a short
+# prompt to the longest one in its batch doesn't shorten its answer
+ANSWER_MAX_TOKENS = 300
+
+class PipelineBatcher:
+    """Collects prompts from concurrent checks and generates them in one batch.
+    
+    A worker thread takes the first waiting prompt, gives others
+    PIPELINE_BATCH_WAIT_SECONDS to arrive and passes up to batch_size of
+    them to the pipeline at once, padded to the same length. A batch only
+    finishes when its longest answer does, so a kiosk serving several
+    people gets more answers per second while a lone check is no faster.
+    """
+    
+    def __init__(self, batch_size=PIPELINE_BATCH_SIZE):
+        self.batch_size = batch_size
+        self.requests = queue.Queue()
+        self.lock = threading.Lock()
+        self.worker = None
+    
+    def generate(self, model, prompt):
+        """Generate text for one prompt, waiting through Eel. Returns prompt plus answer."""
+        request = {'model': model, 'prompt': prompt, 'result': None, 'error': None, 'done': threading.Event()}
+        
+        with self.lock:
+            if self.worker is None:
+                self.worker = threading.Thread(target=self._work, name="pipeline-batcher", daemon=True)
+                self.worker.start()
+        self.requests.put(request)
+        
+        while not request['done'].is_set():
+            eel.sleep(0.05)
+        
+        if request['error'] is not None:
+            raise request['error']
+        return request['result']
+    
+    def _collect(self):
+        batch = [self.requests.get()]
+        deadline = time.perf_counter() + PIPELINE_BATCH_WAIT_SECONDS
+        
+        while len(batch) < self.batch_size:
+            try:
+                request = self.requests.get(timeout=max(0, deadline - time.perf_counter()))
+            except queue.Empty:
+                break
+            batch.append(request)
+        return batch
+    
+    def _work(self):
+        while True:
+            batch = self._collect()
+            model = batch[0]['model']
+            start = time.perf_counter()
+            
+            try:
+                responses = model(
+                    [request['prompt'] for request in batch],
+                    batch_size=len(batch),
+                    max_new_tokens=ANSWER_MAX_TOKENS,
+                    num_return_sequences=1,
+                    temperature=0.7,
+                    do_sample=True,
+                    pad_token_id=model.tokenizer.pad_token_id
+                )
+                for request, response in zip(batch, responses):
+                    request['result'] = response[0]['generated_text']
+                print(f"Generated {len(batch)} analyses in {time.perf_counter() - start:.2f}s")
+            except Exception as e:
+                for request in batch:
+                    request['error'] = e
+            finally:
+                for request in batch:
+                    request['done'].set()
+
+pipeline_batcher = PipelineBatcher()
+
 # ============================================
 # EEL EXPOSED FUNCTIONS
 # ============================================
 
 @eel.expose
-def get_system_info():
+def get_system_info(force_refresh=False):
     """Exposed function to get system specs from frontend."""
-    return get_system_specs()
+    return get_system_specs(force_refresh)
+
+@eel.expose
+def get_model_status():
+    """Exposed function reporting AI model loading: state, progress (0-1) and message."""
+    return dict(model_status)
 
 @eel.expose
-def check_game_compatibility(game_name):
-    """Main compatibility check function exposed to frontend."""
+def check_game_compatibility(game_name, detailed=False, stream_id=None, client_id=None):
+    """Main compatibility check function exposed to frontend.
+    
+    This backend always runs the full model analysis and returns it in one
+    piece, detailed, stream_id and client_id are accepted because the web
+    UI is shared with the llama.cpp version.
+    """
     try:
-        if ai_model is None:
-            return {
-                "success": False,
-                "error": "AI model not loaded. Please restart the application."
-            }
-        
         system_specs = get_system_specs()
         
         search_results = search_game_by_name(game_name)
@@ -380,6 +641,13 @@ def check_game_compatibility(game_name):
         req_text = format_requirements_for_ai(requirements)
         specs_text = format_system_specs(system_specs)
         
+        model = wait_for_model()
+        if model is None:
+            return {
+                "success": False,
+                "error": f"{model_status['message']}. Please restart the application."
+            }
+        
         print(f"Analyzing {search_results[0]['name']}...")
         
         ai_response = compare_specs_with_ai(
@@ -387,7 +655,7 @@ def check_game_compatibility(game_name):
             req_text,
             specs_text,
             system_specs,
-            ai_model
+            model
         )
         
         return {
@@ -410,18 +678,14 @@ def check_game_compatibility(game_name):
 # ============================================
 
 def main():
-    if ai_model is None:
-        print("\nERROR: AI model failed to load!")
-        print("Please ensure you have internet connection for first-time model download.")
-        print("Required packages: transformers, torch")
-        print("\nInstall with: pip install transformers torch\n")
-        return
-    
     print("\n" + "="*60)
     print("Game Compatibility Checker - Starting...")
     print("="*60)
-    print("\nAI model ready!")
-    print("Opening web interface...\n")
+    print("\nOpening web interface, the AI model loads in the background...\n")
+    
+    # Load the model and detect the hardware while the window comes up
+    threading.Thread(target=load_ai_model, daemon=True).start()
+    threading.Thread(target=get_system_specs, daemon=True).start()
     
     # Initialize Eel with the web folder
     eel.init('web')
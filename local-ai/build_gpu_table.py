@@ -0,0 +1,137 @@
+"""
+Compile data/pci.ids into data/gpu_ids.bin, the binary GPU lookup table
+used by SteamAPI+LlamaCCP.py.
+
+The table is a fixed-size record per PCI ID, pre-sorted so the app can
+memory-map it and binary search it without parsing anything at startup:
+
+    header:  8s magic, uint32 record count
+    record:  uint32 key (vendor << 16 | device), uint8 flags,
+             uint8 VRAM class in GB, uint32 name offset, uint16 name length
+    names:   UTF-8 GPU names, referenced by offset from the start of the file
+
+Run from the local-ai folder after updating data/pci.ids:
+    python build_gpu_table.py
+"""
+
+import struct
+
+PCI_IDS_PATH = "./data/pci.ids"
+GPU_TABLE_PATH = "./data/gpu_ids.bin"
+
+GPU_TABLE_MAGIC = b"SHCEGPU1"
+HEADER_FORMAT = "<8sI"
+RECORD_FORMAT = "<IBBIH"
+
+FLAG_INTEGRATED = 0x01
+FLAG_VIRTUAL = 0x02    # Virtual, emulated or server management adapters
+
+VENDOR_NAMES = {'10de': "NVIDIA", '1002': "AMD", '8086': "Intel"}
+
+VIRTUAL_VENDORS = {'1013', '1234', '1414', '15ad', '1a03', '1af4', '1b36', '80ee'}
+
+# AMD APU graphics codenames as they appear in pci.ids
+AMD_INTEGRATED_CODENAMES = ['raven', 'picasso', 'renoir', 'cezanne', 'barcelo', 'lucienne',
+                            'rembrandt', 'raphael', 'phoenix', 'vangogh', 'mendocino',
+                            'kaveri', 'carrizo', 'stoney', 'dali']
+
+# Smallest VRAM size shipped for each chip, so shared IDs never overstate memory
+VRAM_CLASS_GB = {
+    # NVIDIA
+    '10de:13c0': 4, '10de:13c2': 4, '10de:1401': 2, '10de:17c8': 6,
+    '10de:1b06': 11, '10de:1b80': 8, '10de:1b81': 8, '10de:1b82': 8,
+    '10de:1c02': 3, '10de:1c03': 6, '10de:1c81': 2, '10de:1c82': 4, '10de:1d01': 2,
+    '10de:1e04': 11, '10de:1e07': 11, '10de:1e81': 8, '10de:1e82': 8,
+    '10de:1e84': 8, '10de:1e87': 8, '10de:1f02': 8, '10de:1f06': 8,
+    '10de:1f07': 8, '10de:1f08': 6, '10de:1f82': 4,
+    '10de:2182': 6, '10de:2184': 6, '10de:21c4': 6,
+    '10de:2204': 24, '10de:2206': 10, '10de:2208': 12,
+    '10de:2482': 8, '10de:2484': 8, '10de:2486': 8, '10de:2487': 8,
+    '10de:2488': 8, '10de:2489': 8, '10de:2503': 12, '10de:2504': 12,
+    '10de:2507': 8, '10de:2520': 6, '10de:25a0': 4, '10de:25a2': 4,
+    '10de:2684': 24, '10de:2704': 16, '10de:2782': 12, '10de:2786': 12,
+    '10de:2803': 8, '10de:2882': 8, '10de:28e0': 8,
+    # AMD
+    '1002:67df': 4, '1002:687f': 8, '1002:6fdf': 8, '1002:731f': 6, '1002:7340': 4,
+    '1002:73bf': 16, '1002:73df': 10, '1002:73ef': 8, '1002:73ff': 8,
+    '1002:743f': 4, '1002:744c': 16, '1002:747e': 12, '1002:7480': 8,
+    # Intel Arc
+    '8086:56a0': 8, '8086:56a1': 8, '8086:56a5': 6,
+}
+
+def parse_pci_ids(path):
+    """Yield (vendor_id, vendor_name, device_id, device_name) from a pci.ids file."""
+    vendor_id = None
+    vendor_name = None
+
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            if not line.strip() or line.startswith('#'):
+                continue
+            if line.startswith('C '):
+                break
+            if not line.startswith('\t'):
+                vendor_id, _, vendor_name = line.strip().partition('  ')
+                vendor_id = vendor_id.lower()
+            elif not line.startswith('\t\t') and vendor_id:
+                device_id, _, device_name = line.strip().partition('  ')
+                yield vendor_id, vendor_name, device_id.lower(), device_name
+
+def gpu_display_name(vendor_id, vendor_name, device_name):
+    """Build a "NVIDIA GeForce RTX 3060" style name from a pci.ids entry."""
+    vendor_label = VENDOR_NAMES.get(vendor_id, vendor_name)
+
+    if '[' in device_name and device_name.endswith(']'):
+        device_name = device_name[device_name.index('[') + 1:-1]
+
+    if vendor_label.lower() in device_name.lower():
+        return device_name
+    return f"{vendor_label} {device_name}"
+
+def gpu_flags(vendor_id, device_name):
+    """Work out the integrated/virtual flags for a pci.ids entry."""
+    name_lower = device_name.lower()
+
+    if vendor_id in VIRTUAL_VENDORS:
+        return FLAG_VIRTUAL
+    if vendor_id == '8086' and 'arc' not in name_lower and 'dg2' not in name_lower:
+        return FLAG_INTEGRATED
+    if vendor_id == '1002' and any(codename in name_lower for codename in AMD_INTEGRATED_CODENAMES):
+        return FLAG_INTEGRATED
+    return 0
+
+def build_gpu_table(source_path=PCI_IDS_PATH, output_path=GPU_TABLE_PATH):
+    """Compile a pci.ids file into the sorted binary GPU table."""
+    records = {}
+    for vendor_id, vendor_name, device_id, device_name in parse_pci_ids(source_path):
+        try:
+            key = (int(vendor_id, 16) << 16) | int(device_id, 16)
+        except ValueError:
+            continue
+        records[key] = (
+            gpu_flags(vendor_id, device_name),
+            VRAM_CLASS_GB.get(f"{vendor_id}:{device_id}", 0),
+            gpu_display_name(vendor_id, vendor_name, device_name).encode('utf-8')
+        )
+
+    keys = sorted(records)
+    names_offset = struct.calcsize(HEADER_FORMAT) + struct.calcsize(RECORD_FORMAT) * len(keys)
+
+    header = struct.pack(HEADER_FORMAT, GPU_TABLE_MAGIC, len(keys))
+    record_data = bytearray()
+    name_data = bytearray()
+
+    for key in keys:
+        flags, vram_class, name = records[key]
+        record_data += struct.pack(RECORD_FORMAT, key, flags, vram_class,
+                                   names_offset + len(name_data), len(name))
+        name_data += name
+
+    with open(output_path, 'wb') as f:
+        f.write(header + record_data + name_data)
+
+    return len(keys)
+
+if __name__ == "__main__":
+    count = build_gpu_table()
+    print(f"Wrote {count} GPU entries to {GPU_TABLE_PATH}")